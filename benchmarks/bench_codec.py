@@ -0,0 +1,71 @@
+"""Microbenchmark: stdlib ``json`` vs. the configured codec on invoice lists.
+
+Run with ``python benchmarks/bench_codec.py [invoices] [repeat]``. The payload
+mimics Dolibarr invoice objects (about 120 mostly empty fields plus lines).
+Install ``dolibarr-mcp[fast]`` to benchmark the orjson backend.
+"""
+
+import json
+import sys
+import timeit
+
+from dolibarr_mcp import codec
+
+
+def make_invoice(index: int) -> dict:
+    """Build an invoice shaped like a Dolibarr API response."""
+    invoice = {f"field_{n}": None for n in range(80)}
+    invoice.update({f"empty_{n}": "" for n in range(20)})
+    invoice.update(
+        {
+            "id": str(index),
+            "ref": f"FA2401-{index:05d}",
+            "socid": str(index % 50),
+            "status": "1",
+            "paye": "0",
+            "date": 1704067200 + index,
+            "total_ht": "1234.50000000",
+            "total_tva": "234.55500000",
+            "total_ttc": "1469.05500000",
+            "note_public": "Lieferung frei Haus — vielen Dank für Ihren Auftrag.",
+            "array_options": {"options_project": f"PRJ-{index % 7}"},
+            "lines": [
+                {
+                    "id": str(index * 10 + line),
+                    "product_ref": f"P-{line:03d}",
+                    "desc": "Beratung",
+                    "qty": "2",
+                    "subprice": "110.00000000",
+                    "tva_tx": "19.000",
+                    "total_ht": "220.00000000",
+                    "fk_product": str(line),
+                    "special_code": "0",
+                    "date_start": None,
+                    "date_end": None,
+                }
+                for line in range(5)
+            ],
+        }
+    )
+    return invoice
+
+
+def bench(invoices: int = 1000, repeat: int = 20) -> None:
+    payload = [make_invoice(index) for index in range(invoices)]
+    body = json.dumps(payload).encode("utf-8")
+    print(f"{invoices} invoices, {len(body) / 1024:.0f} KiB body, codec backend: {codec.BACKEND}")
+
+    cases = {
+        "parse  stdlib text()+loads": lambda: json.loads(body.decode("utf-8")),
+        "parse  codec.loads(bytes)": lambda: codec.loads(body),
+        "output stdlib dumps indent=2": lambda: json.dumps(payload, indent=2),
+        "output codec.dumps": lambda: codec.dumps(payload),
+    }
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(f"  {name:<30} {best * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    bench(*args)
@@ -0,0 +1,118 @@
+"""Load benchmark: tool calls through the MCP handler against the fake Dolibarr API.
+
+Run with ``python benchmarks/bench_load.py [calls] [concurrency] [latency_ms]``.
+A ``FakeDolibarr`` is seeded in a child process (so its work does not share the
+client's event loop), the shared client is pointed at it and a mix of read
+tools runs with the given concurrency. Throughput and latency
+percentiles are printed as one JSON object so CI can compare runs. Set
+``MAX_P99_MS`` to fail the run when the p99 latency exceeds it.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import time
+
+import aiohttp
+
+from dolibarr_mcp import dolibarr_mcp_server
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.fake_dolibarr import serve
+
+PRODUCTS = 100_000
+INVOICES = 10_000
+
+
+def workload(rng: random.Random):
+    """Pick one tool call of the mix."""
+    choice = rng.random()
+    if choice < 0.4:
+        return "get_product_by_id", {"product_id": rng.randint(1, PRODUCTS)}
+    if choice < 0.7:
+        return "get_invoice_by_id", {"invoice_id": rng.randint(1, INVOICES)}
+    if choice < 0.9:
+        return "search_products_by_ref", {"ref_prefix": f"PRD-{rng.randint(0, 99):02d}"}
+    return "get_customer_by_id", {"customer_id": rng.randint(1, 1000)}
+
+
+def run_fake(port: int, latency_ms: float) -> None:
+    asyncio.run(
+        serve("127.0.0.1", port, products=PRODUCTS, invoices=INVOICES, thirdparties=1000, latency=latency_ms / 1000)
+    )
+
+
+async def wait_until_up(url: str, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                async with session.get(f"{url}/status") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                if time.monotonic() > deadline:
+                    raise
+            await asyncio.sleep(0.2)
+
+
+async def bench(calls: int = 2000, concurrency: int = 32, latency_ms: float = 0.0) -> dict:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    fake = multiprocessing.Process(target=run_fake, args=(port, latency_ms), daemon=True)
+    fake.start()
+    url = f"http://127.0.0.1:{port}/api/index.php"
+    config = Config(
+        dolibarr_url=url,
+        dolibarr_api_key="benchmark",
+        cache_enabled=False,
+        slow_call_threshold_seconds=0,
+    )
+    rng = random.Random(0)
+    latencies = []
+    queue = [workload(rng) for _ in range(calls)]
+
+    async def worker() -> None:
+        while queue:
+            name, arguments = queue.pop()
+            started = time.perf_counter()
+            await dolibarr_mcp_server.handle_call_tool(name, arguments)
+            latencies.append(time.perf_counter() - started)
+
+    try:
+        await wait_until_up(url)
+        async with dolibarr_mcp_server.shared_client_lifespan(config):
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+    finally:
+        fake.terminate()
+        fake.join()
+
+    latencies.sort()
+
+    def percentile(share: float) -> float:
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * share))] * 1000, 2)
+
+    return {
+        "calls": calls,
+        "concurrency": concurrency,
+        "injected_latency_ms": latency_ms,
+        "calls_per_second": round(calls / elapsed, 1),
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+if __name__ == "__main__":
+    args = [float(arg) for arg in sys.argv[1:4]]
+    result = asyncio.run(bench(*(int(arg) for arg in args[:2]), *args[2:]))
+    print(json.dumps(result))
+    limit = os.getenv("MAX_P99_MS")
+    if limit and result["p99_ms"] > float(limit):
+        sys.exit(f"p99 {result['p99_ms']} ms exceeds MAX_P99_MS={limit}")
@@ -0,0 +1,206 @@
+"""Bounded in-memory cache for Dolibarr GET responses."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple
+
+# Default time-to-live (seconds) per endpoint family. Families that are not
+# listed use the cache-wide default TTL, where 0 disables caching.
+DEFAULT_FAMILY_TTLS: Dict[str, float] = {
+    "thirdparties": 60.0,
+    "products": 300.0,
+    "projects": 60.0,
+    "contacts": 120.0,
+    "users": 300.0,
+    "invoices": 15.0,
+    "orders": 15.0,
+    "setup": 3600.0,
+}
+
+# Standard Dolibarr REST resources. Metric labels, circuit breakers and adaptive
+# timeouts fold any other family into OTHER_FAMILY so that arbitrary endpoints
+# (e.g. from dolibarr_raw_api) cannot grow them without bound.
+KNOWN_FAMILIES: FrozenSet[str] = frozenset(
+    {
+        "agendaevents",
+        "bankaccounts",
+        "categories",
+        "contacts",
+        "contracts",
+        "documents",
+        "expensereports",
+        "interventions",
+        "invoices",
+        "members",
+        "orders",
+        "products",
+        "projects",
+        "proposals",
+        "setup",
+        "shipments",
+        "status",
+        "stockmovements",
+        "supplierinvoices",
+        "supplierorders",
+        "tasks",
+        "thirdparties",
+        "tickets",
+        "users",
+        "warehouses",
+    }
+)
+OTHER_FAMILY = "other"
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Return the resource family of an endpoint, e.g. ``invoices`` for ``/invoices/3/lines``."""
+    path = endpoint.lstrip("/").split("?", 1)[0]
+    return path.split("/", 1)[0].lower()
+
+
+def written_families(endpoint: str) -> Set[str]:
+    """Return every family a write to ``endpoint`` may change.
+
+    Besides the top-level family this includes each named sub-resource, so a
+    write to ``thirdparties/3/contacts`` also invalidates cached ``contacts``.
+    """
+    path = endpoint.lstrip("/").split("?", 1)[0]
+    return {segment.lower() for segment in path.split("/") if segment and not segment.isdigit()}
+
+
+def bounded_family(endpoint: str, known: Iterable[str] = KNOWN_FAMILIES) -> str:
+    """Return the endpoint family if it is ``known``, else :data:`OTHER_FAMILY`."""
+    family = endpoint_family(endpoint)
+    return family if family in known else OTHER_FAMILY
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return hits / lookups, or 0.0 before the first lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a plain dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+@dataclass
+class _Entry:
+    value: Any
+    family: str
+    size: int
+    expires_at: float
+
+
+class ResponseCache:
+    """TTL + LRU cache bounded by entry count and approximate response bytes.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_FAMILY_TTLS)
+        if ttls:
+            self.ttls.update({family.lower(): float(ttl) for family, ttl in ttls.items()})
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate number of response bytes currently held."""
+        return self._bytes
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> CacheKey:
+        """Build a cache key from an endpoint and its query parameters."""
+        items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return endpoint.lstrip("/"), items
+
+    def ttl_for(self, family: str) -> float:
+        """Return the TTL configured for ``family``."""
+        return self.ttls.get(family, self.default_ttl)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return ``(True, value)`` for a fresh entry, otherwise ``(False, None)``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return False, None
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            self.stats.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return True, entry.value
+
+    def set(self, key: Hashable, family: str, value: Any, size: int) -> bool:
+        """Store ``value`` if its family is cacheable and it fits the byte budget."""
+        ttl = self.ttl_for(family)
+        if ttl <= 0 or size > self.max_bytes:
+            return False
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(value=value, family=family, size=size, expires_at=self._clock() + ttl)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+        return True
+
+    def invalidate_family(self, family: str) -> int:
+        """Drop every entry of ``family`` and return how many were removed."""
+        return self.invalidate_families((family,))
+
+    def invalidate_families(self, families: Iterable[str]) -> int:
+        """Drop every entry of any of ``families`` in one pass and return how many were removed."""
+        names = set(families)
+        keys = [key for key, entry in self._entries.items() if entry.family in names]
+        for key in keys:
+            self._remove(key)
+        self.stats.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
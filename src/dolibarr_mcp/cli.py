@@ -40,6 +40,52 @@ def serve(host: str, port: int):
     asyncio.run(server_main())
 
 
+@cli.command("fake-api")
+@click.option("--host", default="127.0.0.1", help="Host to bind to")
+@click.option("--port", default=8090, help="Port to bind to")
+@click.option("--seed", default=0, help="Seed of the synthetic data and injected failures")
+@click.option("--thirdparties", default=1000, help="Number of third parties")
+@click.option("--products", default=10000, help="Number of products")
+@click.option("--invoices", default=10000, help="Number of invoices")
+@click.option("--lines-per-invoice", default=10, help="Lines of each generated invoice")
+@click.option("--orders", default=1000, help="Number of orders")
+@click.option("--contacts", default=1000, help="Number of contacts")
+@click.option("--projects", default=100, help="Number of projects")
+@click.option("--users", default=10, help="Number of users")
+@click.option("--api-key", default=None, help="Require this DOLAPIKEY header")
+@click.option("--latency-ms", default=0.0, help="Latency added to every response")
+@click.option("--jitter-ms", default=0.0, help="Random extra latency of up to this much")
+@click.option("--per-record-ms", default=0.0, help="Latency added per returned record")
+@click.option("--error-rate", default=0.0, help="Share of requests failing with an injected error")
+@click.option("--error-status", multiple=True, type=int, default=(503,), help="Status of injected errors (repeatable)")
+def fake_api(
+    host: str,
+    port: int,
+    latency_ms: float,
+    jitter_ms: float,
+    per_record_ms: float,
+    error_status: tuple,
+    **counts: int,
+):
+    """Serve a synthetic Dolibarr REST API for offline load testing."""
+    from .fake_dolibarr import serve
+
+    try:
+        asyncio.run(
+            serve(
+                host,
+                port,
+                latency=latency_ms / 1000,
+                latency_jitter=jitter_ms / 1000,
+                latency_per_record=per_record_ms / 1000,
+                error_statuses=error_status,
+                **counts,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
 @cli.command()
 def version():
     """Show version information."""
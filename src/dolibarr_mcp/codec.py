@@ -0,0 +1,50 @@
+"""JSON codec used for Dolibarr request/response bodies and tool output.
+
+``orjson`` is used when it is installed (``pip install dolibarr-mcp[fast]``),
+otherwise the standard library ``json`` module. Both paths produce compact,
+UTF-8 JSON and accept ``bytes`` directly, so response bodies never have to be
+decoded to ``str`` first.
+"""
+
+import json
+from typing import Any, Union
+
+try:  # pragma: no cover - exercised depending on the installed extras
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Name of the active backend, reported in logs and benchmarks.
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Raised by :func:`loads` for malformed input (orjson's error subclasses it).
+JSONDecodeError = json.JSONDecodeError
+
+
+def _stdlib_dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+if orjson is not None:
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Parse a JSON document from bytes or text."""
+        return orjson.loads(data)
+
+    def dumps(value: Any) -> str:
+        """Serialize ``value`` to compact JSON text."""
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # orjson rejects e.g. integers beyond 64 bits; the stdlib handles them.
+            return _stdlib_dumps(value)
+
+else:
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Parse a JSON document from bytes or text."""
+        return json.loads(data)
+
+    def dumps(value: Any) -> str:
+        """Serialize ``value`` to compact JSON text."""
+        return _stdlib_dumps(value)
@@ -2,11 +2,14 @@
 
 import os
 import sys
+from typing import Dict, List, Optional
 
 from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
+from .sync import database_timezone
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -53,6 +56,26 @@ class Config(BaseSettings):
         default=8080,
     )
 
+    metrics_enabled: bool = Field(
+        description="Serve Prometheus metrics at /metrics on the HTTP transport",
+        default=True,
+    )
+
+    trace_path: Optional[str] = Field(
+        description="File that sampled tool call traces are appended to; tracing is off when unset",
+        default=None,
+    )
+
+    trace_sample_rate: float = Field(
+        description="Fraction of tool calls traced when TRACE_PATH is set (0.0-1.0)",
+        default=1.0,
+    )
+
+    trace_format: str = Field(
+        description="Trace export format: 'jsonl' (one span per line) or 'otlp' (OTLP/JSON per trace)",
+        default="jsonl",
+    )
+
     allow_ref_autogen: bool = Field(
         description="Allow automatic generation of reference fields when missing",
         default=False,
@@ -78,6 +101,236 @@ class Config(BaseSettings):
         default=0.5,
     )
 
+    retry_max_backoff_seconds: float = Field(
+        description="Upper bound (seconds) for a single retry delay, including Retry-After",
+        default=30.0,
+    )
+
+    retry_budget_ratio: float = Field(
+        description="Process-wide retries allowed per request (0.2 = one retry per five requests)",
+        default=0.2,
+    )
+
+    retry_budget_min_per_second: float = Field(
+        description="Retries per second always allowed by the retry budget, regardless of traffic",
+        default=1.0,
+    )
+
+    circuit_breaker_enabled: bool = Field(
+        description="Fail fast while Dolibarr keeps failing for an endpoint family",
+        default=True,
+    )
+
+    circuit_failure_threshold: int = Field(
+        description="Consecutive failed calls that open the circuit of an endpoint family",
+        default=5,
+    )
+
+    circuit_reset_seconds: float = Field(
+        description="Time (seconds) an open circuit waits before letting a probe request through",
+        default=30.0,
+    )
+
+    rate_limit_read_per_second: float = Field(
+        description="Maximum GET requests per second sent to Dolibarr (0 = unlimited)",
+        default=0.0,
+    )
+
+    rate_limit_write_per_second: float = Field(
+        description="Maximum POST/PUT/DELETE requests per second sent to Dolibarr (0 = unlimited)",
+        default=0.0,
+    )
+
+    rate_limit_burst: Optional[float] = Field(
+        description="Requests allowed in a burst before the rate applies (defaults to the rate)",
+        default=None,
+    )
+
+    rate_limit_session_share: float = Field(
+        description="Fraction of the rates a single MCP session may use (0 = no per-session limit)",
+        default=0.0,
+    )
+
+    http_pool_limit: int = Field(
+        description="Maximum number of pooled HTTP connections to Dolibarr (0 = unlimited)",
+        default=100,
+    )
+
+    http_pool_limit_per_host: int = Field(
+        description="Maximum number of pooled HTTP connections per Dolibarr host (0 = unlimited)",
+        default=20,
+    )
+
+    http_keepalive_seconds: float = Field(
+        description="Idle time (seconds) before a pooled keep-alive connection is closed",
+        default=30.0,
+    )
+
+    http_dns_cache_seconds: int = Field(
+        description="Time (seconds) resolved Dolibarr host addresses are cached",
+        default=300,
+    )
+
+    request_timeout_seconds: float = Field(
+        description="Total timeout of a Dolibarr request before enough latency samples exist",
+        default=30.0,
+    )
+
+    adaptive_timeouts_enabled: bool = Field(
+        description="Derive per endpoint family timeouts from the observed p99 latency",
+        default=True,
+    )
+
+    adaptive_timeout_min_seconds: float = Field(
+        description="Lower bound of an adaptive request timeout",
+        default=5.0,
+    )
+
+    adaptive_timeout_max_seconds: float = Field(
+        description="Upper bound of an adaptive request timeout",
+        default=60.0,
+    )
+
+    adaptive_timeout_p99_multiplier: float = Field(
+        description="Adaptive timeout as a multiple of the observed p99 latency",
+        default=3.0,
+    )
+
+    timeout_overrides: Dict[str, float] = Field(
+        description="Fixed per endpoint family timeouts in seconds, e.g. {\"status\": 5}",
+        default_factory=dict,
+    )
+
+    stream_read_timeout_seconds: float = Field(
+        description="Longest pause between chunks of a streamed list response; streams have no total timeout",
+        default=60.0,
+    )
+
+    slow_call_threshold_seconds: float = Field(
+        description="Log a structured slow-call entry for requests at least this slow (0 disables)",
+        default=2.0,
+    )
+
+    cache_enabled: bool = Field(
+        description="Cache Dolibarr GET responses in memory",
+        default=True,
+    )
+
+    cache_max_entries: int = Field(
+        description="Maximum number of cached GET responses",
+        default=1024,
+    )
+
+    cache_max_bytes: int = Field(
+        description="Maximum approximate size (bytes) of all cached GET responses",
+        default=16 * 1024 * 1024,
+    )
+
+    cache_default_ttl_seconds: float = Field(
+        description="TTL for endpoint families without an explicit TTL (0 = not cached)",
+        default=0.0,
+    )
+
+    cache_ttls: Dict[str, float] = Field(
+        description="Per endpoint family TTL overrides in seconds, e.g. {\"products\": 600}",
+        default_factory=dict,
+    )
+
+    fetch_max_concurrency: int = Field(
+        description="Maximum number of pages fetched concurrently by bulk list fetches",
+        default=4,
+    )
+
+    dolibarr_db_timezone: str = Field(
+        description="Time zone of the Dolibarr database clock (UTC, an offset like -05:00 or an IANA name)",
+        default="UTC",
+    )
+
+    product_index_enabled: bool = Field(
+        description="Answer product search tools from an in-process index of the catalogue",
+        default=False,
+    )
+
+    product_index_refresh_seconds: float = Field(
+        description="Interval (seconds) between incremental refreshes of the product index",
+        default=60.0,
+    )
+
+    product_index_full_refresh_seconds: float = Field(
+        description="Interval (seconds) between full reloads of the product index",
+        default=3600.0,
+    )
+
+    thirdparty_index_enabled: bool = Field(
+        description="Answer search_customers from an in-process index of third parties",
+        default=False,
+    )
+
+    thirdparty_index_refresh_seconds: float = Field(
+        description="Interval (seconds) between incremental refreshes of the third party index",
+        default=60.0,
+    )
+
+    thirdparty_index_full_refresh_seconds: float = Field(
+        description="Interval (seconds) between full reloads of the third party index",
+        default=3600.0,
+    )
+
+    sync_enabled: bool = Field(
+        description="Mirror Dolibarr entities into a local store through an incremental change feed",
+        default=False,
+    )
+
+    sync_interval_seconds: float = Field(
+        description="Interval (seconds) between change-feed polls of the mirrored entities",
+        default=60.0,
+    )
+
+    sync_reconcile_seconds: float = Field(
+        description="Interval (seconds) between full scans that drop records deleted outside this server (0 = never)",
+        default=3600.0,
+    )
+
+    sync_entities: List[str] = Field(
+        description="API endpoints mirrored by the sync engine, e.g. [\"thirdparties\", \"products\"]",
+        default_factory=lambda: ["thirdparties", "products", "invoices", "orders", "contacts", "projects"],
+    )
+
+    replica_path: Optional[str] = Field(
+        description="SQLite file persisting the synced records and watermarks (enables the sync engine)",
+        default=None,
+    )
+
+    replica_default_max_staleness_seconds: float = Field(
+        description="Age (seconds) of the last sync up to which get_*_by_id tools read from the mirror (0 = never)",
+        default=300.0,
+    )
+
+    replica_max_staleness_seconds: Dict[str, float] = Field(
+        description="Per entity staleness bound overrides in seconds, e.g. {\"products\": 3600, \"thirdparties\": 0}",
+        default_factory=dict,
+    )
+
+    dictionary_ttl_seconds: float = Field(
+        description="Time (seconds) setup dictionaries are used before a background reload",
+        default=86400.0,
+    )
+
+    default_country: Optional[str] = Field(
+        description="Country code or name used by create_customer when no country is given (else country_id 1)",
+        default=None,
+    )
+
+    compact_output: bool = Field(
+        description="Drop null and empty fields from tool results before returning them",
+        default=True,
+    )
+
+    batch_max_concurrency: int = Field(
+        description="Maximum number of operations of a batch tool call run concurrently",
+        default=8,
+    )
+
     @field_validator("dolibarr_url")
     @classmethod
     def validate_dolibarr_url(cls, v: str) -> str:
@@ -166,6 +419,27 @@ class Config(BaseSettings):
             return "stdio"
         return normalized
 
+    @field_validator("trace_format")
+    @classmethod
+    def validate_trace_format(cls, v: str) -> str:
+        """Validate the trace export format."""
+        normalized = (v or "jsonl").lower()
+        if normalized not in {"jsonl", "otlp"}:
+            print(f"⚠️ Invalid TRACE_FORMAT '{v}', defaulting to jsonl", file=sys.stderr)
+            return "jsonl"
+        return normalized
+
+    @field_validator("dolibarr_db_timezone")
+    @classmethod
+    def validate_db_timezone(cls, v: str) -> str:
+        """Validate the database time zone."""
+        try:
+            database_timezone(v)
+        except ValueError as exc:
+            print(f"⚠️ Invalid DOLIBARR_DB_TIMEZONE: {exc}, defaulting to UTC", file=sys.stderr)
+            return "UTC"
+        return v or "UTC"
+
     @field_validator("mcp_http_host")
     @classmethod
     def validate_http_host(cls, v: str) -> str:
@@ -0,0 +1,172 @@
+"""Cached Dolibarr setup dictionaries (countries, payment terms, units, ...).
+
+Dictionaries change rarely, so each one is loaded on first use and kept for a
+long TTL. An expired dictionary keeps answering lookups while a background
+task reloads it. Lookups accept an ID, a code or a label, case-insensitively,
+so tools can take human-readable values instead of numeric IDs.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DictionarySpec:
+    """Where a dictionary lives and which of its fields identify an entry."""
+
+    endpoint: str
+    id_field: str = "id"
+    code_fields: Sequence[str] = ("code",)
+    label_field: str = "label"
+    # Field written into payloads when a value resolves (usually the ID).
+    value_field: str = "id"
+
+
+DICTIONARIES: Dict[str, DictionarySpec] = {
+    "countries": DictionarySpec("setup/dictionary/countries", code_fields=("code", "code_iso")),
+    "payment_terms": DictionarySpec("setup/dictionary/payment_terms"),
+    "payment_types": DictionarySpec("setup/dictionary/payment_types"),
+    "units": DictionarySpec(
+        "setup/dictionary/units", id_field="rowid", code_fields=("code", "short_label"), value_field="rowid"
+    ),
+    "currencies": DictionarySpec(
+        "setup/dictionary/currencies", id_field="code_iso", code_fields=("code_iso",), value_field="code_iso"
+    ),
+}
+
+
+def _key(value: Any) -> str:
+    return str(value).strip().casefold()
+
+
+class Dictionary:
+    """Entries of one dictionary indexed by ID, code and label."""
+
+    def __init__(self, spec: DictionarySpec, entries: List[Dict[str, Any]]):
+        self.spec = spec
+        self.entries = entries
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_code: Dict[str, Dict[str, Any]] = {}
+        self._by_label: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            if entry.get(spec.id_field) not in (None, ""):
+                self._by_id.setdefault(_key(entry[spec.id_field]), entry)
+            for field in spec.code_fields:
+                if entry.get(field):
+                    self._by_code.setdefault(_key(entry[field]), entry)
+            if entry.get(spec.label_field):
+                self._by_label.setdefault(_key(entry[spec.label_field]), entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def by_code(self, code: Any) -> Optional[Dict[str, Any]]:
+        """Return the entry with this code."""
+        return self._by_code.get(_key(code))
+
+    def by_label(self, label: Any) -> Optional[Dict[str, Any]]:
+        """Return the entry with this label."""
+        return self._by_label.get(_key(label))
+
+    def lookup(self, value: Any) -> Optional[Dict[str, Any]]:
+        """Return the entry matching ``value`` as an ID, then a code, then a label."""
+        if not isinstance(value, bool) and str(value).strip().isdigit():
+            entry = self._by_id.get(_key(value))
+            if entry is not None:
+                return entry
+        return self.by_code(value) or self.by_label(value)
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return entries whose code or label contains ``query``."""
+        needle = _key(query)
+        fields = (*self.spec.code_fields, self.spec.label_field)
+        return [
+            entry
+            for entry in self.entries
+            if any(needle in _key(entry.get(field) or "") for field in fields)
+        ][:limit]
+
+
+class DictionaryCache:
+    """Lazily loaded, long-lived cache of the setup dictionaries of one client."""
+
+    def __init__(
+        self,
+        client: Any,
+        ttl: float = 86400.0,
+        specs: Optional[Dict[str, DictionarySpec]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.specs = dict(DICTIONARIES if specs is None else specs)
+        self._clock = clock
+        self._loaded: Dict[str, Dictionary] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._loading: Dict[str, asyncio.Task] = {}
+
+    async def get(self, name: str) -> Dictionary:
+        """Return a dictionary, loading it on first use and refreshing it in the background once expired."""
+        if name not in self.specs:
+            raise KeyError(f"Unknown dictionary '{name}', expected one of {sorted(self.specs)}")
+        dictionary = self._loaded.get(name)
+        if dictionary is None:
+            return await self._load_once(name)
+        if self._clock() - self._loaded_at[name] >= self.ttl and name not in self._loading:
+            self._loading[name] = asyncio.ensure_future(self._refresh(name))
+        return dictionary
+
+    async def lookup(self, name: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Return the entry of dictionary ``name`` matching an ID, code or label."""
+        return (await self.get(name)).lookup(value)
+
+    async def resolve(self, name: str, value: Any) -> Any:
+        """Return the payload value (usually the ID) for ``value``, or None when it is unknown."""
+        entry = await self.lookup(name, value)
+        return None if entry is None else entry.get(self.specs[name].value_field)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Force a reload of one or all dictionaries on next use."""
+        for key in [name] if name else list(self._loaded):
+            self._loaded.pop(key, None)
+            self._loaded_at.pop(key, None)
+
+    async def close(self) -> None:
+        """Cancel background refreshes."""
+        tasks = list(self._loading.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _load_once(self, name: str) -> Dictionary:
+        task = self._loading.get(name)
+        if task is None:
+            task = self._loading[name] = asyncio.ensure_future(self._load(name))
+        await asyncio.shield(task)
+        dictionary = self._loaded.get(name)
+        # A background refresh that failed after an invalidation leaves nothing loaded: load again.
+        return dictionary if dictionary is not None else await self._load_once(name)
+
+    async def _load(self, name: str) -> Dictionary:
+        try:
+            spec = self.specs[name]
+            entries = [entry async for entry in self.client.iter_list(spec.endpoint, page_size=500)]
+            dictionary = Dictionary(spec, entries)
+            self._loaded[name] = dictionary
+            self._loaded_at[name] = self._clock()
+            return dictionary
+        finally:
+            self._loading.pop(name, None)
+
+    async def _refresh(self, name: str) -> None:
+        try:
+            await self._load(name)
+        except Exception as exc:  # pylint: disable=broad-except
+            # Keep serving the previous entries and retry after another TTL.
+            self._loaded_at[name] = self._clock()
+            logger.warning("Refreshing dictionary %s failed: %s", name, exc)
@@ -1,16 +1,58 @@
 """Professional Dolibarr API client with comprehensive CRUD operations."""
 
 import asyncio
-import json
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 import aiohttp
 from aiohttp import ClientSession, ClientTimeout
 
+from . import codec
+from .cache import KNOWN_FAMILIES, ResponseCache, bounded_family, endpoint_family, written_families
 from .config import Config
+from .dictionaries import DictionaryCache
+from .metrics import get_metrics
+from .pagination import iter_pages, iter_pages_concurrently, iter_records
+from .resilience import (
+    AdaptiveTimeouts,
+    CircuitBreaker,
+    RateLimiter,
+    RetryPolicy,
+    current_session,
+    get_retry_budget,
+    parse_retry_after,
+    request_shape,
+)
+from .replica import SQLiteStore
+from .reports import ReceivablesAging, RevenueReport, TopDebtors, issued_between_filter, parse_day
+from .search_index import ProductIndex, ThirdpartyIndex
+from .streaming import JSONArrayStream
+from .sync import MemoryStore, SyncEngine, database_timezone
+from .tracing import current_span, current_trace_id, get_tracer, record_span, traced
+
+
+# Invoices fetched per page by the report tools.
+REPORT_PAGE_SIZE = 500
+
+# Human-readable arguments resolved through the setup dictionaries:
+# argument -> (dictionary, Dolibarr field receiving the resolved value).
+CUSTOMER_DICTIONARY_FIELDS = {
+    "country": ("countries", "country_id"),
+    "payment_terms": ("payment_terms", "cond_reglement_id"),
+    "payment_type": ("payment_types", "mode_reglement_id"),
+}
+INVOICE_DICTIONARY_FIELDS = {
+    "payment_terms": ("payment_terms", "cond_reglement_id"),
+    "payment_type": ("payment_types", "mode_reglement_id"),
+    "currency": ("currencies", "multicurrency_code"),
+}
+LINE_DICTIONARY_FIELDS = {"unit": ("units", "fk_unit")}
+
+# Receives one JSON entry per request slower than SLOW_CALL_THRESHOLD_SECONDS.
+slow_call_logger = logging.getLogger("dolibarr_mcp.slow_calls")
 
 
 class DolibarrAPIError(Exception):
@@ -42,9 +84,113 @@ class DolibarrClient:
         self.ref_autogen_prefix = getattr(config, "ref_autogen_prefix", "AUTO")
         self.max_retries = getattr(config, "max_retries", 2)
         self.retry_backoff_seconds = getattr(config, "retry_backoff_seconds", 0.5)
-        
+        self.pool_limit = getattr(config, "http_pool_limit", 100)
+        self.pool_limit_per_host = getattr(config, "http_pool_limit_per_host", 20)
+        self.keepalive_seconds = getattr(config, "http_keepalive_seconds", 30.0)
+        self.dns_cache_seconds = getattr(config, "http_dns_cache_seconds", 300)
+        self.fetch_max_concurrency = getattr(config, "fetch_max_concurrency", 4)
+        self.batch_max_concurrency = getattr(config, "batch_max_concurrency", 8)
+        self.retry_policy = RetryPolicy(
+            max_retries=self.max_retries,
+            base_delay=self.retry_backoff_seconds,
+            max_delay=getattr(config, "retry_max_backoff_seconds", 30.0),
+        )
+        self.retry_budget = get_retry_budget(
+            ratio=getattr(config, "retry_budget_ratio", 0.2),
+            min_per_second=getattr(config, "retry_budget_min_per_second", 1.0),
+        )
+        self.circuit_breaker_enabled = getattr(config, "circuit_breaker_enabled", True)
+        self.circuit_failure_threshold = getattr(config, "circuit_failure_threshold", 5)
+        self.circuit_reset_seconds = getattr(config, "circuit_reset_seconds", 30.0)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.rate_limiter = RateLimiter(
+            read_rate=getattr(config, "rate_limit_read_per_second", 0.0),
+            write_rate=getattr(config, "rate_limit_write_per_second", 0.0),
+            burst=getattr(config, "rate_limit_burst", None),
+            session_share=getattr(config, "rate_limit_session_share", 0.0),
+        )
+
+        self.cache: Optional[ResponseCache] = None
+        if getattr(config, "cache_enabled", True):
+            self.cache = ResponseCache(
+                max_entries=getattr(config, "cache_max_entries", 1024),
+                max_bytes=getattr(config, "cache_max_bytes", 16 * 1024 * 1024),
+                ttls=getattr(config, "cache_ttls", None),
+                default_ttl=getattr(config, "cache_default_ttl_seconds", 0.0),
+            )
+
+        # Callbacks notified with (method, endpoint, response) after successful writes.
+        self.write_listeners: List[Callable[[str, str, Any], None]] = []
+
+        # Time zone of t.tms in the Dolibarr database, used by modified-since filters.
+        db_timezone = database_timezone(getattr(config, "dolibarr_db_timezone", None))
+
+        self.product_index: Optional[ProductIndex] = None
+        if getattr(config, "product_index_enabled", False):
+            self.product_index = ProductIndex(
+                self,
+                refresh_seconds=getattr(config, "product_index_refresh_seconds", 60.0),
+                full_refresh_seconds=getattr(config, "product_index_full_refresh_seconds", 3600.0),
+                db_timezone=db_timezone,
+            )
+            self.add_write_listener(self.product_index.on_write)
+
+        self.thirdparty_index: Optional[ThirdpartyIndex] = None
+        if getattr(config, "thirdparty_index_enabled", False):
+            self.thirdparty_index = ThirdpartyIndex(
+                self,
+                refresh_seconds=getattr(config, "thirdparty_index_refresh_seconds", 60.0),
+                full_refresh_seconds=getattr(config, "thirdparty_index_full_refresh_seconds", 3600.0),
+                db_timezone=db_timezone,
+            )
+            self.add_write_listener(self.thirdparty_index.on_write)
+
+        # Change-feed mirror of Dolibarr entities; started by the server lifespan.
+        self.sync_engine: Optional[SyncEngine] = None
+        replica_path = getattr(config, "replica_path", None)
+        if getattr(config, "sync_enabled", False) or replica_path:
+            self.sync_engine = SyncEngine(
+                self,
+                SQLiteStore(replica_path) if replica_path else MemoryStore(),
+                entities=getattr(config, "sync_entities", None) or (),
+                interval=getattr(config, "sync_interval_seconds", 60.0),
+                max_staleness=getattr(config, "replica_max_staleness_seconds", None),
+                default_max_staleness=getattr(config, "replica_default_max_staleness_seconds", 0.0),
+                reconcile_seconds=getattr(config, "sync_reconcile_seconds", 3600.0),
+                db_timezone=db_timezone,
+            )
+            self.add_write_listener(self.sync_engine.on_write)
+
+        self.dictionaries = DictionaryCache(self, ttl=getattr(config, "dictionary_ttl_seconds", 86400.0))
+        self.default_country = getattr(config, "default_country", None)
+
+        # Identical GET requests currently on the wire, keyed like the response cache.
+        self._in_flight: Dict[Any, asyncio.Future] = {}
+        self.coalesced_requests = 0
+        self.metrics = get_metrics()
+
         # Configure timeout
-        self.timeout = ClientTimeout(total=30, connect=10)
+        self.timeout = ClientTimeout(total=getattr(config, "request_timeout_seconds", 30.0), connect=10)
+        self.timeouts = AdaptiveTimeouts(
+            default=self.timeout.total,
+            min_timeout=getattr(config, "adaptive_timeout_min_seconds", 5.0),
+            max_timeout=getattr(config, "adaptive_timeout_max_seconds", 60.0),
+            multiplier=getattr(config, "adaptive_timeout_p99_multiplier", 3.0),
+            overrides=getattr(config, "timeout_overrides", None),
+            enabled=getattr(config, "adaptive_timeouts_enabled", True),
+        )
+        # Streams may take minutes in total, so only the gap between chunks is bounded.
+        self.stream_timeout = ClientTimeout(
+            total=None,
+            connect=self.timeout.connect,
+            sock_read=getattr(config, "stream_read_timeout_seconds", 60.0),
+        )
+        self.slow_call_threshold = getattr(config, "slow_call_threshold_seconds", 2.0)
+        # Families labelled and guarded individually; configured ones count as known too.
+        self.known_families = KNOWN_FAMILIES.union(
+            getattr(config, "timeout_overrides", None) or {},
+            getattr(config, "cache_ttls", None) or {},
+        )
         self.logger.setLevel(config.log_level)
     
     async def __aenter__(self):
@@ -56,11 +202,23 @@ class DolibarrClient:
         """Async context manager exit."""
         await self.close_session()
     
+    def _build_connector(self) -> aiohttp.TCPConnector:
+        """Create the pooled keep-alive connector shared by all requests of this client."""
+        return aiohttp.TCPConnector(
+            limit=self.pool_limit,
+            limit_per_host=self.pool_limit_per_host,
+            keepalive_timeout=self.keepalive_seconds,
+            ttl_dns_cache=self.dns_cache_seconds,
+            use_dns_cache=self.dns_cache_seconds > 0,
+        )
+
     async def start_session(self):
         """Start the HTTP session."""
         if not self.session:
             self.session = aiohttp.ClientSession(
+                connector=self._build_connector(),
                 timeout=self.timeout,
+                json_serialize=codec.dumps,
                 headers={
                     "DOLAPIKEY": self.api_key,
                     "Content-Type": "application/json",
@@ -70,10 +228,27 @@ class DolibarrClient:
     
     async def close_session(self):
         """Close the HTTP session."""
+        if self.sync_engine is not None:
+            await self.sync_engine.close()
+        for index in (self.product_index, self.thirdparty_index):
+            if index is not None:
+                await index.close()
+        await self.dictionaries.close()
         if self.session:
             await self.session.close()
             self.session = None
 
+    def add_write_listener(self, listener: Callable[[str, str, Any], None]) -> None:
+        """Call ``listener(method, endpoint, response)`` after every successful write."""
+        self.write_listeners.append(listener)
+
+    def _notify_write(self, method: str, endpoint: str, response: Any) -> None:
+        for listener in self.write_listeners:
+            try:
+                listener(method, endpoint.lstrip("/"), response)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception("Write listener failed for %s %s", method, endpoint)
+
     @staticmethod
     def _extract_identifier(response: Any) -> Any:
         """Return the identifier from Dolibarr responses when available."""
@@ -125,6 +300,11 @@ class DolibarrClient:
             return "*" * len(self.api_key)
         return f"{self.api_key[:2]}***{self.api_key[-2:]}"
 
+    @staticmethod
+    def _preview(body: bytes, limit: int = 500) -> str:
+        """Return the start of a response body for logging."""
+        return body[:limit].decode("utf-8", errors="replace")
+
     @staticmethod
     def _now_iso() -> str:
         """Return current UTC timestamp in ISO format with Z suffix."""
@@ -132,8 +312,8 @@ class DolibarrClient:
 
     @staticmethod
     def _generate_correlation_id() -> str:
-        """Create a unique correlation identifier."""
-        return str(uuid4())
+        """Return the trace ID of the running tool call, or a new unique identifier."""
+        return current_trace_id() or str(uuid4())
 
     def _generate_reference(self) -> str:
         """Generate a unique reference using prefix, timestamp, and a UUID suffix."""
@@ -160,6 +340,39 @@ class DolibarrClient:
             "timestamp": self._now_iso(),
         }
 
+    def _invalid_fields_error(self, endpoint: str, invalid_fields: List[Dict[str, str]]) -> DolibarrValidationError:
+        """Build the validation error raised for arguments that cannot be used."""
+        error_data = self._build_validation_error(
+            endpoint=endpoint,
+            invalid_fields=invalid_fields,
+            message="Validation failed (invalid: " + ", ".join(f["field"] for f in invalid_fields) + ")",
+        )
+        return DolibarrValidationError(
+            message=error_data["message"],
+            status_code=error_data["status"],
+            response_data=error_data,
+        )
+
+    async def _resolve_dictionary_values(
+        self,
+        payload: Dict[str, Any],
+        fields: Dict[str, Tuple[str, str]],
+        prefix: str = "",
+    ) -> List[Dict[str, str]]:
+        """Replace human-readable values in ``payload`` by dictionary IDs; return the unknown ones."""
+        invalid_fields: List[Dict[str, str]] = []
+        for argument, (dictionary, target) in fields.items():
+            value = payload.pop(argument, None)
+            if value in (None, ""):
+                continue
+            resolved = await self.dictionaries.resolve(dictionary, value)
+            if resolved is None:
+                message = f"no {dictionary} entry matches '{value}'"
+                invalid_fields.append({"field": prefix + argument, "message": message})
+            else:
+                payload[target] = resolved
+        return invalid_fields
+
     def _build_internal_error(self, endpoint: str, message: str, correlation_id: str) -> Dict[str, Any]:
         """Build a structured internal server error response."""
         return {
@@ -180,6 +393,7 @@ class DolibarrClient:
                         payload[target] = payload.pop(alias)
                         break
 
+    @traced("validate_payload")
     def _validate_payload(
         self,
         endpoint: str,
@@ -252,22 +466,372 @@ class DolibarrClient:
 
         return payload
 
+    @traced("dolibarr_request")
     async def _make_request(
         self, 
         method: str, 
         endpoint: str, 
         params: Optional[Dict] = None,
-        data: Optional[Dict] = None
+        data: Optional[Dict] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
-        """Make HTTP request to Dolibarr API."""
+        """Make HTTP request to Dolibarr API, serving cacheable GETs from the response cache."""
+        method = method.upper()
+        family = endpoint_family(endpoint)
+        span = current_span()
+        span.set("method", method)
+        span.set("endpoint", endpoint)
+
+        if method != "GET":
+            response_data, _ = await self._send_guarded(method, endpoint, params, data)
+            if self.cache is not None:
+                self.cache.invalidate_families(written_families(endpoint))
+            self._notify_write(method, endpoint, response_data)
+            return response_data
+
+        cache = self.cache if use_cache else None
+        key = ResponseCache.make_key(endpoint, params)
+        if cache is not None:
+            hit, cached = cache.get(key)
+            if hit:
+                span.set("cache", "hit")
+                return cached
+
+        while True:
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+            # Identical GET already on the wire: share its outcome instead of sending another.
+            self.coalesced_requests += 1
+            span.set("cache", "coalesced")
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The leading request was cancelled; retry on our own behalf.
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            response_data, size = await self._send_guarded(method, endpoint, params, data)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved; waiting callers re-raise it themselves.
+            future.exception()
+            raise
+        else:
+            if cache is not None:
+                cache.set(key, family, response_data, size)
+            future.set_result(response_data)
+            return response_data
+        finally:
+            self._in_flight.pop(key, None)
+
+    def circuit_breaker(self, family: str) -> CircuitBreaker:
+        """Return the circuit breaker guarding an endpoint family."""
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self.circuit_failure_threshold,
+                reset_timeout=self.circuit_reset_seconds,
+            )
+            self._breakers[family] = breaker
+        return breaker
+
+    def scrape_metrics(self) -> Dict[str, Tuple[str, str, Dict[Tuple[str, ...], float], Tuple[str, ...]]]:
+        """Return scrape-time metrics for ``/metrics``: cache, breakers, retries and the connection pool.
+
+        Each entry maps a metric name to ``(type, help, {labels: value}, label names)``.
+        """
+        metrics: Dict[str, Tuple[str, str, Dict[Tuple[str, ...], float], Tuple[str, ...]]] = {}
+        if self.cache is not None:
+            stats = self.cache.stats
+            metrics["dolibarr_mcp_cache_events_total"] = (
+                "counter",
+                "Response cache lookups, evictions and invalidations.",
+                {
+                    ("hit",): stats.hits,
+                    ("miss",): stats.misses,
+                    ("eviction",): stats.evictions,
+                    ("invalidation",): stats.invalidations,
+                },
+                ("event",),
+            )
+            metrics["dolibarr_mcp_cache_hit_ratio"] = ("gauge", "Cache hits / lookups.", {(): stats.hit_ratio}, ())
+            metrics["dolibarr_mcp_cache_entries"] = ("gauge", "Responses held in the cache.", {(): len(self.cache)}, ())
+            metrics["dolibarr_mcp_cache_bytes"] = (
+                "gauge",
+                "Approximate response bytes held in the cache.",
+                {(): self.cache.size_bytes},
+                (),
+            )
+        states = (CircuitBreaker.CLOSED, CircuitBreaker.HALF_OPEN, CircuitBreaker.OPEN)
+        metrics["dolibarr_mcp_circuit_state"] = (
+            "gauge",
+            "1 for the current state of the circuit breaker of each endpoint family.",
+            {
+                (family, state): float(breaker.state == state)
+                for family, breaker in self._breakers.items()
+                for state in states
+            },
+            ("family", "state"),
+        )
+        metrics["dolibarr_mcp_circuit_rejected_total"] = (
+            "counter",
+            "Calls failed fast by an open circuit.",
+            {(family,): breaker.rejected for family, breaker in self._breakers.items()},
+            ("family",),
+        )
+        metrics["dolibarr_mcp_retries_total"] = (
+            "counter",
+            "Retries sent, and retries denied by the retry budget.",
+            {("retried",): self.retry_budget.retries, ("budget_exhausted",): self.retry_budget.exhausted},
+            ("outcome",),
+        )
+        metrics["dolibarr_mcp_coalesced_requests_total"] = (
+            "counter",
+            "GET requests answered by an identical request already in flight.",
+            {(): self.coalesced_requests},
+            (),
+        )
+        metrics["dolibarr_mcp_rate_limit_waits_total"] = (
+            "counter",
+            "Requests delayed by the global rate limiter.",
+            {(kind,): self.rate_limiter.bucket(kind).waits for kind in ("read", "write")},
+            ("kind",),
+        )
+        timeouts = self.timeouts.as_dict()
+        metrics["dolibarr_mcp_request_timeout_seconds"] = (
+            "gauge",
+            "Current request timeout of each endpoint family and request shape.",
+            {profile: entry["timeout"] for profile, entry in timeouts.items()},
+            ("family", "shape"),
+        )
+        metrics["dolibarr_mcp_request_latency_p99_seconds"] = (
+            "gauge",
+            "p99 latency of the recent requests of each endpoint family and request shape.",
+            {profile: entry["p99"] for profile, entry in timeouts.items() if entry["p99"] is not None},
+            ("family", "shape"),
+        )
+        connector = self.session.connector if self.session else None
+        if connector is not None:
+            # aiohttp has no public pool statistics; read its bookkeeping defensively.
+            idle = getattr(connector, "_conns", None) or {}
+            metrics["dolibarr_mcp_pool_connections"] = (
+                "gauge",
+                "Connections of the Dolibarr connection pool by state.",
+                {
+                    ("in_use",): len(getattr(connector, "_acquired", None) or ()),
+                    ("idle",): sum(len(conns) for conns in idle.values()),
+                },
+                ("state",),
+            )
+            metrics["dolibarr_mcp_pool_limit"] = ("gauge", "Connection pool size limit.", {(): connector.limit}, ())
+        return metrics
+
+    def _circuit_open_error(self, endpoint: str, family: str, breaker: CircuitBreaker) -> DolibarrAPIError:
+        """Build the fast-fail error returned while a circuit is open."""
+        retry_in = breaker.retry_in()
+        internal_error = self._build_internal_error(
+            endpoint=endpoint,
+            message=f"Dolibarr is unavailable for '{family}' requests; retry in {retry_in:.0f}s",
+            correlation_id=self._generate_correlation_id(),
+        )
+        internal_error["status"] = 503
+        internal_error["circuit"] = breaker.as_dict()
+        return DolibarrAPIError(
+            message=internal_error["message"],
+            status_code=503,
+            response_data=internal_error,
+        )
+
+    async def _send_guarded(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+    ) -> Tuple[Any, int]:
+        """Send a request through the circuit breaker of its endpoint family.
+
+        Server errors, timeouts and connection failures count against the
+        breaker once per call, after retries; 4xx responses prove the backend
+        is reachable and count as successes.
+        """
+        if not self.circuit_breaker_enabled:
+            return await self._send_request(method, endpoint, params, data)
+
+        family = bounded_family(endpoint, self.known_families)
+        breaker = self.circuit_breaker(family)
+        if not breaker.allow():
+            raise self._circuit_open_error(endpoint, family, breaker)
+
+        try:
+            result = await self._send_request(method, endpoint, params, data)
+        except DolibarrAPIError as exc:
+            self._record_circuit_error(family, breaker, exc)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
+        return result
+
+    def _record_circuit_error(self, family: str, breaker: CircuitBreaker, exc: DolibarrAPIError) -> None:
+        """Count server-side failures against the breaker; client errors prove the backend is up."""
+        if exc.status_code is None or exc.status_code >= 500:
+            breaker.record_failure()
+            if breaker.state == CircuitBreaker.OPEN:
+                self.logger.warning("Circuit opened for '%s' after %s", family, exc.message)
+        else:
+            breaker.record_success()
+
+    def _response_error(
+        self,
+        endpoint: str,
+        status: int,
+        reason: Optional[str],
+        response_data: Any,
+        body: bytes,
+    ) -> DolibarrAPIError:
+        """Build the structured error raised for a Dolibarr response with status >= 400."""
+        if status == 400:
+            missing = []
+            invalid: List[Dict[str, str]] = []
+            if isinstance(response_data, dict):
+                if "missing_fields" in response_data:
+                    missing = response_data.get("missing_fields") or []
+                if "invalid_fields" in response_data:
+                    invalid = response_data.get("invalid_fields") or []
+                # Heuristic: derive missing ref from message
+                if not missing and isinstance(response_data.get("error"), str):
+                    if "ref" in response_data.get("error").lower():
+                        missing.append("ref")
+                if not missing and "message" in response_data and "ref" in str(response_data["message"]).lower():
+                    missing.append("ref")
+            error_data = self._build_validation_error(
+                endpoint=endpoint,
+                missing_fields=missing,
+                invalid_fields=invalid,
+                message="Validation failed",
+            )
+            return DolibarrValidationError(
+                message=error_data["message"],
+                status_code=400,
+                response_data=error_data,
+            )
+
+        if status >= 500:
+            correlation_id = self._generate_correlation_id()
+            internal_error = self._build_internal_error(
+                endpoint=endpoint,
+                message=response_data.get("message", f"An unexpected error occurred while processing {endpoint}"),
+                correlation_id=correlation_id,
+            )
+            self.logger.error(
+                "Server error %s for %s (correlation_id=%s): %s",
+                status,
+                endpoint,
+                correlation_id,
+                self._preview(body),
+            )
+            return DolibarrAPIError(
+                message=internal_error["message"],
+                status_code=status,
+                response_data=internal_error,
+            )
+
+        error_msg = f"HTTP {status}: {reason}"
+        if isinstance(response_data, dict):
+            if "message" in response_data:
+                error_msg = response_data["message"]
+            elif "error" in response_data and isinstance(response_data["error"], str):
+                error_msg = response_data["error"]
+        return DolibarrAPIError(
+            message=error_msg,
+            status_code=status,
+            response_data=response_data,
+        )
+
+    def _observe_request(self, family: str, method: str, status: Any, started: float) -> float:
+        """Record one HTTP attempt in the request counters, latency histogram and current trace."""
+        elapsed = time.perf_counter() - started
+        self.metrics.requests.inc(family, method, status)
+        self.metrics.request_duration.observe(elapsed, family, method)
+        record_span("http_attempt", elapsed, method=method, family=family, status=status)
+        return elapsed
+
+    def _log_slow_call(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict],
+        data: Optional[Dict],
+        status: Any,
+        size: int,
+        elapsed: float,
+        timeout: float,
+        attempt: int,
+    ) -> None:
+        """Write a structured slow-call entry; parameter values other than numbers are reduced to their type."""
+        entry = {
+            "event": "slow_call",
+            "method": method,
+            "endpoint": endpoint,
+            "family": bounded_family(endpoint, self.known_families),
+            "params": {
+                key: value if isinstance(value, (int, float)) else type(value).__name__
+                for key, value in (params or {}).items()
+            },
+            "payload_keys": sorted(data) if isinstance(data, dict) else None,
+            "status": status,
+            "response_bytes": size,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "timeout_seconds": round(timeout, 3),
+            "attempt": attempt,
+            "correlation_id": current_trace_id(),
+        }
+        slow_call_logger.warning("%s", codec.dumps(entry), extra={"slow_call": entry})
+
+    def _should_retry(self, method: str, attempt: int) -> bool:
+        """Return whether a failed attempt may be retried under the policy and retry budget."""
+        return self.retry_policy.can_retry(method, attempt) and self.retry_budget.try_spend()
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+    ) -> Tuple[Any, int]:
+        """Send one request to Dolibarr and return the decoded body and its size in bytes."""
         if not self.session:
             await self.start_session()
         
         url = self._build_url(endpoint)
+        family = bounded_family(endpoint, self.known_families)
+        shape = request_shape(method, endpoint, params)
+        tracer = get_tracer()
         
         last_exception: Optional[Exception] = None
-
-        for attempt in range(self.max_retries + 1):
+        retry_delay = 0.0
+        self.retry_budget.record_request()
+
+        for attempt in range(self.retry_policy.max_retries + 1):
+            if retry_delay:
+                with tracer.span("retry_backoff", delay=retry_delay):
+                    await asyncio.sleep(retry_delay)
+                retry_delay = 0.0
+            if self.rate_limiter.enabled:
+                with tracer.span("rate_limit_wait"):
+                    await self.rate_limiter.acquire(method, current_session.get())
+
+            timeout = self.timeouts.timeout(family, shape)
+            started = time.perf_counter()
             try:
                 if self.debug_mode:
                     self.logger.debug(
@@ -281,89 +845,56 @@ class DolibarrClient:
                 
                 kwargs = {
                     "params": params or {},
+                    "timeout": ClientTimeout(total=timeout, connect=min(self.timeout.connect, timeout)),
                 }
                 
                 if data and method.upper() in ["POST", "PUT"]:
                     kwargs["json"] = data
                 
                 async with self.session.request(method, url, **kwargs) as response:
-                    response_text = await response.text()
+                    body = await response.read()
+                    elapsed = self._observe_request(family, method, response.status, started)
+                    self.timeouts.observe(family, elapsed, shape)
+                    if elapsed >= self.slow_call_threshold > 0:
+                        self._log_slow_call(
+                            method, endpoint, params, data, response.status, len(body), elapsed, timeout, attempt
+                        )
                     
                     # Log response for debugging without leaking secrets
                     if self.debug_mode:
                         self.logger.debug("Response status: %s", response.status)
-                        self.logger.debug("Response body (truncated): %s", response_text[:500])
+                        self.logger.debug("Response body (truncated): %s", self._preview(body))
                     
-                    # Try to parse JSON response
+                    # Parse JSON straight from the raw bytes
                     try:
-                        response_data = json.loads(response_text) if response_text else {}
-                    except json.JSONDecodeError:
-                        response_data = {"raw_response": response_text}
+                        with tracer.span("decode", bytes=len(body)):
+                            response_data = codec.loads(body) if body else {}
+                    except ValueError:
+                        response_data = {"raw_response": body.decode("utf-8", errors="replace")}
+
+                    if response.status in self.retry_policy.retry_statuses and self._should_retry(method, attempt):
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        retry_delay = self.retry_policy.backoff(attempt, retry_after)
+                        self.logger.warning(
+                            "HTTP %s for %s %s, retrying in %.2fs (attempt %s of %s)",
+                            response.status,
+                            method,
+                            endpoint,
+                            retry_delay,
+                            attempt + 1,
+                            self.retry_policy.max_retries,
+                        )
+                        continue
                     
                     # Handle error responses
                     if response.status >= 400:
-                        if response.status == 400:
-                            missing = []
-                            invalid: List[Dict[str, str]] = []
-                            if isinstance(response_data, dict):
-                                if "missing_fields" in response_data:
-                                    missing = response_data.get("missing_fields") or []
-                                if "invalid_fields" in response_data:
-                                    invalid = response_data.get("invalid_fields") or []
-                                # Heuristic: derive missing ref from message
-                                if not missing and isinstance(response_data.get("error"), str):
-                                    if "ref" in response_data.get("error").lower():
-                                        missing.append("ref")
-                                if not missing and "message" in response_data and "ref" in str(response_data["message"]).lower():
-                                    missing.append("ref")
-                            error_data = self._build_validation_error(
-                                endpoint=endpoint,
-                                missing_fields=missing,
-                                invalid_fields=invalid,
-                                message="Validation failed",
-                            )
-                            raise DolibarrValidationError(
-                                message=error_data["message"],
-                                status_code=400,
-                                response_data=error_data,
-                            )
-
-                        if response.status >= 500:
-                            correlation_id = self._generate_correlation_id()
-                            internal_error = self._build_internal_error(
-                                endpoint=endpoint,
-                                message=response_data.get("message", f"An unexpected error occurred while processing {endpoint}"),
-                                correlation_id=correlation_id,
-                            )
-                            self.logger.error(
-                                "Server error %s for %s (correlation_id=%s): %s",
-                                response.status,
-                                endpoint,
-                                correlation_id,
-                                response_text[:500],
-                            )
-                            raise DolibarrAPIError(
-                                message=internal_error["message"],
-                                status_code=response.status,
-                                response_data=internal_error,
-                            )
-
-                        error_msg = f"HTTP {response.status}: {response.reason}"
-                        if isinstance(response_data, dict):
-                            if "message" in response_data:
-                                error_msg = response_data["message"]
-                            elif "error" in response_data and isinstance(response_data["error"], str):
-                                error_msg = response_data["error"]
-                        raise DolibarrAPIError(
-                            message=error_msg,
-                            status_code=response.status,
-                            response_data=response_data,
-                        )
+                        raise self._response_error(endpoint, response.status, response.reason, response_data, body)
                     
-                    return response_data
+                    return response_data, len(body)
                     
             except aiohttp.ClientError as e:
                 last_exception = e
+                self._observe_request(family, method, "error", started)
                 if endpoint == "status" and not url.endswith("/api/status"):
                     try:
                         alt_url = f"{self.base_url}/setup/modules"
@@ -375,17 +906,29 @@ class DolibarrClient:
                                     "success": 1,
                                     "dolibarr_version": "API Available",
                                     "api_version": "1.0"
-                                }
+                                }, 0
                     except Exception as alt_exc:  # pylint: disable=broad-except
                         last_exception = alt_exc
 
-                if attempt < self.max_retries and isinstance(e, aiohttp.ClientResponseError) and e.status in {502, 503, 504}:
-                    backoff = self.retry_backoff_seconds * (2 ** attempt)
-                    await asyncio.sleep(backoff)
+                if isinstance(e, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)) and self._should_retry(method, attempt):
+                    retry_delay = self.retry_policy.backoff(attempt)
+                    self.logger.warning("%s for %s %s, retrying in %.2fs", type(e).__name__, method, endpoint, retry_delay)
                     continue
                 break
             except DolibarrAPIError:
                 raise
+            except asyncio.TimeoutError as e:
+                last_exception = e
+                self._observe_request(family, method, "timeout", started)
+                # Count the timeout as a latency of at least the budget it exhausted.
+                self.timeouts.observe(family, timeout, shape)
+                if self.slow_call_threshold > 0:
+                    self._log_slow_call(method, endpoint, params, data, "timeout", 0, timeout, timeout, attempt)
+                if self._should_retry(method, attempt):
+                    retry_delay = self.retry_policy.backoff(attempt)
+                    self.logger.warning("Timeout for %s %s, retrying in %.2fs", method, endpoint, retry_delay)
+                    continue
+                break
             except Exception as e:  # pylint: disable=broad-except
                 last_exception = e
                 break
@@ -395,9 +938,13 @@ class DolibarrClient:
 
         if isinstance(last_exception, Exception):
             correlation_id = self._generate_correlation_id()
+            if isinstance(last_exception, asyncio.TimeoutError):
+                message = f"Request timed out after {timeout:g}s"
+            else:
+                message = str(last_exception)
             internal_error = self._build_internal_error(
                 endpoint=endpoint,
-                message=str(last_exception),
+                message=message,
                 correlation_id=correlation_id,
             )
             self.logger.error(
@@ -454,6 +1001,30 @@ class DolibarrClient:
             except:
                 raise DolibarrAPIError("Cannot connect to Dolibarr API. Please check your configuration.")
     
+    async def get_sync_status(self) -> Dict[str, Any]:
+        """Return per-entity lag and progress of the change-feed sync engine."""
+        if self.sync_engine is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.sync_engine.status()}
+
+    async def lookup_dictionary(
+        self,
+        dictionary: str,
+        query: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Look up setup dictionary entries by ID, code or label from the dictionary cache."""
+        try:
+            loaded = await self.dictionaries.get(dictionary)
+        except KeyError as exc:
+            message = f"must be one of {sorted(self.dictionaries.specs)}"
+            raise self._invalid_fields_error("setup/dictionary", [{"field": "dictionary", "message": message}]) from exc
+        if not query:
+            return {"dictionary": dictionary, "count": len(loaded), "entries": loaded.entries[:limit]}
+        exact = loaded.lookup(query)
+        entries = [exact] if exact is not None else loaded.search(query, limit)
+        return {"dictionary": dictionary, "count": len(entries), "entries": entries}
+
     # ============================================================================
     # USER MANAGEMENT
     # ============================================================================
@@ -462,7 +1033,7 @@ class DolibarrClient:
         """Get list of users."""
         params = {"limit": limit}
         if page > 1:
-            params["page"] = page
+            params["page"] = page - 1
         
         result = await self.request("GET", "users", params=params)
         return result if isinstance(result, list) else []
@@ -509,7 +1080,7 @@ class DolibarrClient:
         """Get list of customers/third parties."""
         params = {"limit": limit}
         if page > 1:
-            params["page"] = page
+            params["page"] = page - 1
         
         result = await self.request("GET", "thirdparties", params=params)
         return result if isinstance(result, list) else []
@@ -534,7 +1105,12 @@ class DolibarrClient:
             payload.setdefault("client", 1)
 
         payload.setdefault("status", payload.get("status", 1))
-        payload.setdefault("country_id", payload.get("country_id", 1))
+        if "country_id" not in payload and not payload.get("country") and self.default_country:
+            payload["country"] = self.default_country
+        invalid_fields = await self._resolve_dictionary_values(payload, CUSTOMER_DICTIONARY_FIELDS)
+        if invalid_fields:
+            raise self._invalid_fields_error("thirdparties", invalid_fields)
+        payload.setdefault("country_id", 1)
 
         result = await self.request("POST", "thirdparties", data=payload)
         return self._extract_identifier(result)
@@ -569,9 +1145,12 @@ class DolibarrClient:
         result = await self.request("GET", "products", params=params)
         return result if isinstance(result, list) else []
 
-    async def get_products(self, limit: int = 100) -> List[Dict[str, Any]]:
+    async def get_products(self, limit: int = 100, page: int = 1) -> List[Dict[str, Any]]:
         """Get list of products."""
         params = {"limit": limit}
+        if page > 1:
+            params["page"] = page - 1
+
         result = await self.request("GET", "products", params=params)
         return result if isinstance(result, list) else []
     
@@ -586,6 +1165,9 @@ class DolibarrClient:
     ) -> Dict[str, Any]:
         """Create a new product or service."""
         payload = self._merge_payload(data, **kwargs)
+        invalid_fields = await self._resolve_dictionary_values(payload, LINE_DICTIONARY_FIELDS)
+        if invalid_fields:
+            raise self._invalid_fields_error("products", invalid_fields)
         payload = self._validate_payload(
             endpoint="products",
             payload=payload,
@@ -617,9 +1199,11 @@ class DolibarrClient:
     # INVOICE MANAGEMENT
     # ============================================================================
     
-    async def get_invoices(self, limit: int = 100, status: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_invoices(self, limit: int = 100, status: Optional[str] = None, page: int = 1) -> List[Dict[str, Any]]:
         """Get list of invoices."""
         params = {"limit": limit}
+        if page > 1:
+            params["page"] = page - 1
         if status:
             params["status"] = status
         
@@ -629,7 +1213,74 @@ class DolibarrClient:
     async def get_invoice_by_id(self, invoice_id: int) -> Dict[str, Any]:
         """Get specific invoice by ID."""
         return await self.request("GET", f"invoices/{invoice_id}")
-    
+
+    async def get_invoice_details(self, invoice_id: int) -> Dict[str, Any]:
+        """Get an invoice joined with its customer, project and line products.
+
+        After the invoice is loaded the related objects are fetched concurrently,
+        each distinct ID once and through the response cache (or the sync
+        mirror). Related objects that cannot be loaded are listed under
+        ``errors`` instead of failing the call.
+        """
+        invoice = await self.get_invoice_by_id(invoice_id)
+        if not isinstance(invoice, dict):
+            return {"invoice": invoice}
+        lines = [line for line in invoice.get("lines") or [] if isinstance(line, dict)]
+
+        related: List[Tuple[str, int, Callable[[int], Awaitable[Any]]]] = []
+        customer_id = self._related_id(invoice.get("socid"))
+        if customer_id is not None:
+            related.append(("thirdparties", customer_id, self.get_customer_by_id))
+        project_id = self._related_id(invoice.get("fk_project"))
+        if project_id is not None:
+            related.append(("projects", project_id, self.get_project_by_id))
+        product_ids = dict.fromkeys(self._related_id(line.get("fk_product")) for line in lines)
+        related.extend(("products", product_id, self.get_product_by_id) for product_id in product_ids if product_id)
+
+        semaphore = asyncio.Semaphore(max(1, self.fetch_max_concurrency))
+
+        async def load(entity: str, identifier: int, fetch: Callable[[int], Awaitable[Any]]) -> Any:
+            mirrored = self.sync_engine.lookup(entity, identifier) if self.sync_engine is not None else None
+            if mirrored is not None:
+                return mirrored
+            async with semaphore:
+                return await fetch(identifier)
+
+        results = await asyncio.gather(*(load(*item) for item in related), return_exceptions=True)
+
+        loaded: Dict[Tuple[str, int], Any] = {}
+        errors: List[Dict[str, Any]] = []
+        for (entity, identifier, _), result in zip(related, results):
+            if isinstance(result, DolibarrAPIError):
+                errors.append({"entity": entity, "id": identifier, "status": result.status_code, "error": result.message})
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                loaded[(entity, identifier)] = result
+
+        # Copy instead of annotating in place: the invoice may be a cached response.
+        joined_lines = [
+            {**line, "product": loaded.get(("products", self._related_id(line.get("fk_product"))))}
+            for line in lines
+        ]
+        details: Dict[str, Any] = {
+            "invoice": {**invoice, "lines": joined_lines} if "lines" in invoice else invoice,
+            "customer": loaded.get(("thirdparties", customer_id)),
+            "project": loaded.get(("projects", project_id)),
+        }
+        if errors:
+            details["errors"] = errors
+        return details
+
+    @staticmethod
+    def _related_id(value: Any) -> Optional[int]:
+        """Return a positive foreign key, treating Dolibarr's empty values ("", "0", None) as none."""
+        try:
+            identifier = int(value)
+        except (TypeError, ValueError):
+            return None
+        return identifier if identifier > 0 else None
+
     async def create_invoice(
         self,
         data: Optional[Dict[str, Any]] = None,
@@ -651,6 +1302,14 @@ class DolibarrClient:
                 if "product_type" in line:
                     line["product_type"] = line["product_type"]
 
+        invalid_fields = await self._resolve_dictionary_values(payload, INVOICE_DICTIONARY_FIELDS)
+        for index, line in enumerate(payload.get("lines") or []):
+            if isinstance(line, dict):
+                prefix = f"lines[{index}]."
+                invalid_fields += await self._resolve_dictionary_values(line, LINE_DICTIONARY_FIELDS, prefix)
+        if invalid_fields:
+            raise self._invalid_fields_error("invoices", invalid_fields)
+
         payload = self._validate_payload(
             endpoint="invoices",
             payload=payload,
@@ -689,6 +1348,89 @@ class DolibarrClient:
             
         return await self.request("POST", f"invoices/{invoice_id}/lines", data=payload)
 
+    async def add_invoice_lines(
+        self,
+        invoice_id: int,
+        lines: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Add many lines to a draft invoice concurrently, keeping their order.
+
+        Every line is validated before anything is sent; one invalid line
+        rejects the whole call. Lines without an explicit ``rang`` are numbered
+        after the invoice's existing lines, so concurrent inserts keep the given
+        order. Per-line outcomes are returned in input order.
+        """
+        endpoint = f"invoices/{invoice_id}/lines"
+        payloads: List[Dict[str, Any]] = []
+        line_errors: List[Dict[str, Any]] = []
+        for index, line in enumerate(lines):
+            payload = dict(line)
+            if "product_id" in payload:
+                payload["fk_product"] = payload.pop("product_id")
+            try:
+                payloads.append(
+                    self._validate_payload(
+                        endpoint=endpoint,
+                        payload=payload,
+                        required_fields=["qty", "subprice"],
+                        required_any_of=[["desc", "fk_product"]],
+                        enum_fields={"product_type": [0, 1]},
+                    )
+                )
+            except DolibarrValidationError as exc:
+                line_errors.append({"index": index, **exc.response_data})
+        if line_errors:
+            error_data = self._build_validation_error(
+                endpoint=endpoint,
+                message=f"Validation failed for {len(line_errors)} of {len(lines)} lines",
+            )
+            error_data["lines"] = line_errors
+            raise DolibarrValidationError(
+                message=error_data["message"],
+                status_code=error_data["status"],
+                response_data=error_data,
+            )
+
+        if any("rang" not in payload for payload in payloads):
+            invoice = await self.get_invoice_by_id(invoice_id)
+            existing = invoice.get("lines") if isinstance(invoice, dict) else None
+            rang = max(
+                (self._related_id(line.get("rang")) or 0 for line in existing or [] if isinstance(line, dict)),
+                default=0,
+            )
+            for payload in payloads:
+                if "rang" not in payload:
+                    rang += 1
+                    payload["rang"] = rang
+
+        limit = max(1, min(max_concurrency or self.batch_max_concurrency, self.batch_max_concurrency))
+        semaphore = asyncio.Semaphore(limit)
+
+        async def add(index: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+            outcome: Dict[str, Any] = {"index": index, "rang": payload["rang"]}
+            try:
+                async with semaphore:
+                    outcome["line_id"] = await self.request("POST", endpoint, data=payload)
+                outcome["ok"] = True
+            except DolibarrAPIError as exc:
+                outcome.update(
+                    ok=False,
+                    error=exc.response_data
+                    or {"error": "Dolibarr API Error", "status": exc.status_code or 500, "message": exc.message},
+                )
+            return outcome
+
+        results = await asyncio.gather(*(add(index, payload) for index, payload in enumerate(payloads)))
+        succeeded = sum(1 for result in results if result["ok"])
+        return {
+            "invoice_id": invoice_id,
+            "count": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results,
+        }
+
     async def update_invoice_line(
         self,
         invoice_id: int,
@@ -716,9 +1458,11 @@ class DolibarrClient:
     # ORDER MANAGEMENT
     # ============================================================================
     
-    async def get_orders(self, limit: int = 100, status: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_orders(self, limit: int = 100, status: Optional[str] = None, page: int = 1) -> List[Dict[str, Any]]:
         """Get list of orders."""
         params = {"limit": limit}
+        if page > 1:
+            params["page"] = page - 1
         if status:
             params["status"] = status
         
@@ -757,9 +1501,12 @@ class DolibarrClient:
     # CONTACT MANAGEMENT
     # ============================================================================
     
-    async def get_contacts(self, limit: int = 100) -> List[Dict[str, Any]]:
+    async def get_contacts(self, limit: int = 100, page: int = 1) -> List[Dict[str, Any]]:
         """Get list of contacts."""
         params = {"limit": limit}
+        if page > 1:
+            params["page"] = page - 1
+
         result = await self.request("GET", "contacts", params=params)
         return result if isinstance(result, list) else []
     
@@ -797,7 +1544,9 @@ class DolibarrClient:
     
     async def get_projects(self, limit: int = 100, page: int = 1, status: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get list of projects."""
-        params: Dict[str, Any] = {"limit": limit, "page": page}
+        params: Dict[str, Any] = {"limit": limit}
+        if page > 1:
+            params["page"] = page - 1
         if status is not None:
             params["status"] = status
         result = await self.request("GET", "projects", params=params)
@@ -835,6 +1584,376 @@ class DolibarrClient:
         """Delete a project."""
         return await self.request("DELETE", f"projects/{project_id}")
 
+    # ============================================================================
+    # PAGINATED ITERATION
+    # ============================================================================
+
+    async def _fetch_list_page(
+        self,
+        endpoint: str,
+        page: int,
+        limit: int,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetch one zero-based page of a list endpoint, bypassing the response cache."""
+        query: Dict[str, Any] = {key: value for key, value in (params or {}).items() if value is not None}
+        query.update({"limit": limit, "page": page})
+        try:
+            result = await self._make_request("GET", endpoint, params=query, use_cache=False)
+        except DolibarrAPIError as exc:
+            # Dolibarr answers 404 instead of an empty list once the last page is passed.
+            if exc.status_code == 404:
+                return []
+            raise
+        return result if isinstance(result, list) else []
+
+    def iter_list(
+        self,
+        endpoint: str,
+        page_size: int = 100,
+        read_ahead: int = 0,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over every record of a list endpoint, fetching ``read_ahead`` pages in advance."""
+
+        async def fetch_page(page: int) -> List[Dict[str, Any]]:
+            return await self._fetch_list_page(endpoint, page, page_size, params)
+
+        return iter_records(fetch_page, page_size, read_ahead=read_ahead)
+
+    async def stream_list(
+        self,
+        endpoint: str,
+        limit: int = 0,
+        params: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 64 * 1024,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the records of a single list response while it is being received.
+
+        The JSON array is parsed incrementally from the response stream, so
+        memory stays proportional to one record instead of the whole response.
+        ``limit=0`` asks Dolibarr for every record in one response. Streams
+        have no total timeout, only ``stream_read_timeout_seconds`` between
+        chunks; they bypass the response cache and are not retried once
+        records have been yielded.
+        """
+        if not self.session:
+            await self.start_session()
+
+        query: Dict[str, Any] = {key: value for key, value in (params or {}).items() if value is not None}
+        query["limit"] = limit
+        family = bounded_family(endpoint, self.known_families)
+        breaker = self.circuit_breaker(family) if self.circuit_breaker_enabled else None
+        if breaker is not None and not breaker.allow():
+            raise self._circuit_open_error(endpoint, family, breaker)
+        if self.rate_limiter.enabled:
+            await self.rate_limiter.acquire("GET", current_session.get())
+        self.retry_budget.record_request()
+
+        parser = JSONArrayStream()
+        try:
+            async with self.session.request(
+                "GET", self._build_url(endpoint), params=query, timeout=self.stream_timeout
+            ) as response:
+                if response.status >= 400:
+                    body = await response.read()
+                    try:
+                        response_data = codec.loads(body) if body else {}
+                    except ValueError:
+                        response_data = {"raw_response": body.decode("utf-8", errors="replace")}
+                    error = self._response_error(endpoint, response.status, response.reason, response_data, body)
+                    if breaker is not None:
+                        self._record_circuit_error(family, breaker, error)
+                    if response.status == 404:
+                        # Dolibarr answers 404 instead of an empty list.
+                        return
+                    raise error
+
+                if breaker is not None:
+                    breaker.record_success()
+                    breaker = None
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    for record in parser.feed(chunk):
+                        yield record
+                document = parser.close()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
+            if breaker is not None:
+                breaker.record_failure()
+            correlation_id = self._generate_correlation_id()
+            internal_error = self._build_internal_error(endpoint=endpoint, message=str(exc), correlation_id=correlation_id)
+            self.logger.error("Streaming %s failed (correlation_id=%s): %s", endpoint, correlation_id, exc)
+            raise DolibarrAPIError(
+                message=internal_error["message"],
+                status_code=500,
+                response_data=internal_error,
+            ) from exc
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+
+        if isinstance(document, dict) and isinstance(document.get("data"), list):
+            for record in document["data"]:
+                yield record
+
+    def stream_products(self, limit: int = 0, sqlfilters: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream products from one response, parsed record by record."""
+        return self.stream_list("products", limit, {"sqlfilters": sqlfilters})
+
+    def stream_customers(self, limit: int = 0, sqlfilters: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream third parties from one response, parsed record by record."""
+        return self.stream_list("thirdparties", limit, {"sqlfilters": sqlfilters})
+
+    def stream_invoices(
+        self,
+        limit: int = 0,
+        status: Optional[str] = None,
+        sqlfilters: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream invoices from one response, parsed record by record."""
+        return self.stream_list("invoices", limit, {"status": status, "sqlfilters": sqlfilters})
+
+    async def _probe_list(
+        self,
+        endpoint: str,
+        page_size: int,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Fetch the first page together with the page count when Dolibarr reports it.
+
+        ``pagination_data=true`` makes recent Dolibarr versions wrap the list in
+        ``{"data": [...], "pagination": {"page_count": ...}}``; older versions
+        ignore it and return the bare list, in which case the count is unknown.
+        """
+        probe_params = dict(params or {})
+        probe_params["pagination_data"] = "true"
+        query: Dict[str, Any] = {key: value for key, value in probe_params.items() if value is not None}
+        query.update({"limit": page_size, "page": 0})
+        try:
+            result = await self._make_request("GET", endpoint, params=query, use_cache=False)
+        except DolibarrAPIError as exc:
+            if exc.status_code == 404:
+                return [], 0
+            raise
+
+        if isinstance(result, dict) and isinstance(result.get("data"), list):
+            pagination = result.get("pagination") or {}
+            try:
+                page_count: Optional[int] = int(pagination["page_count"])
+            except (KeyError, TypeError, ValueError):
+                page_count = None
+            return result["data"], page_count
+        return (result if isinstance(result, list) else []), None
+
+    async def stream_all(
+        self,
+        endpoint: str,
+        page_size: int = 100,
+        max_concurrency: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+        ordered: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Fetch every page of a list endpoint concurrently and yield the records.
+
+        The first page is probed for the total page count; the remaining pages are
+        fetched by at most ``max_concurrency`` concurrent requests. With
+        ``ordered=False`` records are yielded as soon as their page arrives,
+        otherwise in page order.
+        """
+        max_concurrency = max(1, max_concurrency or self.fetch_max_concurrency)
+        first_page, page_count = await self._probe_list(endpoint, page_size, params)
+        for record in first_page:
+            yield record
+        if len(first_page) < page_size or (page_count is not None and page_count <= 1):
+            return
+
+        remaining = None if page_count is None else page_count - 1
+
+        async def fetch_page(page: int) -> List[Dict[str, Any]]:
+            return await self._fetch_list_page(endpoint, page, page_size, params)
+
+        if ordered:
+            pages = iter_pages(
+                fetch_page,
+                page_size,
+                read_ahead=max_concurrency - 1,
+                start_page=1,
+                max_pages=remaining,
+            )
+            async for page in pages:
+                for record in page:
+                    yield record
+        else:
+            pages = iter_pages_concurrently(
+                fetch_page,
+                page_size,
+                max_concurrency=max_concurrency,
+                start_page=1,
+                page_count=remaining,
+            )
+            async for _, page in pages:
+                for record in page:
+                    yield record
+
+    async def fetch_all(
+        self,
+        endpoint: str,
+        page_size: int = 100,
+        max_concurrency: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return every record of a list endpoint in order, fetching pages concurrently."""
+        return [
+            record
+            async for record in self.stream_all(endpoint, page_size, max_concurrency, params, ordered=True)
+        ]
+
+    async def get_all_invoices(
+        self,
+        status: Optional[str] = None,
+        page_size: int = 100,
+        max_concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return all invoices, optionally filtered by status, using concurrent page fetches."""
+        return await self.fetch_all("invoices", page_size, max_concurrency, {"status": status or None})
+
+    def iter_users(self, page_size: int = 100, read_ahead: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all users."""
+        return self.iter_list("users", page_size, read_ahead)
+
+    def iter_customers(
+        self,
+        page_size: int = 100,
+        read_ahead: int = 0,
+        sqlfilters: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all customers/third parties, optionally filtered."""
+        return self.iter_list("thirdparties", page_size, read_ahead, {"sqlfilters": sqlfilters})
+
+    def iter_products(
+        self,
+        page_size: int = 100,
+        read_ahead: int = 0,
+        sqlfilters: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all products, optionally filtered."""
+        return self.iter_list("products", page_size, read_ahead, {"sqlfilters": sqlfilters})
+
+    def iter_invoices(
+        self,
+        page_size: int = 100,
+        read_ahead: int = 0,
+        status: Optional[str] = None,
+        sqlfilters: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all invoices, optionally filtered by status."""
+        return self.iter_list("invoices", page_size, read_ahead, {"status": status or None, "sqlfilters": sqlfilters})
+
+    def iter_orders(
+        self,
+        page_size: int = 100,
+        read_ahead: int = 0,
+        status: Optional[str] = None,
+        sqlfilters: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all orders, optionally filtered by status."""
+        return self.iter_list("orders", page_size, read_ahead, {"status": status or None, "sqlfilters": sqlfilters})
+
+    def iter_contacts(
+        self,
+        page_size: int = 100,
+        read_ahead: int = 0,
+        sqlfilters: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all contacts, optionally filtered."""
+        return self.iter_list("contacts", page_size, read_ahead, {"sqlfilters": sqlfilters})
+
+    def iter_projects(
+        self,
+        page_size: int = 100,
+        read_ahead: int = 0,
+        status: Optional[int] = None,
+        sqlfilters: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all projects, optionally filtered by status."""
+        return self.iter_list("projects", page_size, read_ahead, {"status": status, "sqlfilters": sqlfilters})
+
+    # ============================================================================
+    # REPORTS
+    # ============================================================================
+
+    async def report_receivables_aging(
+        self,
+        as_of: Optional[str] = None,
+        by_customer: bool = False,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Outstanding amounts of unpaid invoices per aging bucket, optionally per customer."""
+        report = ReceivablesAging(self._report_day("as_of", as_of), by_customer, limit)
+        result = await self._run_report(report, {"status": "unpaid"})
+        if by_customer:
+            await self._attach_customer_names(result["customers"], "customer_id")
+        return result
+
+    async def report_top_debtors(self, limit: int = 10, as_of: Optional[str] = None) -> Dict[str, Any]:
+        """Customers with the largest outstanding amounts on unpaid invoices."""
+        report = TopDebtors(self._report_day("as_of", as_of), limit)
+        result = await self._run_report(report, {"status": "unpaid"})
+        await self._attach_customer_names(result["debtors"], "customer_id")
+        return result
+
+    async def report_revenue(
+        self,
+        group_by: str = "month",
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Revenue of validated invoices dated in a range, grouped by customer, product or month."""
+        if group_by not in RevenueReport.GROUPS:
+            message = f"must be one of {list(RevenueReport.GROUPS)}"
+            raise self._invalid_fields_error("invoices", [{"field": "group_by", "message": message}])
+        day_from = self._report_day("date_from", date_from)
+        day_to = self._report_day("date_to", date_to)
+        report = RevenueReport(group_by, limit)
+        result = await self._run_report(report, {"sqlfilters": issued_between_filter(day_from, day_to)})
+        result.update(date_from=date_from, date_to=date_to)
+        if group_by == "customer":
+            await self._attach_customer_names(result["rows"], "key")
+        return result
+
+    async def _run_report(self, report: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Feed every matching invoice to ``report`` in one paginated pass."""
+        async for invoice in self.iter_list("invoices", REPORT_PAGE_SIZE, read_ahead=1, params=params):
+            report.add(invoice)
+        return report.result()
+
+    async def _attach_customer_names(self, rows: List[Dict[str, Any]], id_field: str) -> None:
+        """Add the third party name to each report row, fetching the names concurrently."""
+        semaphore = asyncio.Semaphore(max(1, self.fetch_max_concurrency))
+
+        async def name_of(customer_id: Any) -> Optional[str]:
+            identifier = self._related_id(customer_id)
+            if identifier is None:
+                return None
+            try:
+                async with semaphore:
+                    customer = await self.get_customer_by_id(identifier)
+            except DolibarrAPIError:
+                return None
+            return customer.get("name") if isinstance(customer, dict) else None
+
+        names = await asyncio.gather(*(name_of(row.get(id_field)) for row in rows))
+        for row, name in zip(rows, names):
+            row["name"] = name
+
+    def _report_day(self, field: str, value: Optional[str]) -> Optional[date]:
+        try:
+            return parse_day(value)
+        except ValueError as exc:
+            raise self._invalid_fields_error("invoices", [{"field": field, "message": str(exc)}]) from exc
+
+
     # ============================================================================
     # RAW API CALL
     # ============================================================================
@@ -0,0 +1,818 @@
+"""Stand-in Dolibarr REST API for offline load tests and benchmarks.
+
+``FakeDolibarr`` serves ``status``, ``thirdparties``, ``products``,
+``invoices`` (with lines and validation), ``orders``, ``contacts``,
+``projects``, ``users`` and the setup dictionaries under
+``/api/index.php`` with aiohttp. It follows the Dolibarr conventions the
+client relies on: ``limit``/``page`` pagination, ``sortfield``/``sortorder``,
+``sqlfilters``, ``pagination_data=true`` envelopes and a 404 for empty pages.
+
+Synthetic data is generated deterministically from a seed. Invoice lines are
+derived from the invoice ID on demand and only materialized once an invoice
+is modified, so a dataset with a million lines fits in memory. Latency and
+failures can be injected per request to exercise retries, circuit breakers
+and adaptive timeouts.
+"""
+
+import asyncio
+import math
+import random
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+from . import codec
+
+# Entities served as CRUD collections.
+ENTITIES = ("thirdparties", "products", "invoices", "orders", "contacts", "projects", "users")
+
+# sqlfilter columns whose name differs from the field returned by the API.
+COLUMN_FIELDS = {
+    "rowid": "id",
+    "nom": "name",
+    "fk_statut": "status",
+    "statut": "status",
+    "fk_soc": "socid",
+    "datef": "date",
+    "datec": "date_creation",
+    "tms": "date_modification",
+    "fk_projet": "fk_project",
+}
+
+# Filtered and sorted ID lists kept per entity between pages of a listing.
+QUERY_CACHE_SIZE = 256
+
+# Request storage key for the number of records a list response carries (typed on aiohttp >= 3.12).
+RECORD_COUNT: Any = web.RequestKey("record_count", int) if hasattr(web, "RequestKey") else "record_count"
+
+# Synthetic records start on 2024-01-01 UTC and spread over one year.
+EPOCH = 1704067200
+YEAR_SECONDS = 365 * 86400
+
+DICTIONARIES: Dict[str, List[Dict[str, Any]]] = {
+    "countries": [
+        {"id": "1", "code": "FR", "code_iso": "FRA", "label": "France"},
+        {"id": "2", "code": "BE", "code_iso": "BEL", "label": "Belgium"},
+        {"id": "5", "code": "DE", "code_iso": "DEU", "label": "Germany"},
+        {"id": "11", "code": "US", "code_iso": "USA", "label": "United States"},
+    ],
+    "payment_terms": [
+        {"id": "1", "code": "RECEP", "label": "Due upon receipt"},
+        {"id": "2", "code": "30D", "label": "30 days"},
+    ],
+    "payment_types": [
+        {"id": "2", "code": "VIR", "label": "Bank transfer"},
+        {"id": "6", "code": "CB", "label": "Credit card"},
+    ],
+    "units": [{"rowid": "1", "code": "P", "short_label": "pc", "label": "Piece"}],
+    "currencies": [{"code_iso": "EUR", "label": "Euros"}, {"code_iso": "USD", "label": "US Dollar"}],
+}
+
+_CRITERION = re.compile(
+    r"\(\s*t\.(\w+)\s*:\s*(<=|>=|<>|!=|=|<|>|[a-z]+)\s*:\s*('(?:[^'\\]|\\.|'')*'|[^()]*?)\s*\)",
+    re.IGNORECASE,
+)
+_CONNECTOR = re.compile(r"(AND|OR)\b", re.IGNORECASE)
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2})?)?$")
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'").replace("\\'", "'")
+    return value
+
+
+def _coerce(value: str) -> Any:
+    """Turn a filter literal into a number or timestamp where it looks like one."""
+    if _DATE.match(value):
+        text = value.replace("T", " ")
+        fmt = {10: "%Y-%m-%d", 16: "%Y-%m-%d %H:%M"}.get(len(text), "%Y-%m-%d %H:%M:%S")
+        return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc).timestamp()
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _comparable(value: Any, literal: Any) -> Tuple[Any, Any]:
+    if isinstance(literal, float):
+        try:
+            return float(value), literal
+        except (TypeError, ValueError):
+            return None, literal
+    return ("" if value is None else str(value)).casefold(), str(literal).casefold()
+
+
+def _like(pattern: str) -> "re.Pattern[str]":
+    regex = "".join(".*" if char == "%" else "." if char == "_" else re.escape(char) for char in pattern)
+    return re.compile(f"^{regex}$", re.IGNORECASE | re.DOTALL)
+
+
+def _criterion(column: str, operator: str, raw: str) -> Predicate:
+    field = COLUMN_FIELDS.get(column.lower(), column.lower())
+    operator = operator.lower()
+    if operator in ("like", "notlike"):
+        pattern = _like(_unquote(raw))
+        negate = operator == "notlike"
+        return lambda record: bool(pattern.match(str(record.get(field) or ""))) != negate
+    if operator in ("in", "notin"):
+        members = {str(_unquote(item)).casefold() for item in raw.split(",")}
+        negate = operator == "notin"
+        return lambda record: (str(record.get(field)).casefold() in members) != negate
+    if operator == "is":
+        return lambda record: record.get(field) in (None, "")
+    if operator == "isnot":
+        return lambda record: record.get(field) not in (None, "")
+    literal = _coerce(_unquote(raw))
+    compare: Dict[str, Callable[[Any, Any], bool]] = {
+        "=": lambda a, b: a == b,
+        "!=": lambda a, b: a != b,
+        "<>": lambda a, b: a != b,
+        "<": lambda a, b: a < b,
+        ">": lambda a, b: a > b,
+        "<=": lambda a, b: a <= b,
+        ">=": lambda a, b: a >= b,
+    }
+    if operator not in compare:
+        raise ValueError(f"Unsupported sqlfilters operator '{operator}'")
+    op = compare[operator]
+
+    def predicate(record: Dict[str, Any]) -> bool:
+        value, bound = _comparable(record.get(field), literal)
+        return value is not None and op(value, bound)
+
+    return predicate
+
+
+def parse_sqlfilters(expression: str) -> Predicate:
+    """Compile a Dolibarr ``sqlfilters`` expression into a record predicate.
+
+    Supports ``(t.column:operator:value)`` criteria combined with ``AND``/``OR``
+    (``AND`` binds tighter) and nested parentheses. Raises ``ValueError`` on
+    malformed input, which the server answers with a 400 like Dolibarr.
+    """
+    tokens: List[Tuple[str, Any]] = []
+    position = 0
+    while position < len(expression):
+        if expression[position].isspace():
+            position += 1
+            continue
+        match = _CRITERION.match(expression, position)
+        if match:
+            tokens.append(("crit", _criterion(*match.groups())))
+            position = match.end()
+            continue
+        match = _CONNECTOR.match(expression, position)
+        if match:
+            tokens.append((match.group(1).upper(), None))
+            position = match.end()
+            continue
+        if expression[position] in "()":
+            tokens.append((expression[position], None))
+            position += 1
+            continue
+        raise ValueError(f"Error when validating parameter sqlfilters -> {expression}")
+
+    index = 0
+
+    def parse_or() -> Predicate:
+        nonlocal index
+        terms = [parse_and()]
+        while index < len(tokens) and tokens[index][0] == "OR":
+            index += 1
+            terms.append(parse_and())
+        return terms[0] if len(terms) == 1 else lambda record: any(term(record) for term in terms)
+
+    def parse_and() -> Predicate:
+        nonlocal index
+        factors = [parse_factor()]
+        while index < len(tokens) and tokens[index][0] == "AND":
+            index += 1
+            factors.append(parse_factor())
+        return factors[0] if len(factors) == 1 else lambda record: all(factor(record) for factor in factors)
+
+    def parse_factor() -> Predicate:
+        nonlocal index
+        if index >= len(tokens):
+            raise ValueError(f"Error when validating parameter sqlfilters -> {expression}")
+        kind, value = tokens[index]
+        index += 1
+        if kind == "crit":
+            return value
+        if kind == "(":
+            inner = parse_or()
+            if index >= len(tokens) or tokens[index][0] != ")":
+                raise ValueError(f"Error when validating parameter sqlfilters -> {expression}")
+            index += 1
+            return inner
+        raise ValueError(f"Error when validating parameter sqlfilters -> {expression}")
+
+    predicate = parse_or()
+    if index != len(tokens):
+        raise ValueError(f"Error when validating parameter sqlfilters -> {expression}")
+    return predicate
+
+
+def _error(status: int, message: str, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    return _json({"error": {"code": status, "message": message}}, status=status, headers=headers)
+
+
+def _json(payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    return web.Response(text=codec.dumps(payload), status=status, headers=headers, content_type="application/json")
+
+
+class FakeDolibarr:
+    """In-memory Dolibarr REST API seeded with synthetic records.
+
+    ``latency`` seconds (plus up to ``latency_jitter`` and ``latency_per_record``
+    for each returned record) are added to every response; ``entity_latency``
+    overrides the base latency per entity. A share ``error_rate`` of requests
+    fails with a status drawn from ``error_statuses``.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        thirdparties: int = 100,
+        products: int = 1000,
+        invoices: int = 1000,
+        lines_per_invoice: int = 5,
+        orders: int = 100,
+        contacts: int = 100,
+        projects: int = 20,
+        users: int = 5,
+        api_key: Optional[str] = None,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        latency_per_record: float = 0.0,
+        entity_latency: Optional[Dict[str, float]] = None,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = (503,),
+    ):
+        self.seed = seed
+        self.lines_per_invoice = lines_per_invoice
+        self.api_key = api_key
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.latency_per_record = latency_per_record
+        self.entity_latency = dict(entity_latency or {})
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses) or (503,)
+        self.requests = 0
+        self.injected_errors = 0
+        self._rng = random.Random(seed)
+        self.records: Dict[str, Dict[int, Dict[str, Any]]] = {entity: {} for entity in ENTITIES}
+        self._next_id: Dict[str, int] = {entity: 1 for entity in ENTITIES}
+        # Invoices whose lines were written to and are no longer derived from the ID.
+        self._lines: Dict[int, List[Dict[str, Any]]] = {}
+        self._next_line_id = 10 ** 9
+        self._versions: Dict[str, int] = {entity: 0 for entity in ENTITIES}
+        self._queries: "OrderedDict[Tuple[Any, ...], List[int]]" = OrderedDict()
+        self._runner: Optional[web.AppRunner] = None
+        self.seed_data(
+            thirdparties=thirdparties,
+            products=products,
+            invoices=invoices,
+            orders=orders,
+            contacts=contacts,
+            projects=projects,
+            users=users,
+        )
+
+    # Synthetic data -----------------------------------------------------------
+
+    def seed_data(self, **counts: int) -> None:
+        """Append ``counts[entity]`` generated records to each entity."""
+        rng = random.Random(self.seed)
+        builders = {
+            "users": self._user,
+            "thirdparties": self._thirdparty,
+            "products": self._product,
+            "projects": self._project,
+            "contacts": self._contact,
+            "orders": self._order,
+            "invoices": self._invoice,
+        }
+        for entity, build in builders.items():
+            store = self.records[entity]
+            for _ in range(counts.get(entity, 0)):
+                record_id = self._allocate(entity)
+                store[record_id] = build(record_id, rng)
+            self._versions[entity] += 1
+
+    def _allocate(self, entity: str) -> int:
+        record_id = self._next_id[entity]
+        self._next_id[entity] = record_id + 1
+        return record_id
+
+    def _count(self, entity: str) -> int:
+        return max(1, len(self.records[entity]))
+
+    @staticmethod
+    def _stamp(rng: random.Random) -> int:
+        return EPOCH + rng.randrange(YEAR_SECONDS)
+
+    def _user(self, record_id: int, rng: random.Random) -> Dict[str, Any]:
+        return {
+            "id": str(record_id),
+            "login": f"user{record_id}",
+            "firstname": f"First{record_id}",
+            "lastname": f"Last{record_id}",
+            "email": f"user{record_id}@example.test",
+            "admin": "1" if record_id == 1 else "0",
+            "statut": "1",
+            "date_modification": self._stamp(rng),
+        }
+
+    def _thirdparty(self, record_id: int, rng: random.Random) -> Dict[str, Any]:
+        modified = self._stamp(rng)
+        return {
+            "id": str(record_id),
+            "name": f"Customer {record_id:06d}",
+            "name_alias": f"C{record_id}",
+            "email": f"contact{record_id}@customer{record_id % 997}.test",
+            "phone": f"+33 1 {record_id % 100:02d} {record_id % 10000:04d}",
+            "town": ("Paris", "Lyon", "Berlin", "Brussels", "Boston")[record_id % 5],
+            "zip": f"{10000 + record_id % 89999}",
+            "country_id": ("1", "1", "5", "2", "11")[record_id % 5],
+            "client": "1",
+            "fournisseur": "0",
+            "code_client": f"CU{record_id:06d}",
+            "tva_intra": f"FR{record_id:011d}",
+            "status": "1",
+            "date_creation": modified - 86400,
+            "date_modification": modified,
+        }
+
+    def _product(self, record_id: int, rng: random.Random) -> Dict[str, Any]:
+        price = round(rng.uniform(1, 500), 2)
+        return {
+            "id": str(record_id),
+            "ref": f"PRD-{record_id:06d}",
+            "label": f"Product {record_id} {('Chair', 'Desk', 'Lamp', 'Service', 'Cable')[record_id % 5]}",
+            "description": "Synthetic product",
+            "type": "1" if record_id % 5 == 3 else "0",
+            "price": f"{price:.8f}",
+            "price_ttc": f"{price * 1.2:.8f}",
+            "tva_tx": "20.000",
+            "stock_reel": str(rng.randrange(1000)),
+            "status": "1",
+            "status_buy": "1",
+            "barcode": f"{4000000000000 + record_id}",
+            "date_modification": self._stamp(rng),
+        }
+
+    def _project(self, record_id: int, rng: random.Random) -> Dict[str, Any]:
+        return {
+            "id": str(record_id),
+            "ref": f"PJ{record_id:05d}",
+            "title": f"Project {record_id}",
+            "socid": str(1 + record_id % self._count("thirdparties")),
+            "status": "1",
+            "date_start": EPOCH,
+            "date_modification": self._stamp(rng),
+        }
+
+    def _contact(self, record_id: int, rng: random.Random) -> Dict[str, Any]:
+        return {
+            "id": str(record_id),
+            "socid": str(1 + record_id % self._count("thirdparties")),
+            "firstname": f"Jane{record_id}",
+            "lastname": f"Doe{record_id}",
+            "email": f"jane{record_id}@example.test",
+            "phone_pro": f"+33 6 {record_id % 10000:04d}",
+            "statut": "1",
+            "date_modification": self._stamp(rng),
+        }
+
+    def _order(self, record_id: int, rng: random.Random) -> Dict[str, Any]:
+        total = round(rng.uniform(10, 5000), 2)
+        issued = self._stamp(rng)
+        return {
+            "id": str(record_id),
+            "ref": f"CO{record_id:06d}",
+            "socid": str(1 + record_id % self._count("thirdparties")),
+            "status": str(rng.choice((0, 1, 1, 3))),
+            "date": issued,
+            "total_ht": f"{total:.8f}",
+            "total_tva": f"{total * 0.2:.8f}",
+            "total_ttc": f"{total * 1.2:.8f}",
+            "date_modification": issued + 3600,
+            "lines": [],
+        }
+
+    def _invoice(self, record_id: int, rng: random.Random) -> Dict[str, Any]:
+        issued = self._stamp(rng)
+        status = rng.choice((0, 1, 1, 1, 2, 2, 2, 3))
+        total_ht = sum(qty * subprice for _, qty, subprice in self._line_values(record_id))
+        total_ttc = round(total_ht * 1.2, 2)
+        return {
+            "id": str(record_id),
+            "ref": f"(PROV{record_id})" if status == 0 else f"FA{record_id:07d}",
+            "socid": str(1 + rng.randrange(self._count("thirdparties"))),
+            "type": "0",
+            "status": str(status),
+            "paye": "1" if status == 2 else "0",
+            "date": issued,
+            "date_lim_reglement": issued + 30 * 86400,
+            "fk_project": str(1 + record_id % self._count("projects")) if record_id % 4 == 0 else None,
+            "total_ht": f"{total_ht:.8f}",
+            "total_tva": f"{total_ttc - total_ht:.8f}",
+            "total_ttc": f"{total_ttc:.8f}",
+            "remaintopay": "0" if status in (2, 3) else f"{total_ttc:.8f}",
+            "date_modification": issued + 3600,
+        }
+
+    def _line_values(self, invoice_id: int) -> Iterable[Tuple[int, int, float]]:
+        """Yield ``(product_id, qty, subprice)`` of the generated lines of an invoice."""
+        products = self._count("products")
+        for rank in range(self.lines_per_invoice):
+            product_id = 1 + (invoice_id * 7 + rank * 13) % products
+            yield product_id, 1 + (invoice_id + rank) % 5, 5.0 + product_id % 200
+
+    def _generated_lines(self, invoice_id: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": str(invoice_id * 1000 + rank),
+                "fk_product": str(product_id),
+                "product_ref": f"PRD-{product_id:06d}",
+                "desc": f"Line {rank + 1}",
+                "qty": str(qty),
+                "subprice": f"{subprice:.8f}",
+                "tva_tx": "20.000",
+                "total_ht": f"{qty * subprice:.8f}",
+                "rang": str(rank + 1),
+            }
+            for rank, (product_id, qty, subprice) in enumerate(self._line_values(invoice_id))
+        ]
+
+    def invoice_lines(self, invoice_id: int) -> List[Dict[str, Any]]:
+        """Return the lines of an invoice, generated unless they were modified."""
+        lines = self._lines.get(invoice_id)
+        return lines if lines is not None else self._generated_lines(invoice_id)
+
+    @property
+    def line_count(self) -> int:
+        """Number of invoice lines currently served."""
+        materialized = sum(len(lines) for lines in self._lines.values())
+        return materialized + (len(self.records["invoices"]) - len(self._lines)) * self.lines_per_invoice
+
+    # Serving ------------------------------------------------------------------
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application serving the API under ``/api/index.php``."""
+        app = web.Application(middlewares=[self._middleware])
+        base = "/api/index.php"
+        app.router.add_get(f"{base}/status", self._status)
+        # DolibarrClient requests the status without the index.php segment.
+        app.router.add_get("/api/status", self._status)
+        app.router.add_get(f"{base}/setup/dictionary/{{name}}", self._dictionary)
+        app.router.add_get(f"{base}/invoices/{{id:\\d+}}/lines", self._get_lines)
+        app.router.add_post(f"{base}/invoices/{{id:\\d+}}/lines", self._add_line)
+        app.router.add_put(f"{base}/invoices/{{id:\\d+}}/lines/{{line_id:\\d+}}", self._update_line)
+        app.router.add_delete(f"{base}/invoices/{{id:\\d+}}/lines/{{line_id:\\d+}}", self._delete_line)
+        app.router.add_post(f"{base}/invoices/{{id:\\d+}}/validate", self._validate_invoice)
+        entities = "|".join(ENTITIES)
+        app.router.add_get(f"{base}/{{entity:{entities}}}", self._list)
+        app.router.add_post(f"{base}/{{entity:{entities}}}", self._create)
+        app.router.add_get(f"{base}/{{entity:{entities}}}/{{id:\\d+}}", self._get)
+        app.router.add_put(f"{base}/{{entity:{entities}}}/{{id:\\d+}}", self._update)
+        app.router.add_delete(f"{base}/{{entity:{entities}}}/{{id:\\d+}}", self._delete)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve the API in the running event loop and return its base URL."""
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}/api/index.php"
+
+    async def close(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Callable) -> web.StreamResponse:
+        self.requests += 1
+        if self.api_key is not None and request.headers.get("DOLAPIKEY") != self.api_key:
+            return _error(401, "Unauthorized: Access denied")
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.injected_errors += 1
+            status = self._rng.choice(self.error_statuses)
+            headers = {"Retry-After": "1"} if status == 429 else None
+            await self._sleep(request, 0)
+            return _error(status, "Injected failure", headers)
+        response = await handler(request)
+        await self._sleep(request, request.get(RECORD_COUNT, 1))
+        return response
+
+    async def _sleep(self, request: web.Request, records: int) -> None:
+        parts = request.path.split("/")
+        entity = request.match_info.get("entity") or (parts[3] if len(parts) > 3 else parts[-1])
+        delay = self.entity_latency.get(entity, self.latency) + self.latency_per_record * records
+        if self.latency_jitter:
+            delay += self._rng.uniform(0, self.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _status(self, request: web.Request) -> web.Response:
+        return _json({"success": {"code": 200, "dolibarr_version": "18.0.0", "access_locked": "0"}})
+
+    async def _dictionary(self, request: web.Request) -> web.Response:
+        entries = DICTIONARIES.get(request.match_info["name"])
+        if entries is None:
+            return _error(404, "Dictionary not found")
+        return self._page(request, entries, "dictionary")
+
+    # Collections --------------------------------------------------------------
+
+    def _record(self, request: web.Request) -> Tuple[str, int, Optional[Dict[str, Any]]]:
+        entity = request.match_info.get("entity", "invoices")
+        record_id = int(request.match_info["id"])
+        return entity, record_id, self.records[entity].get(record_id)
+
+    def _render(self, entity: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        if entity == "invoices":
+            return {**record, "lines": self.invoice_lines(int(record["id"]))}
+        return record
+
+    def _query(self, entity: str, sqlfilters: Optional[str], sortfield: str, descending: bool) -> Sequence[int]:
+        store = self.records[entity]
+        column = sortfield.split(".", 1)[-1].lower()
+        field = COLUMN_FIELDS.get(column, column)
+        key = (entity, self._versions[entity], sqlfilters, field, descending)
+        ids = self._queries.get(key)
+        if ids is None:
+            records: Iterable[Dict[str, Any]] = store.values()
+            if sqlfilters:
+                predicate = parse_sqlfilters(sqlfilters)
+                records = (record for record in records if predicate(record))
+            selected = list(records)
+            if field != "id":
+                selected.sort(key=lambda record: _sort_key(record.get(field)), reverse=descending)
+            elif descending:
+                selected.reverse()
+            ids = [int(record["id"]) for record in selected]
+            self._queries[key] = ids
+            while len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        else:
+            self._queries.move_to_end(key)
+        return ids
+
+    def _page(self, request: web.Request, records: Sequence[Any], label: str) -> web.Response:
+        query = request.query
+        try:
+            limit = int(query.get("limit", 100))
+            page = int(query.get("page", 0))
+        except ValueError:
+            return _error(400, "Bad value for limit or page")
+        total = len(records)
+        start = page * limit if limit > 0 else 0
+        stop = start + limit if limit > 0 else total
+        chunk = list(records[start:stop]) if start < total else []
+        if not chunk:
+            return _error(404, f"No {label} found")
+        if query.get("pagination_data") == "true":
+            payload: Any = {
+                "data": chunk,
+                "pagination": {
+                    "total": total,
+                    "page": page,
+                    "page_count": math.ceil(total / limit) if limit > 0 else 1,
+                    "limit": limit,
+                },
+            }
+        else:
+            payload = chunk
+        request[RECORD_COUNT] = len(chunk)
+        return _json(payload)
+
+    async def _list(self, request: web.Request) -> web.Response:
+        entity = request.match_info["entity"]
+        query = request.query
+        try:
+            ids = self._query(
+                entity,
+                query.get("sqlfilters"),
+                query.get("sortfield", "t.rowid"),
+                query.get("sortorder", "ASC").upper() == "DESC",
+            )
+        except ValueError as exc:
+            return _error(400, str(exc))
+        store = self.records[entity]
+        return self._page(request, _LazyRecords(ids, store, lambda record: self._render(entity, record)), entity)
+
+    async def _get(self, request: web.Request) -> web.Response:
+        entity, _, record = self._record(request)
+        if record is None:
+            return _error(404, f"{entity[:-1].capitalize()} not found")
+        return _json(self._render(entity, record))
+
+    async def _create(self, request: web.Request) -> web.Response:
+        entity = request.match_info["entity"]
+        payload = await _read_json(request)
+        if not isinstance(payload, dict):
+            return _error(400, "Request body must be a JSON object")
+        required = {"thirdparties": "name", "products": "ref", "invoices": "socid", "orders": "socid", "users": "login"}
+        field = required.get(entity)
+        if field and payload.get(field) in (None, ""):
+            return _error(400, f"{field} field missing")
+        record_id = self._allocate(entity)
+        now = int(time.time())
+        lines = payload.pop("lines", None)
+        record = {
+            **payload,
+            "id": str(record_id),
+            "date_creation": now,
+            "date_modification": now,
+        }
+        if entity in ("invoices", "orders"):
+            record.setdefault("status", "0")
+            record.setdefault("ref", f"(PROV{record_id})")
+            record.setdefault("date", now)
+        if entity == "invoices":
+            self._lines[record_id] = []
+            for line in lines or []:
+                self._append_line(record_id, dict(line))
+            self.records[entity][record_id] = record
+            self._retotal(record_id)
+        else:
+            if entity == "orders":
+                record["lines"] = lines or []
+            self.records[entity][record_id] = record
+        self._versions[entity] += 1
+        return _json(record_id)
+
+    async def _update(self, request: web.Request) -> web.Response:
+        entity, _, record = self._record(request)
+        if record is None:
+            return _error(404, f"{entity[:-1].capitalize()} not found")
+        payload = await _read_json(request)
+        if not isinstance(payload, dict):
+            return _error(400, "Request body must be a JSON object")
+        payload.pop("id", None)
+        payload.pop("lines", None)
+        record.update(payload)
+        record["date_modification"] = int(time.time())
+        self._versions[entity] += 1
+        return _json(self._render(entity, record))
+
+    async def _delete(self, request: web.Request) -> web.Response:
+        entity, record_id, record = self._record(request)
+        if record is None:
+            return _error(404, f"{entity[:-1].capitalize()} not found")
+        del self.records[entity][record_id]
+        self._lines.pop(record_id, None)
+        self._versions[entity] += 1
+        return _json({"success": {"code": 200, "message": "Object deleted"}})
+
+    # Invoice lines ------------------------------------------------------------
+
+    def _materialize(self, invoice_id: int) -> List[Dict[str, Any]]:
+        lines = self._lines.get(invoice_id)
+        if lines is None:
+            lines = self._lines[invoice_id] = self._generated_lines(invoice_id)
+        return lines
+
+    def _append_line(self, invoice_id: int, line: Dict[str, Any]) -> Dict[str, Any]:
+        lines = self._materialize(invoice_id)
+        line["id"] = str(self._next_line_id)
+        self._next_line_id += 1
+        line.setdefault("rang", str(len(lines) + 1))
+        line["total_ht"] = f"{float(line.get('qty') or 0) * float(line.get('subprice') or 0):.8f}"
+        lines.append(line)
+        return line
+
+    def _retotal(self, invoice_id: int) -> None:
+        invoice = self.records["invoices"][invoice_id]
+        total_ht = sum(float(line.get("total_ht") or 0) for line in self.invoice_lines(invoice_id))
+        total_ttc = round(total_ht * 1.2, 2)
+        invoice.update(
+            {
+                "total_ht": f"{total_ht:.8f}",
+                "total_tva": f"{total_ttc - total_ht:.8f}",
+                "total_ttc": f"{total_ttc:.8f}",
+                "remaintopay": f"{total_ttc:.8f}",
+                "date_modification": int(time.time()),
+            }
+        )
+        self._versions["invoices"] += 1
+
+    def _draft(self, request: web.Request) -> Tuple[int, Optional[Dict[str, Any]], Optional[web.Response]]:
+        _, invoice_id, invoice = self._record(request)
+        if invoice is None:
+            return invoice_id, None, _error(404, "Invoice not found")
+        if request.method != "GET" and str(invoice.get("status")) != "0":
+            return invoice_id, invoice, _error(403, "Invoice is not a draft")
+        return invoice_id, invoice, None
+
+    async def _get_lines(self, request: web.Request) -> web.Response:
+        invoice_id, _, error = self._draft(request)
+        return error or _json(self.invoice_lines(invoice_id))
+
+    async def _add_line(self, request: web.Request) -> web.Response:
+        invoice_id, _, error = self._draft(request)
+        if error:
+            return error
+        payload = await _read_json(request)
+        if not isinstance(payload, dict):
+            return _error(400, "Request body must be a JSON object")
+        line = self._append_line(invoice_id, payload)
+        self._retotal(invoice_id)
+        return _json(int(line["id"]))
+
+    async def _update_line(self, request: web.Request) -> web.Response:
+        invoice_id, _, error = self._draft(request)
+        if error:
+            return error
+        line = self._find_line(invoice_id, request.match_info["line_id"])
+        if line is None:
+            return _error(404, "Line not found")
+        payload = await _read_json(request)
+        line.update({key: value for key, value in (payload or {}).items() if key != "id"})
+        line["total_ht"] = f"{float(line.get('qty') or 0) * float(line.get('subprice') or 0):.8f}"
+        self._retotal(invoice_id)
+        return _json(line)
+
+    async def _delete_line(self, request: web.Request) -> web.Response:
+        invoice_id, _, error = self._draft(request)
+        if error:
+            return error
+        line = self._find_line(invoice_id, request.match_info["line_id"])
+        if line is None:
+            return _error(404, "Line not found")
+        self._lines[invoice_id].remove(line)
+        self._retotal(invoice_id)
+        return _json({"success": {"code": 200, "message": "Line deleted"}})
+
+    def _find_line(self, invoice_id: int, line_id: str) -> Optional[Dict[str, Any]]:
+        return next((line for line in self._materialize(invoice_id) if line["id"] == line_id), None)
+
+    async def _validate_invoice(self, request: web.Request) -> web.Response:
+        invoice_id, invoice, error = self._draft(request)
+        if error or invoice is None:
+            return error or _error(404, "Invoice not found")
+        invoice["status"] = "1"
+        invoice["ref"] = f"FA{invoice_id:07d}"
+        invoice["date_modification"] = int(time.time())
+        self._versions["invoices"] += 1
+        return _json(self._render("invoices", invoice))
+
+
+class _LazyRecords:
+    """Sequence view rendering records of an ID list only when sliced."""
+
+    def __init__(self, ids: Sequence[int], store: Dict[int, Dict[str, Any]], render: Callable[[Dict[str, Any]], Any]):
+        self._ids = ids
+        self._store = store
+        self._render = render
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, window: slice) -> List[Any]:
+        records = (self._store.get(record_id) for record_id in self._ids[window])
+        return [self._render(record) for record in records if record is not None]
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    try:
+        return 0, float(value)
+    except (TypeError, ValueError):
+        return 1, "" if value is None else str(value).casefold()
+
+
+async def _read_json(request: web.Request) -> Any:
+    body = await request.read()
+    if not body:
+        return {}
+    try:
+        return codec.loads(body)
+    except ValueError:
+        return None
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8090, **options: Any) -> None:
+    """Seed a ``FakeDolibarr`` with ``options`` and serve it until cancelled."""
+    started = time.perf_counter()
+    fake = FakeDolibarr(**options)
+    url = await fake.start(host, port)
+    counts = ", ".join(f"{len(records)} {entity}" for entity, records in fake.records.items())
+    print(f"Fake Dolibarr API at {url} ({counts}, {fake.line_count} invoice lines, "
+          f"seeded in {time.perf_counter() - started:.1f}s)", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await fake.close()
@@ -0,0 +1,163 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Recording a sample is a dictionary lookup and, for histograms, a bisection
+over a short bucket list, so instrumentation stays on in production. The
+metrics live in one process-wide registry; gauges describing client state
+(cache, circuit breakers, connection pool) are read from it at scrape time.
+"""
+
+import bisect
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+# Latency buckets (seconds) shared by the tool and Dolibarr request histograms.
+DEFAULT_BUCKETS: Sequence[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1.0) -> None:
+        key = tuple(str(label) for label in labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def value(self, *labels: Any) -> float:
+        return self.values.get(tuple(str(label) for label in labels), 0.0)
+
+    def samples(self) -> Iterable[Tuple[str, Labels, Sequence[str], float]]:
+        for labels, value in sorted(self.values.items()):
+            yield self.name, labels, self.label_names, value
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: Any, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: Any) -> None:
+        self.values[tuple(str(label) for label in labels)] = value
+
+
+class Histogram:
+    """Cumulative histogram of observations per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum.
+        self.values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: Any) -> None:
+        key = tuple(str(label) for label in labels)
+        series = self.values.get(key)
+        if series is None:
+            series = self.values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def count(self, *labels: Any) -> int:
+        series = self.values.get(tuple(str(label) for label in labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterable[Tuple[str, Labels, Sequence[str], float]]:
+        names = self.label_names + ("le",)
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + (_format_value(bound),), names, cumulative
+            yield f"{self.name}_sum", labels, self.label_names, total[0]
+            yield f"{self.name}_count", labels, self.label_names, cumulative
+
+
+class MetricsRegistry:
+    """The metrics recorded by the server and the Dolibarr client."""
+
+    def __init__(self) -> None:
+        self.tool_calls = Counter("dolibarr_mcp_tool_calls_total", "Tool calls by tool and outcome.", ("tool", "outcome"))
+        self.tool_duration = Histogram(
+            "dolibarr_mcp_tool_call_duration_seconds", "Tool call latency by tool.", ("tool",)
+        )
+        self.tool_calls_in_flight = Gauge("dolibarr_mcp_tool_calls_in_flight", "Tool calls currently running.")
+        self.requests = Counter(
+            "dolibarr_mcp_dolibarr_requests_total",
+            "HTTP requests sent to Dolibarr by endpoint family, method and status (or error type).",
+            ("family", "method", "status"),
+        )
+        self.request_duration = Histogram(
+            "dolibarr_mcp_dolibarr_request_duration_seconds",
+            "Latency of HTTP requests to Dolibarr by endpoint family and method.",
+            ("family", "method"),
+        )
+        self.tool_calls_in_flight.set(0)
+
+    def metrics(self) -> List[Any]:
+        return [self.tool_calls, self.tool_duration, self.tool_calls_in_flight, self.requests, self.request_duration]
+
+    def render(self, extra: Optional[Dict[str, Tuple[str, str, Dict[Labels, float], Sequence[str]]]] = None) -> str:
+        """Render every metric, plus scrape-time ``extra`` metrics, in the Prometheus text format.
+
+        ``extra`` maps a metric name to ``(type, help, {labels: value}, label names)``.
+        """
+        lines: List[str] = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, label_names, value in metric.samples():
+                lines.append(f"{name}{_format_labels(label_names, labels)} {_format_value(value)}")
+        for name, (kind, help_text, values, label_names) in sorted((extra or {}).items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(values.items()):
+                lines.append(f"{name}{_format_labels(label_names, labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+_metrics: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry, creating it on first use."""
+    global _metrics
+    if _metrics is None:
+        _metrics = MetricsRegistry()
+    return _metrics
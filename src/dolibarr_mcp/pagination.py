@@ -0,0 +1,124 @@
+"""Helpers for walking Dolibarr list endpoints page by page."""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+Page = List[Dict[str, Any]]
+PageFetcher = Callable[[int], Awaitable[Page]]
+
+
+async def iter_pages(
+    fetch_page: PageFetcher,
+    page_size: int,
+    read_ahead: int = 0,
+    start_page: int = 0,
+    max_pages: Optional[int] = None,
+) -> AsyncIterator[Page]:
+    """Yield pages in order until a short page marks the end of the data.
+
+    Up to ``read_ahead`` following pages are fetched concurrently while the
+    current page is consumed, so at most ``read_ahead + 1`` pages are held in
+    memory regardless of the dataset size.
+    """
+    read_ahead = max(0, read_ahead)
+    end_page = None if max_pages is None else start_page + max_pages
+    pending: Deque["asyncio.Future[Page]"] = deque()
+    next_page = start_page
+
+    try:
+        while True:
+            while len(pending) <= read_ahead and (end_page is None or next_page < end_page):
+                pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                next_page += 1
+            if not pending:
+                return
+
+            page = await pending.popleft()
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def iter_records(
+    fetch_page: PageFetcher,
+    page_size: int,
+    read_ahead: int = 0,
+    start_page: int = 0,
+    max_pages: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the individual records of :func:`iter_pages`."""
+    async for page in iter_pages(fetch_page, page_size, read_ahead, start_page, max_pages):
+        for record in page:
+            yield record
+
+
+async def iter_pages_concurrently(
+    fetch_page: PageFetcher,
+    page_size: int,
+    max_concurrency: int = 4,
+    start_page: int = 0,
+    page_count: Optional[int] = None,
+) -> AsyncIterator[Tuple[int, Page]]:
+    """Yield ``(page_number, page)`` pairs as soon as each page arrives.
+
+    ``max_concurrency`` workers claim page numbers from a shared counter. The
+    first short page (or ``page_count`` when it is known up front) marks the
+    end of the data; workers stop claiming pages past it and any page fetched
+    beyond it is discarded. At most ``max_concurrency`` completed pages wait in
+    the hand-off queue, so a slow consumer applies back-pressure to the fetch.
+    """
+    max_concurrency = max(1, max_concurrency)
+    queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max_concurrency)
+    done = object()
+    state: Dict[str, Any] = {
+        "next": start_page,
+        "stop": None if page_count is None else start_page + page_count,
+        "error": None,
+    }
+
+    async def worker() -> None:
+        while state["stop"] is None or state["next"] < state["stop"]:
+            page_number = state["next"]
+            state["next"] += 1
+            try:
+                page = await fetch_page(page_number)
+            except Exception as exc:  # pylint: disable=broad-except
+                if state["error"] is None:
+                    state["error"] = exc
+                for task in workers:
+                    if task is not asyncio.current_task():
+                        task.cancel()
+                return
+            if len(page) < page_size and (state["stop"] is None or page_number + 1 < state["stop"]):
+                state["stop"] = page_number + 1
+            await queue.put((page_number, page))
+
+    async def supervise() -> None:
+        await asyncio.gather(*workers, return_exceptions=True)
+        await queue.put(done)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max_concurrency)]
+    supervisor = asyncio.ensure_future(supervise())
+    try:
+        while True:
+            item = await queue.get()
+            if state["error"] is not None:
+                raise state["error"]
+            if item is done:
+                return
+            page_number, page = item
+            if state["stop"] is not None and page_number >= state["stop"]:
+                continue
+            if page:
+                yield page_number, page
+    finally:
+        for task in (*workers, supervisor):
+            task.cancel()
+        await asyncio.gather(*workers, supervisor, return_exceptions=True)
@@ -0,0 +1,65 @@
+"""Shrink tool results before they are serialized for the MCP client."""
+
+from typing import Any, Dict, Iterable, Optional
+
+# Selected keys mapped to the selection inside them, or None for the whole value.
+FieldTree = Dict[str, Optional["FieldTree"]]
+
+
+def _field_tree(fields: Iterable[str]) -> FieldTree:
+    """Turn dotted field paths such as ``lines.ref`` into a nested lookup tree."""
+    tree: FieldTree = {}
+    for field in fields:
+        node = tree
+        parts = [part for part in str(field).split(".") if part]
+        for index, part in enumerate(parts):
+            if index == len(parts) - 1:
+                node[part] = None
+            elif part in node and node[part] is None:
+                break  # the whole parent is already selected
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def _apply(value: Any, tree: FieldTree) -> Any:
+    if isinstance(value, list):
+        return [_apply(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    projected = {}
+    for key, subtree in tree.items():
+        if key in value:
+            projected[key] = value[key] if subtree is None else _apply(value[key], subtree)
+    return projected
+
+
+def project(value: Any, fields: Iterable[str]) -> Any:
+    """Keep only ``fields`` of an object or of every object in a list.
+
+    Dotted paths select nested keys, e.g. ``["ref", "lines.product_ref"]``.
+    Values that are neither objects nor lists are returned unchanged.
+    """
+    tree = _field_tree(fields)
+    if not tree:
+        return value
+    return _apply(value, tree)
+
+
+def prune(value: Any) -> Any:
+    """Recursively drop keys whose value is null, an empty string, list or object.
+
+    ``0``, ``"0"`` and ``False`` are kept. List items are never dropped so
+    positions stay meaningful.
+    """
+    if isinstance(value, dict):
+        pruned = {}
+        for key, item in value.items():
+            item = prune(item)
+            if item is None or (isinstance(item, (str, list, dict)) and not item):
+                continue
+            pruned[key] = item
+        return pruned
+    if isinstance(value, list):
+        return [prune(item) for item in value]
+    return value
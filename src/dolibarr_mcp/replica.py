@@ -0,0 +1,124 @@
+"""Persistent SQLite replica of mirrored Dolibarr records.
+
+:class:`SQLiteStore` is a drop-in store for :class:`~dolibarr_mcp.sync.SyncEngine`
+that keeps records and per-entity watermarks in a SQLite database in WAL mode.
+Because the watermarks survive restarts, a restarted server resumes with
+incremental polls instead of full scans and can answer reads from disk
+immediately.
+"""
+
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from . import codec
+from .sync import modified_at, record_id
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    entity TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    modified INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (entity, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sync_state (
+    entity TEXT PRIMARY KEY,
+    watermark INTEGER,
+    synced_at REAL
+);
+"""
+
+
+class SQLiteStore:
+    """SQLite-backed store of mirrored records, watermarks and sync times.
+
+    Statements are short and run on the calling thread; WAL mode lets other
+    processes (or a backup) read the replica while it is being written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def upsert(self, entity: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace ``records`` in one transaction; return how many were applied."""
+        rows = [
+            (entity, identifier, modified_at(record), codec.dumps(record))
+            for record in records
+            if (identifier := record_id(record)) is not None
+        ]
+        if rows:
+            with self._lock, self._db:
+                self._db.executemany("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def remove(self, entity: str, identifier: int) -> bool:
+        """Delete one record; return whether it existed."""
+        with self._lock, self._db:
+            cursor = self._db.execute("DELETE FROM records WHERE entity = ? AND id = ?", (entity, identifier))
+        return cursor.rowcount > 0
+
+    def ids(self, entity: str) -> Set[int]:
+        """Return the ids of the mirrored records of ``entity``."""
+        with self._lock:
+            rows = self._db.execute("SELECT id FROM records WHERE entity = ?", (entity,)).fetchall()
+        return {row[0] for row in rows}
+
+    def get(self, entity: str, identifier: int) -> Optional[Dict[str, Any]]:
+        """Return one mirrored record."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM records WHERE entity = ? AND id = ?", (entity, identifier)
+            ).fetchone()
+        return None if row is None else codec.loads(row[0])
+
+    def all(self, entity: str) -> List[Dict[str, Any]]:
+        """Return every mirrored record of ``entity`` ordered by id."""
+        with self._lock:
+            rows = self._db.execute("SELECT data FROM records WHERE entity = ? ORDER BY id", (entity,)).fetchall()
+        return [codec.loads(row[0]) for row in rows]
+
+    def count(self, entity: str) -> int:
+        """Return the number of mirrored records of ``entity``."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM records WHERE entity = ?", (entity,)).fetchone()[0]
+
+    def get_watermark(self, entity: str) -> Optional[int]:
+        """Return the newest modification time applied for ``entity``."""
+        return self._state(entity)[0]
+
+    def synced_at(self, entity: str) -> Optional[float]:
+        """Return the time ``entity`` was last synced successfully."""
+        return self._state(entity)[1]
+
+    def set_watermark(self, entity: str, watermark: Optional[int], synced_at: Optional[float] = None) -> None:
+        """Persist the watermark of ``entity`` and the time of the sync that reached it."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (entity, watermark, synced_at),
+            )
+
+    def clear(self, entity: str) -> None:
+        """Drop every record and the watermark of ``entity``."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM records WHERE entity = ?", (entity,))
+            self._db.execute("DELETE FROM sync_state WHERE entity = ?", (entity,))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def _state(self, entity: str) -> Tuple[Optional[int], Optional[float]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT watermark, synced_at FROM sync_state WHERE entity = ?", (entity,)
+            ).fetchone()
+        return row if row is not None else (None, None)
+
@@ -0,0 +1,248 @@
+"""Aggregate reports over Dolibarr invoices, computed in one streaming pass.
+
+Each report is an accumulator fed one invoice at a time while the invoice
+list is paged through, so memory is bounded by one page plus the number of
+groups, and only the small result table is returned to the agent.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Days past due at which each receivables aging bucket starts.
+AGING_BUCKETS: Tuple[Tuple[str, int], ...] = (("1-30", 1), ("31-60", 31), ("61-90", 61), ("90+", 91))
+
+# Dolibarr invoice status of abandoned invoices, which never count as revenue or receivable.
+STATUS_ABANDONED = 3
+
+
+def _amount(value: Any) -> float:
+    """Parse a Dolibarr amount ("120.00000000", 120, None)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _money(value: float) -> float:
+    return round(value, 2) + 0.0
+
+
+def invoice_day(timestamp: Any) -> Optional[date]:
+    """Return the calendar day of a Dolibarr date timestamp.
+
+    Dolibarr stores dates as midnight in the server's time zone. Shifting by
+    twelve hours before taking the UTC date yields the intended day for every
+    zone between UTC-12 and UTC+12.
+    """
+    try:
+        seconds = int(timestamp)
+    except (TypeError, ValueError):
+        return None
+    return (datetime.fromtimestamp(seconds, timezone.utc) + timedelta(hours=12)).date()
+
+
+def parse_day(value: Optional[str]) -> Optional[date]:
+    """Parse a ``YYYY-MM-DD`` argument."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError as exc:
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD") from exc
+
+
+def outstanding(invoice: Dict[str, Any]) -> float:
+    """Return the amount still to be paid on an invoice."""
+    if invoice.get("remaintopay") not in (None, ""):
+        return _amount(invoice["remaintopay"])
+    paid = sum(_amount(invoice.get(field)) for field in ("sumpayed", "sumcreditnote", "sumdeposit"))
+    return _amount(invoice.get("total_ttc")) - paid
+
+
+def _counts_as_issued(invoice: Dict[str, Any]) -> bool:
+    try:
+        status = int(invoice.get("status", invoice.get("statut")))
+    except (TypeError, ValueError):
+        return True
+    return 0 < status != STATUS_ABANDONED
+
+
+def _top(rows: Iterable[Dict[str, Any]], key: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+    ordered = sorted(rows, key=lambda row: (-row[key], str(row.get("customer_id") or row.get("key"))))
+    return ordered if not limit else ordered[:limit]
+
+
+class ReceivablesAging:
+    """Outstanding amounts per aging bucket, optionally broken down by customer."""
+
+    def __init__(self, as_of: Optional[date] = None, by_customer: bool = False, limit: Optional[int] = 20):
+        self.as_of = as_of or date.today()
+        self.by_customer = by_customer
+        self.limit = limit
+        self.invoices = 0
+        self.totals = self._empty()
+        self.customers: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def bucket(days_overdue: Optional[int]) -> str:
+        """Return the bucket of an invoice that is ``days_overdue`` days past due."""
+        if days_overdue is None or days_overdue <= 0:
+            return "current"
+        name = "current"
+        for bucket, start in AGING_BUCKETS:
+            if days_overdue >= start:
+                name = bucket
+        return name
+
+    @staticmethod
+    def _empty() -> Dict[str, float]:
+        return dict.fromkeys(["current", *(name for name, _ in AGING_BUCKETS), "total"], 0.0)
+
+    def add(self, invoice: Dict[str, Any]) -> None:
+        if not _counts_as_issued(invoice):
+            return
+        amount = outstanding(invoice)
+        if abs(amount) < 0.005:
+            return
+        due = invoice_day(invoice.get("date_lim_reglement")) or invoice_day(invoice.get("date"))
+        bucket = self.bucket(None if due is None else (self.as_of - due).days)
+        self.invoices += 1
+        self.totals[bucket] += amount
+        self.totals["total"] += amount
+        if self.by_customer:
+            customer = self.customers.setdefault(
+                str(invoice.get("socid")), {"customer_id": invoice.get("socid"), "invoices": 0, **self._empty()}
+            )
+            customer["invoices"] += 1
+            customer[bucket] += amount
+            customer["total"] += amount
+
+    def result(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "as_of": self.as_of.isoformat(),
+            "invoices": self.invoices,
+            "buckets": {name: _money(value) for name, value in self.totals.items()},
+        }
+        if self.by_customer:
+            rows = _top(self.customers.values(), "total", self.limit)
+            result["customers"] = [
+                {key: _money(value) if isinstance(value, float) else value for key, value in row.items()}
+                for row in rows
+            ]
+            result["customer_count"] = len(self.customers)
+        return result
+
+
+class TopDebtors:
+    """Customers with the largest outstanding amounts."""
+
+    def __init__(self, as_of: Optional[date] = None, limit: int = 10):
+        self.as_of = as_of or date.today()
+        self.limit = limit
+        self.debtors: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, invoice: Dict[str, Any]) -> None:
+        if not _counts_as_issued(invoice):
+            return
+        amount = outstanding(invoice)
+        if amount < 0.005:
+            return
+        due = invoice_day(invoice.get("date_lim_reglement"))
+        days_overdue = max(0, (self.as_of - due).days) if due is not None else 0
+        debtor = self.debtors.setdefault(
+            str(invoice.get("socid")),
+            {"customer_id": invoice.get("socid"), "outstanding": 0.0, "invoices": 0, "max_days_overdue": 0},
+        )
+        debtor["outstanding"] += amount
+        debtor["invoices"] += 1
+        debtor["max_days_overdue"] = max(debtor["max_days_overdue"], days_overdue)
+
+    def result(self) -> Dict[str, Any]:
+        rows = _top(self.debtors.values(), "outstanding", self.limit)
+        return {
+            "as_of": self.as_of.isoformat(),
+            "customer_count": len(self.debtors),
+            "debtors": [{**row, "outstanding": _money(row["outstanding"])} for row in rows],
+        }
+
+
+class RevenueReport:
+    """Net (and gross) revenue of issued invoices grouped by customer, product or month."""
+
+    GROUPS = ("customer", "product", "month")
+
+    def __init__(self, group_by: str = "month", limit: Optional[int] = 20):
+        if group_by not in self.GROUPS:
+            raise ValueError(f"group_by must be one of {', '.join(self.GROUPS)}")
+        self.group_by = group_by
+        self.limit = limit
+        self.invoices = 0
+        self.total_ht = 0.0
+        self.groups: Dict[str, Dict[str, Any]] = {}
+
+    def _group(self, key: Any, **labels: Any) -> Dict[str, Any]:
+        group = self.groups.get(str(key))
+        if group is None:
+            group = self.groups[str(key)] = {"key": key, **labels, "revenue_ht": 0.0, "invoices": 0}
+            if self.group_by == "product":
+                group["qty"] = 0.0
+            else:
+                group["revenue_ttc"] = 0.0
+        return group
+
+    def add(self, invoice: Dict[str, Any]) -> None:
+        if not _counts_as_issued(invoice):
+            return
+        self.invoices += 1
+        self.total_ht += _amount(invoice.get("total_ht"))
+        if self.group_by == "product":
+            seen = set()
+            for line in invoice.get("lines") or []:
+                if not isinstance(line, dict):
+                    continue
+                product_id = line.get("fk_product") or None
+                group = self._group(
+                    product_id,
+                    ref=line.get("product_ref") or line.get("ref"),
+                    label=line.get("product_label") or line.get("libelle") or (None if product_id else "Free-text lines"),
+                )
+                group["revenue_ht"] += _amount(line.get("total_ht"))
+                group["qty"] += _amount(line.get("qty"))
+                if str(product_id) not in seen:
+                    seen.add(str(product_id))
+                    group["invoices"] += 1
+            return
+        if self.group_by == "customer":
+            group = self._group(invoice.get("socid"))
+        else:
+            day = invoice_day(invoice.get("date"))
+            group = self._group(day.strftime("%Y-%m") if day else None)
+        group["revenue_ht"] += _amount(invoice.get("total_ht"))
+        group["revenue_ttc"] += _amount(invoice.get("total_ttc"))
+        group["invoices"] += 1
+
+    def result(self) -> Dict[str, Any]:
+        if self.group_by == "month":
+            rows = sorted(self.groups.values(), key=lambda row: str(row["key"]))
+        else:
+            rows = _top(self.groups.values(), "revenue_ht", self.limit)
+        return {
+            "group_by": self.group_by,
+            "invoices": self.invoices,
+            "total_ht": _money(self.total_ht),
+            "group_count": len(self.groups),
+            "rows": [
+                {key: _money(value) if isinstance(value, float) else value for key, value in row.items()}
+                for row in rows
+            ],
+        }
+
+
+def issued_between_filter(date_from: Optional[date], date_to: Optional[date]) -> str:
+    """Build the sqlfilter for non-draft invoices dated within the given days."""
+    clauses = ["(t.fk_statut:>:0)"]
+    if date_from is not None:
+        clauses.append(f"(t.datef:>=:'{date_from.isoformat()}')")
+    if date_to is not None:
+        clauses.append(f"(t.datef:<=:'{date_to.isoformat()}')")
+    return " AND ".join(clauses)
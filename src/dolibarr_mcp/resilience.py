@@ -0,0 +1,439 @@
+"""Retry policy, retry budget, circuit breaker, rate limiter and adaptive timeouts for calls to the Dolibarr backend."""
+
+import asyncio
+import random
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, FrozenSet, Optional, Tuple
+
+# Identifier of the MCP session issuing the current tool call, if any.
+current_session: ContextVar[Optional[str]] = ContextVar("dolibarr_mcp_session", default=None)
+
+# Methods whose repetition cannot create duplicate records in Dolibarr.
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Methods that only read data and draw from the read rate limit.
+READ_METHODS: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Statuses that signal a transient condition worth retrying.
+RETRYABLE_STATUSES: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Return the delay in seconds requested by a ``Retry-After`` header, if any."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    current = time.time() if now is None else now
+    return max(0.0, retry_at.timestamp() - current)
+
+
+@dataclass
+class RetryPolicy:
+    """Decide which failures are retried and how long to wait in between."""
+
+    max_retries: int = 2
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES
+    idempotent_methods: FrozenSet[str] = IDEMPOTENT_METHODS
+    rng: Callable[[float, float], float] = field(default=random.uniform, repr=False)
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        """Return whether another attempt is allowed after ``attempt`` (zero-based)."""
+        return attempt < self.max_retries and method.upper() in self.idempotent_methods
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Exponential backoff with full jitter, stretched to honour ``Retry-After``."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = self.rng(0.0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class RetryBudget:
+    """Token bucket that caps retries to a fraction of the request volume.
+
+    Every request deposits ``ratio`` tokens and every retry withdraws one, so
+    retries can never exceed ``ratio`` times the traffic. ``min_per_second``
+    tokens are added over time so low-traffic processes can still retry. When
+    Dolibarr is degraded the budget drains and failures surface immediately
+    instead of multiplying the load with a retry storm.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 1.0,
+        max_tokens: float = 100.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._clock = clock
+        self._tokens = min(max_tokens, max(1.0, min_per_second))
+        self._updated = clock()
+        self.retries = 0
+        self.exhausted = 0
+
+    @property
+    def tokens(self) -> float:
+        """Return the tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def record_request(self) -> None:
+        """Deposit the share of a retry earned by one request."""
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one retry token, returning False when the budget is exhausted."""
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self.retries += 1
+            return True
+        self.exhausted += 1
+        return False
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0 and self.min_per_second > 0:
+            self._tokens = min(self.max_tokens, self._tokens + elapsed * self.min_per_second)
+
+
+_retry_budgets: Dict[Tuple[float, float], RetryBudget] = {}
+
+
+def get_retry_budget(ratio: float = 0.2, min_per_second: float = 1.0) -> RetryBudget:
+    """Return the process-wide retry budget for these parameters, creating it on first use.
+
+    Clients configured alike share one budget; a client with different
+    ``RETRY_BUDGET_*`` settings gets its own instead of the first client's.
+    """
+    key = (ratio, min_per_second)
+    budget = _retry_budgets.get(key)
+    if budget is None:
+        budget = _retry_budgets[key] = RetryBudget(ratio=ratio, min_per_second=min_per_second)
+    return budget
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker guarding one endpoint family.
+
+    ``failure_threshold`` consecutive failures open the circuit. While open,
+    :meth:`allow` rejects calls until ``reset_timeout`` seconds have passed;
+    then a single probe call is admitted (half-open). A successful probe closes
+    the circuit, a failed one re-opens it for another ``reset_timeout``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Return the current state, moving from open to half-open once the timeout elapses."""
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def retry_in(self) -> float:
+        """Return the seconds left until a probe call will be admitted."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed, reserving the probe slot when half-open."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Give back a probe slot whose call ended without an outcome (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold or after a failed probe."""
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the breaker state as a plain dictionary."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in_seconds": round(self.retry_in(), 3),
+            "rejected": self.rejected,
+        }
+
+
+class TokenBucket:
+    """Asynchronous token bucket admitting ``rate`` requests per second.
+
+    Up to ``burst`` requests pass immediately; later ones wait for tokens.
+    Waiters queue on an :class:`asyncio.Lock`, which wakes them in FIFO order,
+    so requests leave in the order they arrived instead of racing for each
+    token. A ``rate`` of 0 disables the bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.rate = rate
+        self.burst = max(1.0, rate if burst is None else burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1.0:
+                delay = (1.0 - self._tokens) / self.rate
+                self.waits += 1
+                self.waited_seconds += delay
+                await self._sleep(delay)
+                self._refill()
+            self._tokens -= 1.0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+
+class RateLimiter:
+    """Separate read and write token buckets with an optional per-session share.
+
+    With ``session_share`` > 0 every MCP session additionally gets its own
+    buckets at that fraction of the global rates, so one busy agent cannot
+    take the whole allowance from the others.
+    """
+
+    def __init__(
+        self,
+        read_rate: float = 0.0,
+        write_rate: float = 0.0,
+        burst: Optional[float] = None,
+        session_share: float = 0.0,
+        max_sessions: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.read_rate = read_rate
+        self.write_rate = write_rate
+        self.burst = burst
+        self.session_share = session_share
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._sleep = sleep
+        self._global = {
+            "read": TokenBucket(read_rate, burst, clock, sleep),
+            "write": TokenBucket(write_rate, burst, clock, sleep),
+        }
+        self._sessions: "OrderedDict[str, Dict[str, TokenBucket]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether any rate is limited."""
+        return self.read_rate > 0 or self.write_rate > 0
+
+    def bucket(self, kind: str, session: Optional[str] = None) -> TokenBucket:
+        """Return the global bucket of ``kind``, or the one of ``session``."""
+        if session is None:
+            return self._global[kind]
+        buckets = self._sessions.get(session)
+        if buckets is None:
+            buckets = {
+                "read": self._session_bucket(self.read_rate),
+                "write": self._session_bucket(self.write_rate),
+            }
+            self._sessions[session] = buckets
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session)
+        return buckets[kind]
+
+    async def acquire(self, method: str, session: Optional[str] = None) -> None:
+        """Wait for the session's and then the global token for ``method``."""
+        kind = "read" if method.upper() in READ_METHODS else "write"
+        if session is not None and self.session_share > 0:
+            await self.bucket(kind, session).acquire()
+        await self._global[kind].acquire()
+
+    def _session_bucket(self, rate: float) -> TokenBucket:
+        session_rate = rate * self.session_share
+        session_burst = None if self.burst is None else max(1.0, self.burst * self.session_share)
+        return TokenBucket(session_rate, session_burst, self._clock, self._sleep)
+
+
+def request_shape(method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Classify a request by its expected cost: ``write``, ``record`` or a listing size bucket.
+
+    Requests addressing one record (any numeric path segment, e.g.
+    ``invoices/4`` or ``invoices/4/lines``) are ``record``. Listings are
+    ``list`` up to 100 rows (Dolibarr's default), ``list_1000`` up to 1000
+    and ``list_all`` beyond that or without a limit (``limit=0``).
+    """
+    if method.upper() not in READ_METHODS:
+        return "write"
+    path = endpoint.split("?", 1)[0].strip("/")
+    if any(segment.isdigit() for segment in path.split("/")):
+        return "record"
+    try:
+        limit = int((params or {}).get("limit", 100))
+    except (TypeError, ValueError):
+        limit = 100
+    if 0 < limit <= 100:
+        return "list"
+    if 0 < limit <= 1000:
+        return "list_1000"
+    return "list_all"
+
+
+class AdaptiveTimeouts:
+    """Request timeouts per endpoint family and request shape that follow the observed p99 latency.
+
+    Each (family, shape) profile keeps its last ``window`` latencies, so fast
+    single-record reads do not shrink the budget of heavy listings of the same
+    family. Until ``min_samples`` have been seen the ``default`` timeout
+    applies; afterwards the timeout is ``multiplier`` times the p99, clamped to
+    ``[min_timeout, max_timeout]``. Timed-out attempts are recorded at the
+    timeout they hit, so a profile whose calls keep timing out earns a longer
+    budget up to ``max_timeout``. ``overrides`` pin the timeout of every shape
+    of a family and disable adaptation for it.
+    """
+
+    def __init__(
+        self,
+        default: float = 30.0,
+        min_timeout: float = 5.0,
+        max_timeout: float = 60.0,
+        multiplier: float = 3.0,
+        window: int = 200,
+        min_samples: int = 20,
+        overrides: Optional[Dict[str, float]] = None,
+        enabled: bool = True,
+    ):
+        self.default = default
+        self.min_timeout = min(min_timeout, max_timeout)
+        self.max_timeout = max_timeout
+        self.multiplier = multiplier
+        self.window = max(1, window)
+        self.min_samples = max(1, min(min_samples, self.window))
+        self.overrides = dict(overrides or {})
+        self.enabled = enabled
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._timeouts: Dict[Tuple[str, str], float] = {}
+        # Observations since the timeout of each profile was last recomputed.
+        self._pending: Dict[Tuple[str, str], int] = {}
+
+    def timeout(self, family: str, shape: str = "") -> float:
+        """Return the total timeout in seconds for the next ``shape`` request to ``family``."""
+        override = self.overrides.get(family)
+        if override is not None:
+            return override
+        return self._timeouts.get((family, shape), self.default)
+
+    def observe(self, family: str, seconds: float, shape: str = "") -> None:
+        """Record the latency of one completed (or timed-out) attempt."""
+        if not self.enabled or family in self.overrides:
+            return
+        key = (family, shape)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+        pending = self._pending.get(key, 0) + 1
+        # Sorting the window is cheap but not free; recompute every tenth sample.
+        if len(samples) >= self.min_samples and (pending >= 10 or key not in self._timeouts):
+            self._timeouts[key] = min(self.max_timeout, max(self.min_timeout, self.p99(family, shape) * self.multiplier))
+            pending = 0
+        self._pending[key] = pending
+
+    def p99(self, family: str, shape: str = "") -> Optional[float]:
+        """Return the 99th percentile of the recorded latencies of a profile."""
+        samples = self._samples.get((family, shape))
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def as_dict(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Return the current timeout, p99 and sample count per (family, shape) profile.
+
+        Overridden families are listed once with an empty shape.
+        """
+        profiles = set(self._samples) | {(family, "") for family in self.overrides}
+        return {
+            (family, shape): {
+                "timeout": self.timeout(family, shape),
+                "p99": self.p99(family, shape),
+                "samples": len(self._samples.get((family, shape), ())),
+            }
+            for family, shape in sorted(profiles)
+        }
@@ -0,0 +1,383 @@
+"""In-process search indexes over Dolibarr products and third parties.
+
+The indexes answer the product and customer search tools without a
+round-trip: a hash map serves exact reference lookups, a sorted array of
+references serves prefix searches via bisection and a trigram posting list
+serves substring and fuzzy searches, refined by edit distance. Each index is
+filled from a paginated snapshot and then kept fresh by fetching only the
+records modified since the last refresh (``t.tms``), complemented by write
+notifications from the client and a periodic full reload that also catches
+records deleted outside this process.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from collections import Counter
+from datetime import tzinfo
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .sync import modified_at as _modified_at
+from .sync import modified_since_filter
+from .sync import record_id as _record_id
+
+logger = logging.getLogger(__name__)
+
+
+def _fold(text: Any) -> str:
+    """Normalize text for case-insensitive matching, like MySQL's default collation."""
+    return str(text or "").casefold()
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Return the three-character substrings of ``text``."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Return the Levenshtein distance of ``a`` and ``b``, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+class TextIndex:
+    """Exact and prefix lookups on a key field plus trigram search over text fields.
+
+    Stored records are shared with callers and must be treated as read-only.
+    """
+
+    def __init__(self, key_field: str, text_fields: Iterable[str]):
+        self.key_field = key_field
+        self.text_fields = tuple(text_fields)
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._by_key: Dict[str, Set[int]] = {}
+        self._sorted_keys: List[Tuple[str, int]] = []
+        self._texts: Dict[int, str] = {}
+        self._terms: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, record_id: int) -> bool:
+        return record_id in self._records
+
+    def get(self, record_id: int) -> Optional[Dict[str, Any]]:
+        """Return the record with ``record_id``, if indexed."""
+        return self._records.get(record_id)
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Add ``record`` or replace the indexed version with the same id."""
+        record_id = _record_id(record)
+        if record_id is None:
+            return
+        self.remove(record_id)
+        bisect.insort(self._sorted_keys, (self._add(record_id, record), record_id))
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Upsert many records, sorting the key list once instead of per insert."""
+        pending: Dict[int, Dict[str, Any]] = {}
+        for record in records:
+            record_id = _record_id(record)
+            if record_id is not None:
+                pending[record_id] = record
+        for record_id in pending:
+            self.remove(record_id)
+        self._sorted_keys.extend((self._add(record_id, record), record_id) for record_id, record in pending.items())
+        self._sorted_keys.sort()
+
+    def _add(self, record_id: int, record: Dict[str, Any]) -> str:
+        """Index a record that is not indexed yet, except in the sorted key list; return its key."""
+        key = _fold(record.get(self.key_field))
+        values = list(dict.fromkeys(_fold(record.get(field)) for field in self.text_fields if record.get(field)))
+        text = "\n".join(values)
+        self._records[record_id] = record
+        self._by_key.setdefault(key, set()).add(record_id)
+        self._texts[record_id] = text
+        self._terms[record_id] = set(values).union(*(value.split() for value in values))
+        for trigram in _trigrams(text):
+            self._postings.setdefault(trigram, set()).add(record_id)
+        return key
+
+    def remove(self, record_id: int) -> bool:
+        """Drop the record with ``record_id``; return whether it was indexed."""
+        record = self._records.pop(record_id, None)
+        if record is None:
+            return False
+        key = _fold(record.get(self.key_field))
+        ids = self._by_key.get(key)
+        if ids is not None:
+            ids.discard(record_id)
+            if not ids:
+                del self._by_key[key]
+        position = bisect.bisect_left(self._sorted_keys, (key, record_id))
+        if position < len(self._sorted_keys) and self._sorted_keys[position] == (key, record_id):
+            del self._sorted_keys[position]
+        self._terms.pop(record_id, None)
+        for trigram in _trigrams(self._texts.pop(record_id, "")):
+            postings = self._postings.get(trigram)
+            if postings is not None:
+                postings.discard(record_id)
+                if not postings:
+                    del self._postings[trigram]
+        return True
+
+    def _ordered(self, ids: Iterable[int]) -> List[Dict[str, Any]]:
+        records = [self._records[record_id] for record_id in ids]
+        records.sort(key=lambda record: (_fold(record.get(self.key_field)), _record_id(record)))
+        return records
+
+    def exact(self, key: str) -> List[Dict[str, Any]]:
+        """Return the records whose key equals ``key`` (case-insensitively)."""
+        return self._ordered(self._by_key.get(_fold(key), ()))
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return records whose key starts with ``prefix``, ordered by key."""
+        folded = _fold(prefix)
+        position = bisect.bisect_left(self._sorted_keys, (folded, -1))
+        results = []
+        while position < len(self._sorted_keys) and (limit is None or len(results) < limit):
+            key, record_id = self._sorted_keys[position]
+            if not key.startswith(folded):
+                break
+            results.append(self._records[record_id])
+            position += 1
+        return results
+
+    def contains(
+        self, query: str, limit: Optional[int] = None, fields: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Return records whose text, or one of ``fields``, contains ``query``, ordered by key."""
+        folded = _fold(query)
+        query_trigrams = _trigrams(folded)
+        if query_trigrams:
+            postings = sorted((self._postings.get(trigram, set()) for trigram in query_trigrams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = set(self._texts)
+        if fields is None:
+            found = (record_id for record_id in candidates if folded in self._texts[record_id])
+        else:
+            names = tuple(fields)
+            found = (
+                record_id
+                for record_id in candidates
+                if any(folded in _fold(self._records[record_id].get(field)) for field in names)
+            )
+        matches = self._ordered(found)
+        return matches if limit is None else matches[:limit]
+
+    def similar(self, query: str, limit: Optional[int] = None, threshold: float = 0.5) -> List[Dict[str, Any]]:
+        """Return records ranked by how closely their text matches ``query``.
+
+        Records containing ``query`` rank first. Others qualify when their
+        text holds at least ``threshold`` of the query trigrams, or when a
+        field value or word is within a few edits of the query (one per four
+        characters), which catches typos in short names. Ties go to the
+        shorter, more specific text.
+        """
+        folded = _fold(query).strip()
+        if not folded:
+            return []
+        query_trigrams = _trigrams(folded)
+        shared: Counter = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._postings.get(trigram, ()))
+        if len(query_trigrams) < 3:
+            # Too few trigrams to find typos: compare short queries with every record.
+            shared.update(dict.fromkeys(self._records, 0))
+        max_edits = max(1, len(folded) // 4)
+        scored = []
+        for record_id, hits in shared.items():
+            text = self._texts[record_id]
+            if folded in text:
+                score = 2.0
+            else:
+                score = hits / len(query_trigrams) if query_trigrams else 0.0
+                if score < threshold:
+                    distance = min(
+                        (edit_distance(folded, term, max_edits) for term in self._terms[record_id]),
+                        default=max_edits + 1,
+                    )
+                    if distance > max_edits:
+                        continue
+                    score = 1.0 - distance / len(folded)
+            scored.append((-score, len(text), _fold(self._records[record_id].get(self.key_field)), record_id))
+        scored.sort()
+        ranked = [self._records[entry[-1]] for entry in scored]
+        return ranked if limit is None else ranked[:limit]
+
+
+class SyncedIndex:
+    """A :class:`TextIndex` over one Dolibarr list endpoint, kept in sync in the background.
+
+    Queries never wait for Dolibarr: :meth:`schedule_refresh` starts loads and
+    incremental refreshes in the background, and callers fall back to the API
+    until the first snapshot is :attr:`ready`. Subclasses name the endpoint and
+    the fields to index.
+    """
+
+    endpoint = ""
+    key_field = "ref"
+    text_fields: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        client: Any,
+        refresh_seconds: float = 60.0,
+        full_refresh_seconds: float = 3600.0,
+        page_size: int = 500,
+        overlap_seconds: float = 900.0,
+        db_timezone: Optional[tzinfo] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.refresh_seconds = refresh_seconds
+        self.full_refresh_seconds = full_refresh_seconds
+        self.page_size = page_size
+        self.overlap_seconds = overlap_seconds
+        self.db_timezone = db_timezone
+        self._clock = clock
+        self._index = self._new_index()
+        self._loaded_at: Optional[float] = None
+        self._refreshed_at: Optional[float] = None
+        self._stale = False
+        self._task: Optional[asyncio.Task] = None
+        self.watermark: Optional[int] = None
+
+    def _new_index(self) -> TextIndex:
+        return TextIndex(key_field=self.key_field, text_fields=self.text_fields)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def ready(self) -> bool:
+        """Return whether a full snapshot has been loaded."""
+        return self._loaded_at is not None
+
+    # ------------------------------------------------------------- maintenance
+
+    def schedule_refresh(self) -> None:
+        """Start a background load or refresh when the index is missing, stale or due."""
+        if self._task is not None and not self._task.done():
+            return
+        now = self._clock()
+        if self._loaded_at is None or now - self._loaded_at >= self.full_refresh_seconds:
+            self._task = asyncio.ensure_future(self._run(self.load()))
+        elif self._stale or self._refreshed_at is None or now - self._refreshed_at >= self.refresh_seconds:
+            self._task = asyncio.ensure_future(self._run(self.refresh()))
+
+    async def _run(self, operation: Any) -> None:
+        try:
+            await operation
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("%s refresh failed: %s", type(self).__name__, exc)
+
+    async def load(self) -> int:
+        """Load a full snapshot into a new index and swap it in; return the record count."""
+        index = self._new_index()
+        watermark = None
+        records = []
+        async for record in self.client.iter_list(self.endpoint, page_size=self.page_size, read_ahead=1):
+            records.append(record)
+            modified = _modified_at(record)
+            if modified is not None and (watermark is None or modified > watermark):
+                watermark = modified
+        index.extend(records)
+        self._index = index
+        self.watermark = watermark
+        self._loaded_at = self._refreshed_at = self._clock()
+        self._stale = False
+        logger.info("%s loaded with %s records", type(self).__name__, len(index))
+        return len(index)
+
+    async def refresh(self) -> int:
+        """Apply the records modified since the watermark; return how many were updated."""
+        if self.watermark is None:
+            return await self.load()
+        self._stale = False
+        params = {"sqlfilters": modified_since_filter(self.watermark - self.overlap_seconds, self.db_timezone)}
+        updated = 0
+        async for record in self.client.iter_list(self.endpoint, page_size=self.page_size, params=params):
+            self._index.upsert(record)
+            modified = _modified_at(record)
+            if modified is not None and modified > self.watermark:
+                self.watermark = modified
+            updated += 1
+        self._refreshed_at = self._clock()
+        return updated
+
+    def on_write(self, method: str, endpoint: str, response: Any) -> None:
+        """Client write listener: apply writes to this endpoint made through the client.
+
+        Deletions and updates that return the record are applied at once;
+        anything else marks the index stale so the next query refreshes it.
+        """
+        parts = endpoint.strip("/").split("/")
+        if parts[0] != self.endpoint:
+            return
+        if method == "DELETE" and len(parts) == 2 and parts[1].isdigit():
+            self._index.remove(int(parts[1]))
+        elif method == "PUT" and len(parts) == 2 and isinstance(response, dict) and _record_id(response) is not None:
+            self._index.upsert(response)
+        else:
+            self._stale = True
+
+    async def close(self) -> None:
+        """Cancel a running background refresh."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+
+class ProductIndex(SyncedIndex):
+    """Product catalogue index: exact and prefix references, label search."""
+
+    endpoint = "products"
+    key_field = "ref"
+    text_fields = ("label",)
+
+    def find_by_ref(self, ref: str) -> List[Dict[str, Any]]:
+        """Return the products whose reference equals ``ref`` (case-insensitively)."""
+        return self._index.exact(ref)
+
+    def search_ref_prefix(self, prefix: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` products whose reference starts with ``prefix``."""
+        return self._index.prefix(prefix, limit)
+
+    def search_label(self, query: str, limit: int = 20, fuzzy: bool = False) -> List[Dict[str, Any]]:
+        """Return products whose label contains ``query``, or resembles it when ``fuzzy``."""
+        if fuzzy:
+            return self._index.similar(query, limit)
+        return self._index.contains(query, limit)
+
+
+class ThirdpartyIndex(SyncedIndex):
+    """Third party index over name, alias, email, VAT number and town."""
+
+    endpoint = "thirdparties"
+    key_field = "name"
+    text_fields = ("name", "nom", "name_alias", "email", "tva_intra", "town")
+    # Fields matched by plain searches, like the API's ``t.nom``/``t.name_alias`` filter.
+    name_fields = ("name", "nom", "name_alias")
+
+    def search(self, query: str, limit: int = 20, fuzzy: bool = False) -> List[Dict[str, Any]]:
+        """Return third parties whose name or alias contains ``query``.
+
+        ``fuzzy`` also ranks near matches and searches email, VAT number and town.
+        """
+        if fuzzy:
+            return self._index.similar(query, limit)
+        return self._index.contains(query, limit, self.name_fields)
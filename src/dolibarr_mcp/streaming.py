@@ -0,0 +1,142 @@
+"""Incremental parsing of large JSON array responses."""
+
+import re
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from . import codec
+
+_STRUCTURAL = re.compile(rb'[\[\]{}",]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_WHITESPACE = b" \t\r\n"
+
+
+class JSONArrayStream:
+    """Split a JSON array into its elements as bytes arrive.
+
+    :meth:`feed` returns the elements completed by a chunk; only the bytes of
+    the element currently being received are buffered, so memory stays bounded
+    by the largest element rather than the whole document. Documents that are
+    not arrays (for example an error object) are buffered and returned by
+    :meth:`close`.
+    """
+
+    def __init__(self, loads: Callable[[bytes], Any] = codec.loads):
+        self._loads = loads
+        self._buffer = bytearray()
+        self._pos = 0
+        self._state = "start"  # start -> array -> done, or start -> document
+        self._depth = 0
+        self._in_string = False
+        self._element_start: Optional[int] = None
+        self.count = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Consume ``chunk`` and return the array elements it completed."""
+        self._buffer += chunk
+        if self._state == "start":
+            self._detect_document()
+        if self._state != "array":
+            return []
+        elements = self._scan()
+        self._compact()
+        return elements
+
+    def close(self) -> Any:
+        """Finish parsing; return a non-array document, or None for an array."""
+        if self._state == "document":
+            return self._loads(bytes(self._buffer))
+        if self._state == "start" and not bytes(self._buffer).strip():
+            return None
+        if self._state != "done":
+            preview = bytes(self._buffer[:80]).decode("utf-8", errors="replace")
+            raise codec.JSONDecodeError("Unterminated JSON array", preview, self._pos)
+        return None
+
+    def _detect_document(self) -> None:
+        stripped = bytes(self._buffer).lstrip(_WHITESPACE)
+        if not stripped:
+            return
+        if stripped[:1] == b"[":
+            self._state = "array"
+            self._pos = len(self._buffer) - len(stripped) + 1
+        else:
+            self._state = "document"
+
+    def _scan(self) -> List[Any]:
+        buffer = self._buffer
+        elements: List[Any] = []
+        while True:
+            if self._element_start is None:
+                # Between elements: skip separators and find the next value.
+                while self._pos < len(buffer) and buffer[self._pos] in b" \t\r\n,":
+                    self._pos += 1
+                if self._pos >= len(buffer):
+                    return elements
+                if buffer[self._pos] == ord("]"):
+                    self._state = "done"
+                    return elements
+                self._element_start = self._pos
+
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buffer, self._pos)
+                if match is None or match.end() == len(buffer) and match.group() == b"\\":
+                    # Wait for the closing quote (or the character after a backslash).
+                    self._pos = len(buffer) if match is None else match.start()
+                    return elements
+                if match.group() == b"\\":
+                    self._pos = match.start() + 2
+                    continue
+                self._in_string = False
+                self._pos = match.end()
+                continue
+
+            match = _STRUCTURAL.search(buffer, self._pos)
+            if match is None:
+                self._pos = len(buffer)
+                return elements
+            char = match.group()
+            self._pos = match.end()
+            if char == b'"':
+                self._in_string = True
+            elif char in (b"[", b"{"):
+                self._depth += 1
+            elif self._depth > 0 and char in (b"]", b"}"):
+                self._depth -= 1
+                if self._depth == 0:
+                    elements.append(self._emit(match.end()))
+            elif self._depth == 0 and char in (b",", b"]"):
+                # End of a scalar element such as a number, string or literal.
+                elements.append(self._emit(match.start()))
+                if char == b"]":
+                    self._state = "done"
+                    return elements
+
+    def _emit(self, end: int) -> Any:
+        start = self._element_start
+        self._element_start = None
+        self.count += 1
+        return self._loads(bytes(self._buffer[start:end]).strip())
+
+    def _compact(self) -> None:
+        keep_from = self._pos if self._element_start is None else self._element_start
+        if keep_from:
+            del self._buffer[:keep_from]
+            self._pos -= keep_from
+            if self._element_start is not None:
+                self._element_start = 0
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Yield the elements of a JSON array delivered as an async stream of byte chunks.
+
+    A non-array document yields its ``data`` list when it has one (Dolibarr's
+    ``pagination_data`` envelope) and nothing otherwise.
+    """
+    parser = JSONArrayStream()
+    async for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+    document = parser.close()
+    if isinstance(document, dict) and isinstance(document.get("data"), list):
+        for element in document["data"]:
+            yield element
@@ -0,0 +1,352 @@
+"""Incremental change-feed sync of Dolibarr entities into a local store.
+
+Dolibarr has no change feed, but every object carries its last modification
+time (``tms`` in SQL, ``date_modification`` in the API). The sync engine polls
+each entity with a ``t.tms`` filter starting at the newest modification it has
+seen (the watermark), applies the returned records to a store and advances the
+watermark. Only the first sync of an entity and the periodic reconcile scans,
+which drop records deleted in Dolibarr, read the full table.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+# Entities mirrored by default, by Dolibarr API endpoint.
+DEFAULT_SYNC_ENTITIES: Sequence[str] = ("thirdparties", "products", "invoices", "orders", "contacts", "projects")
+
+
+def record_id(record: Dict[str, Any]) -> Optional[int]:
+    """Return the numeric id of a Dolibarr record, if it has one."""
+    try:
+        return int(record["id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def modified_at(record: Dict[str, Any]) -> Optional[int]:
+    """Return a record's ``date_modification`` as a Unix timestamp, if present."""
+    try:
+        return int(record.get("date_modification"))
+    except (TypeError, ValueError):
+        return None
+
+
+def database_timezone(name: Optional[str]) -> tzinfo:
+    """Return the time zone of ``name``: ``UTC``, an offset such as ``-05:00`` or an IANA name.
+
+    IANA names (with daylight saving time) need Python 3.9+; raises ValueError
+    for names that cannot be resolved.
+    """
+    value = (name or "UTC").strip()
+    if value.upper() in ("UTC", "Z"):
+        return timezone.utc
+    offset = re.fullmatch(r"([+-])(\d{1,2}):?(\d{2})", value)
+    if offset:
+        sign, hours, minutes = offset.groups()
+        delta = timedelta(hours=int(hours), minutes=int(minutes))
+        return timezone(-delta if sign == "-" else delta)
+    try:
+        from zoneinfo import ZoneInfo  # Python 3.9+
+    except ImportError as exc:
+        raise ValueError(f"Time zone '{value}' needs Python 3.9+; use an offset such as -05:00") from exc
+    try:
+        return ZoneInfo(value)
+    except (KeyError, ValueError) as exc:
+        raise ValueError(f"Unknown time zone '{value}'") from exc
+
+
+def modified_since_filter(watermark: float, db_timezone: Optional[tzinfo] = None) -> str:
+    """Build the sqlfilter selecting records modified at or after ``watermark``.
+
+    ``t.tms`` is compared in the database server's local time, so the
+    timestamp is rendered in ``db_timezone`` (UTC by default). Callers
+    subtract an overlap to cover clock skew; applying a record twice is
+    idempotent.
+    """
+    since = datetime.fromtimestamp(max(0.0, watermark), db_timezone or timezone.utc)
+    return f"(t.tms:>=:'{since:%Y-%m-%d %H:%M:%S}')"
+
+
+class MemoryStore:
+    """Dictionary-backed store of mirrored records and watermarks.
+
+    Stored records are shared with readers and must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._records: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._watermarks: Dict[str, Optional[int]] = {}
+        self._synced_at: Dict[str, Optional[float]] = {}
+
+    def upsert(self, entity: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace ``records``; return how many were applied."""
+        table = self._records.setdefault(entity, {})
+        applied = 0
+        for record in records:
+            identifier = record_id(record)
+            if identifier is not None:
+                table[identifier] = record
+                applied += 1
+        return applied
+
+    def remove(self, entity: str, identifier: int) -> bool:
+        """Delete one record; return whether it existed."""
+        return self._records.get(entity, {}).pop(identifier, None) is not None
+
+    def ids(self, entity: str) -> Set[int]:
+        """Return the ids of the mirrored records of ``entity``."""
+        return set(self._records.get(entity, {}))
+
+    def get(self, entity: str, identifier: int) -> Optional[Dict[str, Any]]:
+        """Return one mirrored record."""
+        return self._records.get(entity, {}).get(identifier)
+
+    def all(self, entity: str) -> List[Dict[str, Any]]:
+        """Return every mirrored record of ``entity``."""
+        return list(self._records.get(entity, {}).values())
+
+    def count(self, entity: str) -> int:
+        """Return the number of mirrored records of ``entity``."""
+        return len(self._records.get(entity, {}))
+
+    def get_watermark(self, entity: str) -> Optional[int]:
+        """Return the newest modification time applied for ``entity``."""
+        return self._watermarks.get(entity)
+
+    def synced_at(self, entity: str) -> Optional[float]:
+        """Return the time ``entity`` was last synced successfully."""
+        return self._synced_at.get(entity)
+
+    def set_watermark(self, entity: str, watermark: Optional[int], synced_at: Optional[float] = None) -> None:
+        """Persist the watermark of ``entity`` and the time of the sync that reached it."""
+        self._watermarks[entity] = watermark
+        self._synced_at[entity] = synced_at
+
+
+@dataclass
+class EntitySyncState:
+    """Progress and health of one mirrored entity."""
+
+    entity: str
+    last_attempt: Optional[float] = None
+    last_success: Optional[float] = None
+    last_duration: float = 0.0
+    last_applied: int = 0
+    total_applied: int = 0
+    full_scans: int = 0
+    removed: int = 0
+    errors: int = 0
+    last_error: Optional[str] = None
+
+    def as_dict(self, now: float, watermark: Optional[int], records: int) -> Dict[str, Any]:
+        """Return the state with lag figures relative to ``now``."""
+        return {
+            "records": records,
+            "watermark": watermark,
+            "lag_seconds": None if self.last_success is None else round(now - self.last_success, 3),
+            "watermark_age_seconds": None if watermark is None else round(now - watermark, 3),
+            "last_duration_seconds": round(self.last_duration, 3),
+            "last_applied": self.last_applied,
+            "total_applied": self.total_applied,
+            "full_scans": self.full_scans,
+            "removed": self.removed,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+class SyncEngine:
+    """Poll Dolibarr entities for changes and apply them to a store.
+
+    ``lag_seconds`` in :meth:`status` is the time since an entity was last
+    synced successfully, i.e. how stale the mirror may be.
+    ``watermark_age_seconds`` is the age of the newest change seen.
+
+    :meth:`lookup` serves single records from the store while their entity
+    was synced within ``max_staleness`` seconds (per entity, falling back to
+    ``default_max_staleness``; 0 never serves that entity).
+
+    Every ``reconcile_seconds`` (0 disables) an entity is scanned fully again
+    and records Dolibarr no longer returns are removed, so deletions made
+    outside this process stop being served. ``db_timezone`` is the time zone
+    the Dolibarr database stores ``tms`` in.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        store: Any = None,
+        entities: Iterable[str] = DEFAULT_SYNC_ENTITIES,
+        interval: float = 60.0,
+        page_size: int = 500,
+        overlap_seconds: float = 900.0,
+        max_staleness: Optional[Dict[str, float]] = None,
+        default_max_staleness: float = 0.0,
+        reconcile_seconds: float = 3600.0,
+        db_timezone: Optional[tzinfo] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.client = client
+        self.store = store if store is not None else MemoryStore()
+        self.entities = list(entities)
+        self.interval = interval
+        self.page_size = page_size
+        self.overlap_seconds = overlap_seconds
+        self.max_staleness = dict(max_staleness or {})
+        self.default_max_staleness = default_max_staleness
+        self.reconcile_seconds = reconcile_seconds
+        self.db_timezone = db_timezone
+        self._clock = clock
+        self.states: Dict[str, EntitySyncState] = {}
+        # Time of the last full scan per entity; a warm restart counts from startup.
+        self._reconciled_at: Dict[str, float] = {}
+        for entity in self.entities:
+            # A persistent store remembers when it was last synced, so a restart starts warm.
+            self.states[entity] = EntitySyncState(entity, last_success=self._stored_sync_time(entity))
+            self._reconciled_at[entity] = clock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Return whether the background polling loop is active."""
+        return self._task is not None and not self._task.done()
+
+    async def sync_entity(self, entity: str) -> int:
+        """Apply the changes of one entity since its watermark; return the records applied."""
+        state = self.states.setdefault(entity, EntitySyncState(entity))
+        started = self._clock()
+        state.last_attempt = started
+        watermark = self.store.get_watermark(entity)
+        reconciled_at = self._reconciled_at.get(entity, started)
+        full_scan = watermark is None or 0 < self.reconcile_seconds <= started - reconciled_at
+        params = None
+        if full_scan:
+            state.full_scans += 1
+        else:
+            params = {"sqlfilters": modified_since_filter(watermark - self.overlap_seconds, self.db_timezone)}
+
+        applied = 0
+        newest = watermark
+        seen: Set[int] = set()
+        batch: List[Dict[str, Any]] = []
+        try:
+            async for record in self.client.iter_list(entity, page_size=self.page_size, params=params):
+                batch.append(record)
+                identifier = record_id(record)
+                if identifier is not None:
+                    seen.add(identifier)
+                modified = modified_at(record)
+                if modified is not None and (newest is None or modified > newest):
+                    newest = modified
+                if len(batch) >= self.page_size:
+                    applied += self.store.upsert(entity, batch)
+                    batch = []
+            applied += self.store.upsert(entity, batch)
+            if full_scan:
+                # Whatever a complete scan did not return was deleted in Dolibarr.
+                stale = self.store.ids(entity) - seen
+                for identifier in stale:
+                    self.store.remove(entity, identifier)
+                state.removed += len(stale)
+                self._reconciled_at[entity] = started
+        except Exception as exc:
+            state.errors += 1
+            state.last_error = str(exc)
+            raise
+
+        # Only advance the watermark once the whole delta has been applied.
+        state.last_success = self._clock()
+        self.store.set_watermark(entity, newest, state.last_success)
+        state.last_duration = state.last_success - started
+        state.last_applied = applied
+        state.total_applied += applied
+        state.last_error = None
+        return applied
+
+    async def sync_once(self) -> Dict[str, int]:
+        """Sync every entity once; failures are logged and counted per entity."""
+        applied: Dict[str, int] = {}
+        for entity in self.entities:
+            try:
+                applied[entity] = await self.sync_entity(entity)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.warning("Sync of %s failed: %s", entity, exc)
+        return applied
+
+    async def rescan(self, entity: str) -> int:
+        """Forget the watermark of ``entity`` and scan it fully again."""
+        self.store.set_watermark(entity, None)
+        return await self.sync_entity(entity)
+
+    def is_fresh(self, entity: str) -> bool:
+        """Return whether ``entity`` was synced within its staleness bound."""
+        state = self.states.get(entity)
+        bound = self.max_staleness.get(entity, self.default_max_staleness)
+        if state is None or state.last_success is None or bound <= 0:
+            return False
+        return self._clock() - state.last_success <= bound
+
+    def lookup(self, entity: str, identifier: int) -> Optional[Dict[str, Any]]:
+        """Return a mirrored record if its entity is fresh enough, else None."""
+        if not self.is_fresh(entity):
+            return None
+        return self.store.get(entity, identifier)
+
+    async def run(self) -> None:
+        """Poll for changes every ``interval`` seconds until cancelled."""
+        while True:
+            await self.sync_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the polling loop in the background."""
+        if not self.running:
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the polling loop."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def on_write(self, method: str, endpoint: str, response: Any) -> None:
+        """Client write listener: mirror deletions and returned updates immediately."""
+        parts = endpoint.split("?", 1)[0].strip("/").split("/")
+        if parts[0] not in self.states or len(parts) < 2 or not parts[1].isdigit():
+            return
+        if method == "PUT" and len(parts) == 2 and isinstance(response, dict) and record_id(response) is not None:
+            self.store.upsert(parts[0], [response])
+        else:
+            # Deleted, or changed in a way the response does not show (e.g. lines): evict until the next poll.
+            self.store.remove(parts[0], int(parts[1]))
+
+    async def close(self) -> None:
+        """Stop polling and close the store if it holds resources."""
+        await self.stop()
+        close = getattr(self.store, "close", None)
+        if close is not None:
+            close()
+
+    def _stored_sync_time(self, entity: str) -> Optional[float]:
+        synced_at = getattr(self.store, "synced_at", None)
+        return synced_at(entity) if synced_at is not None else None
+
+    def status(self) -> Dict[str, Any]:
+        """Return per-entity record counts, watermarks and lag."""
+        now = self._clock()
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "entities": {
+                entity: state.as_dict(now, self.store.get_watermark(entity), self.store.count(entity))
+                for entity, state in self.states.items()
+            },
+        }
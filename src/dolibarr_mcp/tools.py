@@ -0,0 +1,2086 @@
+"""Declarative registry of the MCP tools exposed by the Dolibarr MCP server.
+
+Each tool is described once at import time by a :class:`ToolSpec` that pairs
+the MCP ``Tool`` definition (name, description and JSON schema) with the
+``DolibarrClient`` coroutine that implements it and a small argument mapper.
+The server dispatches tool calls with a dictionary lookup and serves
+``tools/list`` from the prebuilt tool list.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from mcp.types import Tool
+
+from .dolibarr_client import DolibarrAPIError
+from .projection import project
+from .search_index import ProductIndex, SyncedIndex, ThirdpartyIndex
+from .sync import SyncEngine
+
+# Positional and keyword arguments passed to the DolibarrClient coroutine.
+MappedArguments = Tuple[Tuple[Any, ...], Dict[str, Any]]
+ArgumentMapper = Callable[[Dict[str, Any]], MappedArguments]
+ResultProcessor = Callable[[Any, Dict[str, Any]], Any]
+ToolHandler = Callable[[Any, Dict[str, Any]], Awaitable[Any]]
+LocalLookup = Callable[[Any, Dict[str, Any]], Optional[Any]]
+
+# Most lines accepted by one add_invoice_lines call.
+INVOICE_LINES_MAX = 500
+
+# Arguments resolved through the setup dictionaries by the create_* tools.
+PAYMENT_TERMS_PROPERTY: Dict[str, Any] = {
+    "type": "string",
+    "description": "Payment terms code or label, e.g. \"30D\" (see lookup_dictionary payment_terms)",
+}
+PAYMENT_TYPE_PROPERTY: Dict[str, Any] = {
+    "type": "string",
+    "description": "Payment method code or label, e.g. \"VIR\" (see lookup_dictionary payment_types)",
+}
+UNIT_PROPERTY: Dict[str, Any] = {
+    "type": "string",
+    "description": "Unit code or label, e.g. \"H\" or \"Hour\" (see lookup_dictionary units)",
+}
+
+# Optional server-side projection accepted by the read tools.
+FIELDS_PROPERTY: Dict[str, Any] = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": (
+        "Only return these fields of each object, e.g. [\"id\", \"ref\", \"total_ttc\"]. "
+        "Use dots for nested fields such as \"lines.product_ref\"."
+    ),
+}
+
+
+def _escape_sqlfilter(value: str) -> str:
+    """Escape single quotes for SQL filters."""
+    return value.replace("'", "''")
+
+
+def _keyword_arguments(arguments: Dict[str, Any]) -> MappedArguments:
+    """Forward all tool arguments as keyword arguments."""
+    return (), arguments
+
+
+def _no_arguments(arguments: Dict[str, Any]) -> MappedArguments:
+    """Call the client coroutine without arguments."""
+    return (), {}
+
+
+def _positional(*keys: str) -> ArgumentMapper:
+    """Pass ``keys`` positionally and the remaining arguments as keywords."""
+
+    def mapper(arguments: Dict[str, Any]) -> MappedArguments:
+        args = tuple(arguments.pop(key) for key in keys)
+        return args, arguments
+
+    return mapper
+
+
+def _keywords(**defaults: Any) -> ArgumentMapper:
+    """Pass only the listed keyword arguments, falling back to their defaults."""
+
+    def mapper(arguments: Dict[str, Any]) -> MappedArguments:
+        return (), {key: arguments.get(key, default) for key, default in defaults.items()}
+
+    return mapper
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """One MCP tool: its schema, argument mapper and DolibarrClient coroutine.
+
+    Tools that are not backed by a single client coroutine provide a
+    ``handler`` receiving the client and the raw arguments instead. A
+    ``local_lookup`` may answer a call from in-process data; when it returns
+    None the client coroutine is awaited as usual.
+    """
+
+    tool: Tool
+    method: Optional[str] = None
+    map_arguments: ArgumentMapper = _keyword_arguments
+    post_process: Optional[ResultProcessor] = None
+    handler: Optional[ToolHandler] = None
+    local_lookup: Optional[LocalLookup] = None
+
+    @property
+    def name(self) -> str:
+        """Return the MCP tool name."""
+        return self.tool.name
+
+    @property
+    def projectable(self) -> bool:
+        """Return whether the tool accepts a ``fields`` projection."""
+        return "fields" in self.tool.inputSchema.get("properties", {})
+
+    async def invoke(self, client: Any, arguments: Dict[str, Any]) -> Any:
+        """Map ``arguments`` and await the client coroutine backing this tool."""
+        if self.handler is not None:
+            return await self.handler(client, arguments)
+        fields = None
+        if self.projectable:
+            arguments = dict(arguments)
+            fields = arguments.pop("fields", None)
+        result = self.local_lookup(client, arguments) if self.local_lookup is not None else None
+        if result is None:
+            args, kwargs = self.map_arguments(dict(arguments))
+            result = await getattr(client, self.method)(*args, **kwargs)
+        if self.post_process is not None:
+            result = self.post_process(result, arguments)
+        if fields:
+            result = project(result, fields)
+        return result
+
+
+TOOL_REGISTRY: Dict[str, ToolSpec] = {}
+_tool_list: Optional[List[Tool]] = None
+
+
+def register_tool(spec: ToolSpec) -> ToolSpec:
+    """Add ``spec`` to the registry; tool names must be unique."""
+    global _tool_list
+    if spec.name in TOOL_REGISTRY:
+        raise ValueError(f"Tool '{spec.name}' is already registered")
+    TOOL_REGISTRY[spec.name] = spec
+    _tool_list = None
+    return spec
+
+
+def get_tool(name: str) -> Optional[ToolSpec]:
+    """Return the registered tool called ``name``, if any."""
+    return TOOL_REGISTRY.get(name)
+
+
+def list_tools() -> List[Tool]:
+    """Return the list of registered tools in registration order, built once and reused.
+
+    Only the ``Tool`` objects are reused; the MCP layer serializes them for each
+    ``tools/list`` request.
+    """
+    global _tool_list
+    if _tool_list is None:
+        _tool_list = [spec.tool for spec in TOOL_REGISTRY.values()]
+    return _tool_list
+
+
+# ============================================================================
+# ARGUMENT MAPPERS AND RESULT PROCESSORS
+# ============================================================================
+
+
+def _connection_result(result: Any, arguments: Dict[str, Any]) -> Any:
+    """Wrap status responses that lack a success marker."""
+    if "success" not in result:
+        return {"status": "success", "message": "API connection working", "data": result}
+    return result
+
+
+def _search_products_by_ref_arguments(arguments: Dict[str, Any]) -> MappedArguments:
+    ref_prefix = _escape_sqlfilter(arguments["ref_prefix"])
+    sqlfilters = f"(t.ref:like:'{ref_prefix}%')"
+    return (), {"sqlfilters": sqlfilters, "limit": arguments.get("limit", 20)}
+
+
+def _search_customers_arguments(arguments: Dict[str, Any]) -> MappedArguments:
+    query = _escape_sqlfilter(arguments["query"])
+    sqlfilters = f"((t.nom:like:'%{query}%') OR (t.name_alias:like:'%{query}%'))"
+    return (), {"sqlfilters": sqlfilters, "limit": arguments.get("limit", 20)}
+
+
+def _search_products_by_label_arguments(arguments: Dict[str, Any]) -> MappedArguments:
+    label_search = _escape_sqlfilter(arguments["label_search"])
+    sqlfilters = f"(t.label:like:'%{label_search}%')"
+    return (), {"sqlfilters": sqlfilters, "limit": arguments.get("limit", 20)}
+
+
+def _search_projects_arguments(arguments: Dict[str, Any]) -> MappedArguments:
+    query = _escape_sqlfilter(arguments["query"])
+    sqlfilters = f"((t.ref:like:'%{query}%') OR (t.title:like:'%{query}%'))"
+    return (), {"sqlfilters": sqlfilters, "limit": arguments.get("limit", 20)}
+
+
+def _ready_index(client: Any, attribute: str, index_type: type) -> Optional[SyncedIndex]:
+    """Return a client search index once loaded, scheduling loads and refreshes."""
+    index = getattr(client, attribute, None)
+    if not isinstance(index, index_type):
+        return None
+    index.schedule_refresh()
+    return index if index.ready else None
+
+
+# Search lookups answer from a ready index only when it has matches: records created
+# outside this process since the last refresh are still found through the API.
+
+
+def _ready_product_index(client: Any) -> Optional[ProductIndex]:
+    return _ready_index(client, "product_index", ProductIndex)
+
+
+def _search_customers_local(client: Any, arguments: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    index = _ready_index(client, "thirdparty_index", ThirdpartyIndex)
+    if index is None:
+        return None
+    return index.search(arguments["query"], arguments.get("limit", 20), arguments.get("fuzzy", False)) or None
+
+
+def _search_products_by_ref_local(client: Any, arguments: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    index = _ready_product_index(client)
+    if index is None:
+        return None
+    return index.search_ref_prefix(arguments["ref_prefix"], arguments.get("limit", 20)) or None
+
+
+def _search_products_by_label_local(client: Any, arguments: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    index = _ready_product_index(client)
+    if index is None:
+        return None
+    matches = index.search_label(arguments["label_search"], arguments.get("limit", 20), arguments.get("fuzzy", False))
+    return matches or None
+
+
+def _resolve_product_ref_local(client: Any, arguments: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    index = _ready_product_index(client)
+    if index is None:
+        return None
+    return index.find_by_ref(arguments["ref"]) or None
+
+
+def _mirrored(entity: str, argument: str) -> LocalLookup:
+    """Build a lookup answering a get-by-id tool from the sync engine's mirror while it is fresh."""
+
+    def lookup(client: Any, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        engine = getattr(client, "sync_engine", None)
+        if not isinstance(engine, SyncEngine):
+            return None
+        return engine.lookup(entity, int(arguments[argument]))
+
+    return lookup
+
+
+def _resolve_product_ref_arguments(arguments: Dict[str, Any]) -> MappedArguments:
+    ref_esc = _escape_sqlfilter(arguments["ref"])
+    return (), {"sqlfilters": f"(t.ref:like:'{ref_esc}')", "limit": 2}
+
+
+def _resolve_product_ref_result(products: Any, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Classify the candidates for an exact reference as ok, not_found or ambiguous."""
+    ref = arguments["ref"]
+    if not products:
+        return {"status": "not_found", "message": f"Product with ref '{ref}' not found"}
+    if len(products) == 1:
+        return {"status": "ok", "product": products[0]}
+
+    # Check if one is exact match
+    exact_matches = [p for p in products if p.get("ref") == ref]
+    if len(exact_matches) == 1:
+        return {"status": "ok", "product": exact_matches[0]}
+    return {"status": "ambiguous", "message": f"Multiple products found for ref '{ref}'", "products": products}
+
+
+def _invoice_draft_arguments(arguments: Dict[str, Any]) -> MappedArguments:
+    # Map customer_id to socid for the API
+    if "customer_id" in arguments:
+        arguments["socid"] = arguments.pop("customer_id")
+
+    # Map project_id to fk_project if present
+    if "project_id" in arguments:
+        arguments["fk_project"] = arguments.pop("project_id")
+    return (), arguments
+
+
+def _invoice_project_arguments(arguments: Dict[str, Any]) -> MappedArguments:
+    return (arguments["invoice_id"],), {"fk_project": arguments["project_id"]}
+
+
+# ============================================================================
+# TOOL DEFINITIONS
+# ============================================================================
+
+# System & Info
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="test_connection",
+            description="Test Dolibarr API connection",
+            inputSchema={"type": "object", "properties": {}, "additionalProperties": False},
+        ),
+        method="get_status",
+        map_arguments=_no_arguments,
+        post_process=_connection_result,
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_status",
+            description="Get Dolibarr system status and version information",
+            inputSchema={"type": "object", "properties": {}, "additionalProperties": False},
+        ),
+        method="get_status",
+        map_arguments=_no_arguments,
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_sync_status",
+            description=(
+                "Get the state of the local Dolibarr mirror: per entity record count, watermark and "
+                "lag_seconds since the last successful change-feed poll"
+            ),
+            inputSchema={"type": "object", "properties": {}, "additionalProperties": False},
+        ),
+        method="get_sync_status",
+        map_arguments=_no_arguments,
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="lookup_dictionary",
+            description=(
+                "Look up Dolibarr setup dictionary entries (countries, payment_terms, payment_types, units, "
+                "currencies) by ID, code or label from a local cache. Use this instead of dolibarr_raw_api on "
+                "setup/dictionary endpoints."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "dictionary": {
+                        "type": "string",
+                        "enum": ["countries", "payment_terms", "payment_types", "units", "currencies"],
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "ID, code or (part of a) label; omit to list entries",
+                    },
+                    "limit": {"type": "integer", "description": "Maximum entries returned", "default": 20},
+                },
+                "required": ["dictionary"],
+                "additionalProperties": False,
+            },
+        ),
+        method="lookup_dictionary",
+    )
+)
+
+# Search Tools
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="search_products_by_ref",
+            description=(
+                "Search products by (partial) reference. Use this when a product reference appears in the text "
+                "but may be incomplete or slightly uncertain. This tool returns a small, filtered list and should "
+                "be preferred over get_products for any kind of lookup by reference."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ref_prefix": {
+                        "type": "string",
+                        "description": "Prefix of the product reference",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of results",
+                        "default": 20,
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["ref_prefix"],
+                "additionalProperties": False,
+            },
+        ),
+        method="search_products",
+        map_arguments=_search_products_by_ref_arguments,
+        local_lookup=_search_products_by_ref_local,
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="search_customers",
+            description=(
+                "Search customers/third parties by name or alias. Use this whenever you need to find a customer "
+                "from a name in text instead of loading a full list. Pay attention to legal suffixes and exact matches "
+                "(e.g. 'GmbH' vs 'OG', 'Inc', etc.). Do not use get_customers for name-based search."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Search term for name or alias",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of results",
+                        "default": 20,
+                    },
+                    "fuzzy": {
+                        "type": "boolean",
+                        "description": (
+                            "Rank close matches too, tolerating typos and spelling variants, and also "
+                            "match email, VAT number and town (needs the third party index)"
+                        ),
+                        "default": False,
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["query"],
+                "additionalProperties": False,
+            },
+        ),
+        method="search_customers",
+        map_arguments=_search_customers_arguments,
+        local_lookup=_search_customers_local,
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="search_products_by_label",
+            description=(
+                "Search products by label/description text. Use this when you only know the human-readable product "
+                "name or part of it. Prefer this over get_products for any label-based lookup to keep result sets small."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "label_search": {
+                        "type": "string",
+                        "description": "Search term in product label",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of results",
+                        "default": 20,
+                    },
+                    "fuzzy": {
+                        "type": "boolean",
+                        "description": "Also return close matches ranked by similarity (tolerates typos; needs the product index)",
+                        "default": False,
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["label_search"],
+                "additionalProperties": False,
+            },
+        ),
+        method="search_products",
+        map_arguments=_search_products_by_label_arguments,
+        local_lookup=_search_products_by_label_local,
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="resolve_product_ref",
+            description=(
+                "Resolve an exact product reference (ref) to a single product. Use this only when the exact reference "
+                "string is known and you need a deterministic mapping to a product ID before creating orders or invoices. "
+                "Returns a structured result with status 'ok', 'not_found', or 'ambiguous'. Do not use this for fuzzy search."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ref": {"type": "string", "description": "Exact product reference"}
+                },
+                "required": ["ref"],
+                "additionalProperties": False,
+            },
+        ),
+        method="search_products",
+        map_arguments=_resolve_product_ref_arguments,
+        post_process=_resolve_product_ref_result,
+        local_lookup=_resolve_product_ref_local,
+    )
+)
+
+# User Management CRUD
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_users",
+            description=(
+                "Get an unfiltered paginated list of users from Dolibarr. "
+                "Use this only when you explicitly need a page of users for inspection or debugging. "
+                "Do not use this tool to search by name, login or email (there is no server-side filter here)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of users to return (default: 100)",
+                        "default": 100,
+                    },
+                    "page": {
+                        "type": "integer",
+                        "description": "Page number for pagination (default: 1)",
+                        "default": 1,
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        method="get_users",
+        map_arguments=_keywords(limit=100, page=1),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_user_by_id",
+            description=(
+                "Get the details of exactly one user by numeric ID. "
+                "Use this only when you already know the internal Dolibarr user_id. "
+                "Do not pass login, email or name here."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "user_id": {
+                        "type": "integer",
+                        "description": "Exact numeric Dolibarr user ID (not login, not email).",
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["user_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="get_user_by_id",
+        map_arguments=_positional("user_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="create_user",
+            description="Create a new user",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "login": {"type": "string", "description": "User login"},
+                    "lastname": {"type": "string", "description": "Last name"},
+                    "firstname": {"type": "string", "description": "First name"},
+                    "email": {"type": "string", "description": "Email address"},
+                    "password": {"type": "string", "description": "Password"},
+                    "admin": {
+                        "type": "integer",
+                        "description": "Admin level (0=No, 1=Yes)",
+                        "default": 0,
+                    },
+                },
+                "required": ["login", "lastname"],
+                "additionalProperties": False,
+            },
+        ),
+        method="create_user",
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="update_user",
+            description="Update an existing user",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "user_id": {"type": "integer", "description": "User ID to update"},
+                    "login": {"type": "string", "description": "User login"},
+                    "lastname": {"type": "string", "description": "Last name"},
+                    "firstname": {"type": "string", "description": "First name"},
+                    "email": {"type": "string", "description": "Email address"},
+                    "admin": {
+                        "type": "integer",
+                        "description": "Admin level (0=No, 1=Yes)",
+                    },
+                },
+                "required": ["user_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="update_user",
+        map_arguments=_positional("user_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="delete_user",
+            description="Delete a user",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "user_id": {"type": "integer", "description": "User ID to delete"}
+                },
+                "required": ["user_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="delete_user",
+        map_arguments=_positional("user_id"),
+    )
+)
+
+# Customer/Third Party Management CRUD
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_customers",
+            description=(
+                "Get an unfiltered paginated list of customers/third parties from Dolibarr. "
+                "Intended for debugging or browsing only. DO NOT use this tool to search by name or alias "
+                "(use the dedicated search_* tools such as search_customers instead)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of customers to return (default: 100)",
+                        "default": 100,
+                    },
+                    "page": {
+                        "type": "integer",
+                        "description": "Page number for pagination (default: 1)",
+                        "default": 1,
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        method="get_customers",
+        map_arguments=_keywords(limit=100, page=1),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_customer_by_id",
+            description=(
+                "Get the details of exactly one customer by numeric ID. "
+                "Use this only when you already know the internal Dolibarr customer_id. "
+                "Do not pass name or email here."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "customer_id": {
+                        "type": "integer",
+                        "description": "Exact numeric Dolibarr customer ID (not name).",
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["customer_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="get_customer_by_id",
+        map_arguments=_positional("customer_id"),
+        local_lookup=_mirrored("thirdparties", "customer_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="create_customer",
+            description="Create a new customer/third party",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "description": "Customer name"},
+                    "email": {"type": "string", "description": "Email address"},
+                    "phone": {"type": "string", "description": "Phone number"},
+                    "address": {"type": "string", "description": "Customer address"},
+                    "town": {"type": "string", "description": "City/Town"},
+                    "zip": {"type": "string", "description": "Postal code"},
+                    "country_id": {
+                        "type": "integer",
+                        "description": "Country ID (default: country, the configured default country, or 1)",
+                    },
+                    "country": {
+                        "type": "string",
+                        "description": "Country code or name, e.g. \"DE\" or \"Germany\" (alternative to country_id)",
+                    },
+                    "payment_terms": PAYMENT_TERMS_PROPERTY,
+                    "payment_type": PAYMENT_TYPE_PROPERTY,
+                    "type": {
+                        "type": "integer",
+                        "description": "Customer type (1=Customer, 2=Supplier, 3=Both)",
+                        "default": 1,
+                    },
+                    "status": {
+                        "type": "integer",
+                        "description": "Status (1=Active, 0=Inactive)",
+                        "default": 1,
+                    },
+                },
+                "required": ["name"],
+                "additionalProperties": False,
+            },
+        ),
+        method="create_customer",
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="update_customer",
+            description="Update an existing customer",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "customer_id": {
+                        "type": "integer",
+                        "description": "Customer ID to update",
+                    },
+                    "name": {"type": "string", "description": "Customer name"},
+                    "email": {"type": "string", "description": "Email address"},
+                    "phone": {"type": "string", "description": "Phone number"},
+                    "address": {"type": "string", "description": "Customer address"},
+                    "town": {"type": "string", "description": "City/Town"},
+                    "zip": {"type": "string", "description": "Postal code"},
+                    "status": {
+                        "type": "integer",
+                        "description": "Status (1=Active, 0=Inactive)",
+                    },
+                },
+                "required": ["customer_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="update_customer",
+        map_arguments=_positional("customer_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="delete_customer",
+            description="Delete a customer",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "customer_id": {
+                        "type": "integer",
+                        "description": "Customer ID to delete",
+                    }
+                },
+                "required": ["customer_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="delete_customer",
+        map_arguments=_positional("customer_id"),
+    )
+)
+
+# Product Management CRUD
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_products",
+            description=(
+                "Get an unfiltered list of products from Dolibarr. "
+                "Intended for debugging or bulk inspection only. DO NOT use this tool to search by reference or label "
+                "(use search_products_by_ref or search_products_by_label instead)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of products to return (default: 100)",
+                        "default": 100,
+                    },
+                    "page": {
+                        "type": "integer",
+                        "description": "Page number for pagination (default: 1)",
+                        "default": 1,
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        method="get_products",
+        map_arguments=_keywords(limit=100, page=1),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_product_by_id",
+            description=(
+                "Get the details of exactly one product by numeric ID. "
+                "Use this only when you already know the internal Dolibarr product_id. "
+                "Do not pass reference or label here."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "product_id": {
+                        "type": "integer",
+                        "description": "Exact numeric Dolibarr product ID (not ref).",
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["product_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="get_product_by_id",
+        map_arguments=_positional("product_id"),
+        local_lookup=_mirrored("products", "product_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="create_product",
+            description="Create a new product",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "label": {"type": "string", "description": "Product name/label"},
+                    "price": {"type": "number", "description": "Product price"},
+                    "description": {"type": "string", "description": "Product description"},
+                    "unit": UNIT_PROPERTY,
+                    "stock": {
+                        "type": "integer",
+                        "description": "Initial stock quantity",
+                    },
+                },
+                "required": ["label", "price"],
+                "additionalProperties": False,
+            },
+        ),
+        method="create_product",
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="update_product",
+            description="Update an existing product",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "product_id": {
+                        "type": "integer",
+                        "description": "Product ID to update",
+                    },
+                    "label": {"type": "string", "description": "Product name/label"},
+                    "price": {"type": "number", "description": "Product price"},
+                    "description": {
+                        "type": "string",
+                        "description": "Product description",
+                    },
+                },
+                "required": ["product_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="update_product",
+        map_arguments=_positional("product_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="delete_product",
+            description="Delete a product",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "product_id": {
+                        "type": "integer",
+                        "description": "Product ID to delete",
+                    }
+                },
+                "required": ["product_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="delete_product",
+        map_arguments=_positional("product_id"),
+    )
+)
+
+# Invoice Management CRUD
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_invoices",
+            description=(
+                "Get a paginated list of invoices from Dolibarr, optionally filtered by status. "
+                "Use this only if you really need a list of many invoices (e.g. overviews, reports). "
+                "Do not use this as a search-by-customer or search-by-reference tool."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of invoices to return (default: 100)",
+                        "default": 100,
+                    },
+                    "page": {
+                        "type": "integer",
+                        "description": "Page number for pagination (default: 1)",
+                        "default": 1,
+                    },
+                    "status": {
+                        "type": "string",
+                        "description": "Invoice status filter (draft, unpaid, paid, etc.)",
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        method="get_invoices",
+        map_arguments=_keywords(limit=100, status=None, page=1),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_invoice_by_id",
+            description=(
+                "Get the details of exactly one invoice by numeric ID. "
+                "Use this only when you already know the internal Dolibarr invoice_id. "
+                "Do not pass invoice reference here."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "invoice_id": {
+                        "type": "integer",
+                        "description": "Exact numeric Dolibarr invoice ID.",
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["invoice_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="get_invoice_by_id",
+        map_arguments=_positional("invoice_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_invoice_details",
+            description=(
+                "Get one invoice by numeric ID together with its customer, its project and the product of every "
+                "line, in a single call. Prefer this over chaining get_invoice_by_id, get_customer_by_id, "
+                "get_product_by_id and get_project_by_id."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "invoice_id": {
+                        "type": "integer",
+                        "description": "Exact numeric Dolibarr invoice ID.",
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["invoice_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="get_invoice_details",
+        map_arguments=_positional("invoice_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="create_invoice",
+            description=(
+                "ALWAYS creates a new invoice. Do not use this tool to modify an existing invoice. "
+                "Before calling this, resolve the correct customer and product IDs using the appropriate search_* tools "
+                "(e.g. search_customers, search_products_by_ref, resolve_product_ref). "
+                "For lines: Use product_id for existing products whenever possible and set product_type=0 for goods "
+                "and product_type=1 for services. Use free-text lines only if no matching product exists in Dolibarr."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "customer_id": {
+                        "type": "integer",
+                        "description": "Customer ID (Dolibarr socid of the third party to invoice)",
+                    },
+                    "date": {
+                        "type": "string",
+                        "description": "Invoice date (YYYY-MM-DD)",
+                    },
+                    "due_date": {
+                        "type": "string",
+                        "description": "Due date (YYYY-MM-DD)",
+                    },
+                    "payment_terms": PAYMENT_TERMS_PROPERTY,
+                    "payment_type": PAYMENT_TYPE_PROPERTY,
+                    "currency": {
+                        "type": "string",
+                        "description": "Invoice currency ISO code, e.g. \"USD\" (needs the multicurrency module)",
+                    },
+                    "lines": {
+                        "type": "array",
+                        "description": "Invoice lines",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "desc": {
+                                    "type": "string",
+                                    "description": "Line description",
+                                },
+                                "qty": {"type": "number", "description": "Quantity"},
+                                "subprice": {
+                                    "type": "number",
+                                    "description": "Unit price",
+                                },
+                                "total_ht": {
+                                    "type": "number",
+                                    "description": "Total excluding tax",
+                                },
+                                "total_ttc": {
+                                    "type": "number",
+                                    "description": "Total including tax",
+                                },
+                                "vat": {"type": "number", "description": "VAT rate"},
+                                "product_id": {
+                                    "type": "integer",
+                                    "description": "Product ID to link (optional)",
+                                },
+                                "product_type": {
+                                    "type": "integer",
+                                    "description": "Type of line (0=Product, 1=Service)",
+                                },
+                                "unit": UNIT_PROPERTY,
+                            },
+                            "required": ["desc", "qty", "subprice"],
+                            "additionalProperties": False,
+                        },
+                    },
+                },
+                "required": ["customer_id", "lines"],
+                "additionalProperties": False,
+            },
+        ),
+        method="create_invoice",
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="update_invoice",
+            description="Update an existing invoice",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "invoice_id": {
+                        "type": "integer",
+                        "description": "Invoice ID to update",
+                    },
+                    "date": {
+                        "type": "string",
+                        "description": "Invoice date (YYYY-MM-DD)",
+                    },
+                    "due_date": {
+                        "type": "string",
+                        "description": "Due date (YYYY-MM-DD)",
+                    },
+                },
+                "required": ["invoice_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="update_invoice",
+        map_arguments=_positional("invoice_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="delete_invoice",
+            description="Delete an invoice",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "invoice_id": {
+                        "type": "integer",
+                        "description": "Invoice ID to delete",
+                    }
+                },
+                "required": ["invoice_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="delete_invoice",
+        map_arguments=_positional("invoice_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="create_invoice_draft",
+            description=(
+                "Create a new invoice draft (header only). "
+                "Use this to start a new invoice, then use add_invoice_line to add items. "
+                "Returns the new invoice_id."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "customer_id": {
+                        "type": "integer",
+                        "description": "Customer ID (Dolibarr socid)",
+                    },
+                    "date": {
+                        "type": "string",
+                        "description": "Invoice date (YYYY-MM-DD)",
+                    },
+                    "project_id": {
+                        "type": "integer",
+                        "description": "Linked project ID (optional)",
+                    },
+                },
+                "required": ["customer_id", "date"],
+                "additionalProperties": False,
+            },
+        ),
+        method="create_invoice",
+        map_arguments=_invoice_draft_arguments,
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="add_invoice_line",
+            description="Add a line item to an existing draft invoice.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "invoice_id": {
+                        "type": "integer",
+                        "description": "Invoice ID",
+                    },
+                    "desc": {
+                        "type": "string",
+                        "description": "Line description",
+                    },
+                    "qty": {
+                        "type": "number",
+                        "description": "Quantity",
+                    },
+                    "subprice": {
+                        "type": "number",
+                        "description": "Unit price (net)",
+                    },
+                    "product_id": {
+                        "type": "integer",
+                        "description": "Product ID (optional)",
+                    },
+                    "product_type": {
+                        "type": "integer",
+                        "description": "Type (0=Product, 1=Service)",
+                        "default": 0,
+                    },
+                    "vat": {
+                        "type": "number",
+                        "description": "VAT rate (optional)",
+                    },
+                },
+                "required": ["invoice_id", "desc", "qty", "subprice"],
+                "additionalProperties": False,
+            },
+        ),
+        method="add_invoice_line",
+        map_arguments=_positional("invoice_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="add_invoice_lines",
+            description=(
+                "Add many line items to an existing draft invoice in one call. Lines are validated first, then "
+                "inserted concurrently in the given order; the result reports each line's outcome. "
+                "When creating a new invoice, pass the lines to create_invoice instead."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "invoice_id": {
+                        "type": "integer",
+                        "description": "Invoice ID",
+                    },
+                    "lines": {
+                        "type": "array",
+                        "description": "Lines to add, in display order",
+                        "minItems": 1,
+                        "maxItems": INVOICE_LINES_MAX,
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "desc": {"type": "string", "description": "Line description"},
+                                "qty": {"type": "number", "description": "Quantity"},
+                                "subprice": {"type": "number", "description": "Unit price (net)"},
+                                "product_id": {"type": "integer", "description": "Product ID (optional)"},
+                                "product_type": {
+                                    "type": "integer",
+                                    "description": "Type (0=Product, 1=Service)",
+                                },
+                                "vat": {"type": "number", "description": "VAT rate (optional)"},
+                            },
+                            "required": ["qty", "subprice"],
+                            "additionalProperties": False,
+                        },
+                    },
+                },
+                "required": ["invoice_id", "lines"],
+                "additionalProperties": False,
+            },
+        ),
+        method="add_invoice_lines",
+        map_arguments=_positional("invoice_id", "lines"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="update_invoice_line",
+            description="Update an existing line in a draft invoice.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "invoice_id": {
+                        "type": "integer",
+                        "description": "Invoice ID",
+                    },
+                    "line_id": {
+                        "type": "integer",
+                        "description": "Line ID to update",
+                    },
+                    "desc": {
+                        "type": "string",
+                        "description": "New description",
+                    },
+                    "qty": {
+                        "type": "number",
+                        "description": "New quantity",
+                    },
+                    "subprice": {
+                        "type": "number",
+                        "description": "New unit price",
+                    },
+                    "vat": {
+                        "type": "number",
+                        "description": "New VAT rate",
+                    },
+                },
+                "required": ["invoice_id", "line_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="update_invoice_line",
+        map_arguments=_positional("invoice_id", "line_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="delete_invoice_line",
+            description="Delete a line from a draft invoice.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "invoice_id": {
+                        "type": "integer",
+                        "description": "Invoice ID",
+                    },
+                    "line_id": {
+                        "type": "integer",
+                        "description": "Line ID to delete",
+                    },
+                },
+                "required": ["invoice_id", "line_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="delete_invoice_line",
+        map_arguments=_positional("invoice_id", "line_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="set_invoice_project",
+            description="Link an invoice to a project.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "invoice_id": {
+                        "type": "integer",
+                        "description": "Invoice ID",
+                    },
+                    "project_id": {
+                        "type": "integer",
+                        "description": "Project ID",
+                    },
+                },
+                "required": ["invoice_id", "project_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="update_invoice",
+        map_arguments=_invoice_project_arguments,
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="validate_invoice",
+            description="Validate a draft invoice (change status to unpaid).",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "invoice_id": {
+                        "type": "integer",
+                        "description": "Invoice ID",
+                    },
+                    "warehouse_id": {
+                        "type": "integer",
+                        "description": "Warehouse ID for stock decrease (optional)",
+                        "default": 0,
+                    },
+                },
+                "required": ["invoice_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="validate_invoice",
+        map_arguments=_positional("invoice_id"),
+    )
+)
+
+# Order Management CRUD
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_orders",
+            description=(
+                "Get a paginated list of orders from Dolibarr, optionally filtered by status. "
+                "Use this for overviews or reporting. Not suitable for searching specific orders by customer, project "
+                "or reference (there is no server-side search here)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of orders to return (default: 100)",
+                        "default": 100,
+                    },
+                    "page": {
+                        "type": "integer",
+                        "description": "Page number for pagination (default: 1)",
+                        "default": 1,
+                    },
+                    "status": {
+                        "type": "string",
+                        "description": "Order status filter",
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        method="get_orders",
+        map_arguments=_keywords(limit=100, status=None, page=1),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_order_by_id",
+            description=(
+                "Get the details of exactly one order by numeric ID. "
+                "Use this only when you already know the internal Dolibarr order_id. "
+                "Do not pass order reference here."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "order_id": {
+                        "type": "integer",
+                        "description": "Exact numeric Dolibarr order ID.",
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["order_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="get_order_by_id",
+        map_arguments=_positional("order_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="create_order",
+            description=(
+                "Create a new customer order. Use this only when you have already resolved the correct customer "
+                "ID (socid) using search_customers or related tools. This tool does not update existing orders."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "customer_id": {
+                        "type": "integer",
+                        "description": "Customer ID (socid)",
+                    },
+                    "date": {
+                        "type": "string",
+                        "description": "Order date (YYYY-MM-DD)",
+                    },
+                },
+                "required": ["customer_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="create_order",
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="update_order",
+            description="Update an existing order",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "order_id": {
+                        "type": "integer",
+                        "description": "Order ID to update",
+                    },
+                    "date": {
+                        "type": "string",
+                        "description": "Order date (YYYY-MM-DD)",
+                    },
+                },
+                "required": ["order_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="update_order",
+        map_arguments=_positional("order_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="delete_order",
+            description="Delete an order",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "order_id": {
+                        "type": "integer",
+                        "description": "Order ID to delete",
+                    }
+                },
+                "required": ["order_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="delete_order",
+        map_arguments=_positional("order_id"),
+    )
+)
+
+# Contact Management CRUD
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_contacts",
+            description=(
+                "Get a paginated list of contacts from Dolibarr. "
+                "Use this only if you need a generic list of contacts. "
+                "Do not treat this as a name search; if you need search-by-name, a dedicated search tool should be used."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of contacts to return (default: 100)",
+                        "default": 100,
+                    },
+                    "page": {
+                        "type": "integer",
+                        "description": "Page number for pagination (default: 1)",
+                        "default": 1,
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        method="get_contacts",
+        map_arguments=_keywords(limit=100, page=1),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_contact_by_id",
+            description=(
+                "Get the details of exactly one contact by numeric ID. "
+                "Use this only when you already know the internal Dolibarr contact_id. "
+                "Do not pass name or email here."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "contact_id": {
+                        "type": "integer",
+                        "description": "Exact numeric Dolibarr contact ID.",
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["contact_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="get_contact_by_id",
+        map_arguments=_positional("contact_id"),
+        local_lookup=_mirrored("contacts", "contact_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="create_contact",
+            description="Create a new contact",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "firstname": {"type": "string", "description": "First name"},
+                    "lastname": {"type": "string", "description": "Last name"},
+                    "email": {"type": "string", "description": "Email address"},
+                    "phone": {"type": "string", "description": "Phone number"},
+                    "socid": {
+                        "type": "integer",
+                        "description": "Associated company ID (thirdparty socid)",
+                    },
+                },
+                "required": ["firstname", "lastname"],
+                "additionalProperties": False,
+            },
+        ),
+        method="create_contact",
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="update_contact",
+            description="Update an existing contact",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "contact_id": {
+                        "type": "integer",
+                        "description": "Contact ID to update",
+                    },
+                    "firstname": {"type": "string", "description": "First name"},
+                    "lastname": {"type": "string", "description": "Last name"},
+                    "email": {"type": "string", "description": "Email address"},
+                    "phone": {"type": "string", "description": "Phone number"},
+                },
+                "required": ["contact_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="update_contact",
+        map_arguments=_positional("contact_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="delete_contact",
+            description="Delete a contact",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "contact_id": {
+                        "type": "integer",
+                        "description": "Contact ID to delete",
+                    }
+                },
+                "required": ["contact_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="delete_contact",
+        map_arguments=_positional("contact_id"),
+    )
+)
+
+# Project Management CRUD
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_projects",
+            description=(
+                "Get a paginated list of projects from Dolibarr, optionally filtered by status. "
+                "Use this for overviews or when you need to iterate through project pages. "
+                "Do not use this to search for a project by name or reference (use search_projects instead)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of projects to return (default: 100)",
+                        "default": 100,
+                    },
+                    "page": {
+                        "type": "integer",
+                        "description": "Page number for pagination (default: 1)",
+                        "default": 1,
+                    },
+                    "status": {
+                        "type": "integer",
+                        "description": "Project status filter (e.g. 0=draft, 1=open, 2=closed)",
+                        "default": 1,
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        method="get_projects",
+        map_arguments=_keywords(limit=100, page=1, status=None),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_project_by_id",
+            description=(
+                "Get the details of exactly one project by numeric ID. "
+                "Use this only when you already know the internal Dolibarr project_id. "
+                "Do not pass project reference here."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "project_id": {
+                        "type": "integer",
+                        "description": "Exact numeric Dolibarr project ID.",
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["project_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="get_project_by_id",
+        map_arguments=_positional("project_id"),
+        local_lookup=_mirrored("projects", "project_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="search_projects",
+            description=(
+                "Search projects by reference or title. Use this when you have a partial or full project ref/title "
+                "and need to find matching projects without loading full project lists."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "Search term for project ref or title",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of results",
+                        "default": 20,
+                    },
+                    "fields": FIELDS_PROPERTY,
+                },
+                "required": ["query"],
+                "additionalProperties": False,
+            },
+        ),
+        method="search_projects",
+        map_arguments=_search_projects_arguments,
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="create_project",
+            description="Create a new project",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "ref": {
+                        "type": "string",
+                        "description": "Project reference (optional, if Dolibarr auto-generates)",
+                    },
+                    "title": {"type": "string", "description": "Project title"},
+                    "description": {
+                        "type": "string",
+                        "description": "Project description",
+                    },
+                    "socid": {
+                        "type": "integer",
+                        "description": "Linked customer ID (thirdparty)",
+                    },
+                    "status": {
+                        "type": "integer",
+                        "description": "Project status (e.g. 1=open)",
+                        "default": 1,
+                    },
+                },
+                "required": ["title"],
+                "additionalProperties": False,
+            },
+        ),
+        method="create_project",
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="update_project",
+            description="Update an existing project",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "project_id": {
+                        "type": "integer",
+                        "description": "Project ID to update",
+                    },
+                    "title": {"type": "string", "description": "Project title"},
+                    "description": {
+                        "type": "string",
+                        "description": "Project description",
+                    },
+                    "status": {
+                        "type": "integer",
+                        "description": "Project status",
+                    },
+                },
+                "required": ["project_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="update_project",
+        map_arguments=_positional("project_id"),
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="delete_project",
+            description="Delete a project",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "project_id": {
+                        "type": "integer",
+                        "description": "Project ID to delete",
+                    }
+                },
+                "required": ["project_id"],
+                "additionalProperties": False,
+            },
+        ),
+        method="delete_project",
+        map_arguments=_positional("project_id"),
+    )
+)
+
+# Reports
+
+REPORT_LIMIT_PROPERTY: Dict[str, Any] = {
+    "type": "integer",
+    "description": "Maximum number of rows returned (largest first)",
+    "default": 20,
+    "minimum": 1,
+}
+
+AS_OF_PROPERTY: Dict[str, Any] = {
+    "type": "string",
+    "description": "Reference date for days overdue (YYYY-MM-DD, default today)",
+}
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_receivables_aging",
+            description=(
+                "Outstanding amounts of unpaid customer invoices in aging buckets (current, 1-30, 31-60, "
+                "61-90, 90+ days past due), computed on the server. Use this instead of listing invoices "
+                "for questions about unpaid or overdue totals."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "as_of": AS_OF_PROPERTY,
+                    "by_customer": {
+                        "type": "boolean",
+                        "description": "Also break the buckets down per customer",
+                        "default": False,
+                    },
+                    "limit": REPORT_LIMIT_PROPERTY,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        method="report_receivables_aging",
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_top_debtors",
+            description="Customers with the largest outstanding amounts on unpaid invoices, with days overdue.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "limit": {**REPORT_LIMIT_PROPERTY, "default": 10},
+                    "as_of": AS_OF_PROPERTY,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        method="report_top_debtors",
+    )
+)
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="get_revenue_report",
+            description=(
+                "Revenue of validated customer invoices grouped by customer, product or month, optionally "
+                "limited to an invoice date range. Computed on the server in one pass over the invoices."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "group_by": {
+                        "type": "string",
+                        "enum": ["customer", "product", "month"],
+                        "default": "month",
+                    },
+                    "date_from": {"type": "string", "description": "First invoice date included (YYYY-MM-DD)"},
+                    "date_to": {"type": "string", "description": "Last invoice date included (YYYY-MM-DD)"},
+                    "limit": REPORT_LIMIT_PROPERTY,
+                },
+                "additionalProperties": False,
+            },
+        ),
+        method="report_revenue",
+    )
+)
+
+# Raw API Access
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="dolibarr_raw_api",
+            description=(
+                "Low-level escape hatch to call any Dolibarr REST endpoint directly. "
+                "Use this ONLY if there is no dedicated high-level tool available for your use case. "
+                "You must pass a valid Dolibarr API path and parameters yourself; the server does not validate them. "
+                "Incorrect usage can cause errors or side effects (such as creating or deleting unexpected data)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "method": {
+                        "type": "string",
+                        "description": "HTTP method",
+                        "enum": ["GET", "POST", "PUT", "DELETE"],
+                    },
+                    "endpoint": {
+                        "type": "string",
+                        "description": "Dolibarr API endpoint path (e.g. '/thirdparties', '/invoices/123'). Must be a valid existing endpoint.",
+                    },
+                    "params": {
+                        "type": "object",
+                        "description": "Query parameters",
+                    },
+                    "data": {
+                        "type": "object",
+                        "description": "Request payload for POST/PUT requests",
+                    },
+                },
+                "required": ["method", "endpoint"],
+                "additionalProperties": False,
+            },
+        ),
+        method="dolibarr_raw_api",
+    )
+)
+
+# Batch
+
+BATCH_MAX_OPERATIONS = 100
+
+
+def _batch_error(exc: Exception) -> Dict[str, Any]:
+    """Describe a failed batch operation like a failed tool call."""
+    if isinstance(exc, DolibarrAPIError):
+        return exc.response_data or {
+            "error": "Dolibarr API Error",
+            "status": exc.status_code or 500,
+            "message": str(exc),
+        }
+    return {"error": "Tool execution failed", "message": str(exc)}
+
+
+async def _run_batch(client: Any, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Run independent tool calls concurrently and return their results in order."""
+    operations = arguments.get("operations") or []
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise ValueError(f"A batch accepts at most {BATCH_MAX_OPERATIONS} operations")
+    limit = arguments.get("max_concurrency") or client.batch_max_concurrency
+    semaphore = asyncio.Semaphore(max(1, min(limit, client.batch_max_concurrency)))
+
+    async def run(index: int, operation: Dict[str, Any]) -> Dict[str, Any]:
+        name = operation.get("tool")
+        item: Dict[str, Any] = {"index": index, "tool": name}
+        spec = get_tool(name) if name != "batch" else None
+        if spec is None:
+            item.update(ok=False, error={"error": f"Unknown tool: {name}"})
+            return item
+        try:
+            async with semaphore:
+                result = await spec.invoke(client, operation.get("arguments") or {})
+        except Exception as exc:  # pylint: disable=broad-except
+            item.update(ok=False, error=_batch_error(exc))
+        else:
+            item.update(ok=True, result=result)
+        return item
+
+    results = await asyncio.gather(*(run(index, operation) for index, operation in enumerate(operations)))
+    failed = sum(1 for item in results if not item["ok"])
+    return {"count": len(results), "succeeded": len(results) - failed, "failed": failed, "results": results}
+
+
+register_tool(
+    ToolSpec(
+        tool=Tool(
+            name="batch",
+            description=(
+                "Run up to 100 independent tool calls concurrently in one request, e.g. looking up every "
+                "product of a quote. Results are returned in the order of the operations, each with its "
+                "own 'ok' flag and either 'result' or 'error'; one failing operation does not stop the others. "
+                "Do not batch operations that depend on each other's results."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "operations": {
+                        "type": "array",
+                        "description": "Tool calls to run",
+                        "maxItems": BATCH_MAX_OPERATIONS,
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "tool": {"type": "string", "description": "Name of the tool to call"},
+                                "arguments": {"type": "object", "description": "Arguments for the tool"},
+                            },
+                            "required": ["tool"],
+                            "additionalProperties": False,
+                        },
+                    },
+                    "max_concurrency": {
+                        "type": "integer",
+                        "description": "Maximum operations in flight at once (capped by the server setting)",
+                        "minimum": 1,
+                    },
+                },
+                "required": ["operations"],
+                "additionalProperties": False,
+            },
+        ),
+        handler=_run_batch,
+    )
+)
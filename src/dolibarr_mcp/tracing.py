@@ -0,0 +1,291 @@
+"""Lightweight span tracing of tool calls, exported as JSON lines.
+
+Each tool call starts a trace whose ID is the correlation ID reported in error
+payloads. Sampled traces record nested spans (client acquisition, payload
+validation, Dolibarr requests, HTTP attempts, decoding, output serialization)
+and are appended to a local file once the root span ends, either as flat span
+records or as OTLP/JSON ``resourceSpans`` documents. Unsampled calls only pay
+for a context variable lookup per span.
+"""
+
+import functools
+import inspect
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+from uuid import uuid4
+
+from . import codec
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Export formats accepted by ``Tracer``.
+TRACE_FORMATS = ("jsonl", "otlp")
+
+
+class Span:
+    """One timed operation inside a trace."""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+
+    def set(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the span as a flat JSON-lines record."""
+        record = {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+        }
+        if self.error is not None:
+            record["error"] = self.error
+        return record
+
+    def as_otlp(self) -> Dict[str, Any]:
+        """Return the span in the OTLP/JSON span encoding."""
+        span = {
+            "traceId": self.trace.trace_id.replace("-", ""),
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error is not None else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Stand-in yielded when the current call is not sampled."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Spans recorded for one tool call."""
+
+    __slots__ = ("trace_id", "sampled", "spans")
+
+    def __init__(self, trace_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans: List[Span] = []
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("dolibarr_mcp_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("dolibarr_mcp_span", default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    """Return the ID (correlation ID) of the trace of the running tool call."""
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+def current_span() -> Any:
+    """Return the innermost recording span, or a no-op span."""
+    return _current_span.get() or NOOP_SPAN
+
+
+class Tracer:
+    """Samples tool calls and appends their finished spans to ``path``."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        sample_rate: float = 1.0,
+        fmt: str = "jsonl",
+        service_name: str = "dolibarr-mcp",
+        rng: Callable[[], float] = random.random,
+    ):
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format '{fmt}', expected one of {TRACE_FORMATS}")
+        self.path = path
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.fmt = fmt
+        self.service_name = service_name
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8") if path else None  # pylint: disable=consider-using-with
+        self.exported = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._file is not None and self.sample_rate > 0
+
+    @contextmanager
+    def trace(self, name: str, trace_id: Optional[str] = None, **attributes: Any) -> Iterator[Any]:
+        """Start the trace of a tool call; its ID doubles as the correlation ID."""
+        sampled = self.enabled and (self.sample_rate >= 1.0 or self._rng() < self.sample_rate)
+        trace = Trace(trace_id or str(uuid4()), sampled)
+        trace_token = _current_trace.set(trace)
+        try:
+            if not sampled:
+                yield NOOP_SPAN
+                return
+            try:
+                with self._record(trace, name, None, attributes) as span:
+                    yield span
+            finally:
+                self._export(trace)
+        finally:
+            _current_trace.reset(trace_token)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """Record a child span of the current span when the call is sampled."""
+        parent = _current_span.get()
+        if parent is None:
+            yield NOOP_SPAN
+            return
+        with self._record(parent.trace, name, parent.span_id, attributes) as span:
+            yield span
+
+    @contextmanager
+    def _record(self, trace: Trace, name: str, parent_id: Optional[str], attributes: Dict[str, Any]) -> Iterator[Span]:
+        span = Span(trace, name, parent_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            trace.spans.append(span)
+            _current_span.reset(token)
+
+    def _export(self, trace: Trace) -> None:
+        if self.fmt == "otlp":
+            document = {
+                "resourceSpans": [
+                    {
+                        "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                        "scopeSpans": [
+                            {"scope": {"name": "dolibarr_mcp"}, "spans": [span.as_otlp() for span in trace.spans]}
+                        ],
+                    }
+                ]
+            }
+            payload = codec.dumps(document) + "\n"
+        else:
+            payload = "".join(codec.dumps(span.as_dict()) + "\n" for span in trace.spans)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(payload)
+            self._file.flush()
+            self.exported += 1
+
+    def close(self) -> None:
+        """Close the export file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def record_span(name: str, elapsed: float, **attributes: Any) -> None:
+    """Record a finished child span that started ``elapsed`` seconds ago."""
+    parent = _current_span.get()
+    if parent is None:
+        return
+    span = Span(parent.trace, name, parent.span_id, attributes)
+    span.end_ns = span.start_ns
+    span.start_ns -= int(elapsed * 1e9)
+    parent.trace.spans.append(span)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorate a function or coroutine function so each call records a span."""
+
+    def decorate(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with get_tracer().span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with get_tracer().span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer; it exports nothing until configured."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def configure_tracing(config: Any) -> Tracer:
+    """Replace the process-wide tracer with one built from ``config``."""
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+    _tracer = Tracer(
+        path=getattr(config, "trace_path", None),
+        sample_rate=getattr(config, "trace_sample_rate", 1.0),
+        fmt=getattr(config, "trace_format", "jsonl"),
+    )
+    return _tracer
@@ -0,0 +1,187 @@
+"""Tests for the Dolibarr GET response cache and request coalescing."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from dolibarr_mcp.cache import ResponseCache, endpoint_family, written_families
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+
+
+class _Clock:
+    """Manually advanced clock for TTL tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_endpoint_family():
+    """Families are derived from the first path segment."""
+    assert endpoint_family("/invoices/3/lines") == "invoices"
+    assert endpoint_family("thirdparties") == "thirdparties"
+    assert endpoint_family("users?limit=1") == "users"
+    assert written_families("/thirdparties/3/contacts?x=1") == {"thirdparties", "contacts"}
+
+
+def test_entries_expire_after_family_ttl():
+    """Entries are served until their family TTL elapses."""
+    clock = _Clock()
+    cache = ResponseCache(ttls={"products": 10}, clock=clock)
+    key = cache.make_key("products/1")
+
+    assert cache.set(key, "products", {"id": 1}, size=10)
+    assert cache.get(key) == (True, {"id": 1})
+
+    clock.now = 11
+    assert cache.get(key) == (False, None)
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_uncached_family_is_not_stored():
+    """Families without a TTL bypass the cache."""
+    cache = ResponseCache()
+
+    assert cache.set(cache.make_key("status"), "status", {"success": 1}, size=5) is False
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    """The least recently used entries are evicted when a bound is exceeded."""
+    cache = ResponseCache(max_entries=2, max_bytes=100)
+    first, second, third = (cache.make_key(f"products/{i}") for i in range(3))
+
+    cache.set(first, "products", "a", size=10)
+    cache.set(second, "products", "b", size=10)
+    cache.get(first)
+    cache.set(third, "products", "c", size=10)
+
+    assert cache.get(second) == (False, None)
+    assert cache.get(first)[0] is True
+    assert cache.stats.evictions == 1
+
+    cache.set(cache.make_key("products/big"), "products", "d", size=95)
+    assert len(cache) == 1
+    assert cache.size_bytes == 95
+
+
+def test_invalidate_family_only_drops_that_family():
+    """Invalidation is scoped to one endpoint family."""
+    cache = ResponseCache()
+    cache.set(cache.make_key("products/1"), "products", "p", size=1)
+    cache.set(cache.make_key("products", {"limit": 10}), "products", ["p"], size=1)
+    cache.set(cache.make_key("thirdparties/1"), "thirdparties", "t", size=1)
+
+    assert cache.invalidate_family("products") == 2
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_client_caches_gets_and_invalidates_on_write(mock_request):
+    """Repeated GETs hit the cache until a write to the same family succeeds."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.read.return_value = b'{"id": 7, "name": "Acme"}'
+    mock_request.return_value.__aenter__.return_value = mock_response
+
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+
+    async with DolibarrClient(config) as client:
+        assert (await client.get_customer_by_id(7))["name"] == "Acme"
+        assert (await client.get_customer_by_id(7))["name"] == "Acme"
+        assert mock_request.call_count == 1
+
+        await client.update_customer(7, name="Acme 2")
+        await client.get_customer_by_id(7)
+        assert mock_request.call_count == 3
+        assert client.cache.stats.hits == 1
+
+        # A write to a sub-resource also drops cached listings of that resource.
+        await client.get_contacts()
+        await client.request("POST", "thirdparties/7/contacts", data={"lastname": "Doe"})
+        await client.get_contacts()
+        assert mock_request.call_count == 6
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_cache_can_be_disabled(mock_request):
+    """With caching disabled every GET reaches Dolibarr."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.read.return_value = b'{"id": 7}'
+    mock_request.return_value.__aenter__.return_value = mock_response
+
+    config = Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+        cache_enabled=False,
+    )
+
+    async with DolibarrClient(config) as client:
+        await client.get_product_by_id(7)
+        await client.get_product_by_id(7)
+
+    assert client.cache is None
+    assert mock_request.call_count == 2
+
+
+def _slow_response(body: str, status: int = 200):
+    """Build a mocked response whose body arrives after a short delay."""
+
+    async def read():
+        await asyncio.sleep(0.01)
+        return body.encode()
+
+    mock_response = AsyncMock()
+    mock_response.status = status
+    mock_response.reason = "Error"
+    mock_response.read.side_effect = read
+    return mock_response
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_identical_concurrent_gets_are_coalesced(mock_request):
+    """Concurrent identical GETs share one Dolibarr round-trip."""
+    mock_request.return_value.__aenter__.return_value = _slow_response('{"id": 3, "ref": "FA-3"}')
+    config = Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+        cache_enabled=False,
+    )
+
+    async with DolibarrClient(config) as client:
+        results = await asyncio.gather(*(client.get_invoice_by_id(3) for _ in range(5)))
+        assert all(result["ref"] == "FA-3" for result in results)
+        assert mock_request.call_count == 1
+        assert client.coalesced_requests == 4
+
+        await client.get_invoice_by_id(3)
+        assert mock_request.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_coalesced_callers_share_errors(mock_request):
+    """Every waiting caller receives the error of the shared request."""
+    mock_request.return_value.__aenter__.return_value = _slow_response('{"error": "Not found"}', status=404)
+    config = Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+    )
+
+    async with DolibarrClient(config) as client:
+        results = await asyncio.gather(
+            *(client.get_invoice_by_id(9) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    assert mock_request.call_count == 1
+    assert all(isinstance(result, DolibarrAPIError) and result.status_code == 404 for result in results)
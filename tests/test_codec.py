@@ -0,0 +1,49 @@
+"""Tests for the JSON codec shared by the client and the server."""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from dolibarr_mcp import codec
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+
+
+def test_loads_accepts_bytes_and_text():
+    """Bodies are parsed straight from bytes; text still works."""
+    assert codec.loads(b'{"ref": "FA\\u00e9", "lines": [1, 2]}') == {"ref": "FAé", "lines": [1, 2]}
+    assert codec.loads('[{"id": 1}]') == [{"id": 1}]
+
+
+def test_loads_raises_decode_error_for_invalid_json():
+    """Malformed documents raise the stdlib-compatible error type."""
+    with pytest.raises(codec.JSONDecodeError):
+        codec.loads(b"<html>")
+
+
+def test_dumps_is_compact_and_keeps_unicode():
+    """Output has no whitespace, keeps non-ASCII text and matches the stdlib semantics."""
+    value = {"name": "Müller GmbH", "total": 12.5, "ids": [1, 2], 3: None, "huge": 2 ** 70}
+
+    text = codec.dumps(value)
+
+    assert " " not in text.replace("Müller GmbH", "")
+    assert "Müller" in text
+    assert json.loads(text) == {"name": "Müller GmbH", "total": 12.5, "ids": [1, 2], "3": None, "huge": 2 ** 70}
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_client_keeps_non_json_bodies_as_raw_response(mock_request):
+    """Bodies that are not JSON are surfaced as text instead of failing the call."""
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.read.return_value = "Vérifié".encode("utf-8")
+    mock_request.return_value.__aenter__.return_value = mock_response
+
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+    async with DolibarrClient(config) as client:
+        result = await client.request("GET", "setup/company")
+
+    assert result == {"raw_response": "Vérifié"}
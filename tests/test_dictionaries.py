@@ -0,0 +1,108 @@
+"""Tests for the setup dictionary cache."""
+
+import asyncio
+
+import pytest
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dictionaries import DictionaryCache
+from dolibarr_mcp.dolibarr_client import DolibarrClient, DolibarrValidationError
+
+DICTIONARIES = {
+    "setup/dictionary/countries": [
+        {"id": "1", "code": "FR", "code_iso": "FRA", "label": "France"},
+        {"id": "5", "code": "DE", "code_iso": "DEU", "label": "Germany"},
+    ],
+    "setup/dictionary/payment_terms": [{"id": "2", "code": "30D", "label": "30 days"}],
+    "setup/dictionary/payment_types": [{"id": "4", "code": "VIR", "label": "Transfer"}],
+    "setup/dictionary/units": [{"rowid": "9", "code": "H", "short_label": "h", "label": "Hour"}],
+    "setup/dictionary/currencies": [{"code_iso": "USD", "label": "US Dollar"}],
+}
+
+
+class FakeClient:
+    def __init__(self):
+        self.loads = []
+
+    async def iter_list(self, endpoint, page_size=100, read_ahead=0, params=None):
+        self.loads.append(endpoint)
+        await asyncio.sleep(0)
+        for entry in DICTIONARIES[endpoint]:
+            yield entry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_lookups_by_id_code_and_label_load_once():
+    """Concurrent first lookups share one load; IDs, codes and labels match case-insensitively."""
+    client = FakeClient()
+    cache = DictionaryCache(client)
+
+    found = await asyncio.gather(
+        cache.lookup("countries", "de"),
+        cache.lookup("countries", "Germany"),
+        cache.lookup("countries", 5),
+        cache.lookup("countries", "deu"),
+    )
+
+    assert {entry["id"] for entry in found} == {"5"}
+    assert client.loads == ["setup/dictionary/countries"]
+    assert await cache.resolve("units", "hour") == "9"
+    assert await cache.resolve("currencies", "usd") == "USD"
+    assert await cache.resolve("countries", "Atlantis") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_dictionary_is_served_while_reloading():
+    """After the TTL the old entries answer immediately and a background reload follows."""
+    client = FakeClient()
+    clock = Clock()
+    cache = DictionaryCache(client, ttl=100, clock=clock)
+    await cache.get("units")
+
+    clock.now = 150
+    assert (await cache.lookup("units", "H"))["rowid"] == "9"
+    await asyncio.sleep(0.01)
+
+    assert client.loads == ["setup/dictionary/units", "setup/dictionary/units"]
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_create_calls_resolve_human_readable_values():
+    """create_customer and create_invoice send dictionary IDs and reject unknown values up front."""
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+    client = DolibarrClient(config)
+    sent = []
+
+    async def fake_request(method, endpoint, params=None, data=None, use_cache=True):
+        if method == "GET":
+            return DICTIONARIES[endpoint] if params["page"] == 0 else []
+        sent.append((endpoint, data))
+        return 42
+
+    client._make_request = fake_request
+
+    await client.create_customer(name="Acme", country="Germany", payment_terms="30D")
+    await client.create_invoice(
+        customer_id=1,
+        payment_type="transfer",
+        lines=[{"desc": "Consulting", "qty": 2, "subprice": 90, "unit": "h"}],
+    )
+
+    assert sent[0][1]["country_id"] == "5" and sent[0][1]["cond_reglement_id"] == "2"
+    assert "country" not in sent[0][1]
+    assert sent[1][1]["mode_reglement_id"] == "4"
+    assert sent[1][1]["lines"][0]["fk_unit"] == "9"
+
+    with pytest.raises(DolibarrValidationError) as excinfo:
+        await client.create_invoice(customer_id=1, lines=[{"desc": "x", "qty": 1, "subprice": 1, "unit": "parsec"}])
+    assert excinfo.value.response_data["invalid_fields"][0]["field"] == "lines[0].unit"
+    assert len(sent) == 2
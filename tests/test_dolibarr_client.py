@@ -52,6 +52,22 @@ class TestDolibarrClient:
         await client.close_session()
         assert client.session is None
     
+    @pytest.mark.asyncio
+    async def test_session_uses_pooled_connector(self):
+        """Sessions share a keep-alive connector tuned from the configuration."""
+        config = Config(
+            dolibarr_url="https://test.dolibarr.com/api/index.php",
+            api_key="test_key",
+            http_pool_limit=50,
+            http_pool_limit_per_host=8,
+        )
+
+        async with DolibarrClient(config) as client:
+            connector = client.session.connector
+            assert connector.limit == 50
+            assert connector.limit_per_host == 8
+            assert connector.use_dns_cache is True
+
     @pytest.mark.asyncio
     async def test_context_manager(self):
         """Test async context manager functionality."""
@@ -73,7 +89,7 @@ class TestDolibarrClient:
         # Mock response
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text.return_value = '{"success": {"code": 200, "dolibarr_version": "21.0.1"}}'
+        mock_response.read.return_value = b'{"success": {"code": 200, "dolibarr_version": "21.0.1"}}'
         mock_request.return_value.__aenter__.return_value = mock_response
         
         config = Config(
@@ -96,7 +112,7 @@ class TestDolibarrClient:
         mock_response = AsyncMock()
         mock_response.status = 404
         mock_response.reason = "Not Found"
-        mock_response.text.return_value = '{"error": "Object not found"}'
+        mock_response.read.return_value = b'{"error": "Object not found"}'
         mock_request.return_value.__aenter__.return_value = mock_response
         
         config = Config(
@@ -129,6 +145,22 @@ class TestDolibarrClient:
         assert exc_info.value.response_data["missing_fields"] == ["ref"]
         client.request.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_list_page_is_one_based(self):
+        """User page N requests Dolibarr's zero-based page N - 1; page 1 omits the parameter."""
+        config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+        client = DolibarrClient(config)
+        with patch.object(client, "request", new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = []
+            await client.get_products(limit=10, page=2)
+            assert mock_request.call_args[1]["params"] == {"limit": 10, "page": 1}
+            await client.get_invoices(limit=10, page=1)
+            assert mock_request.call_args[1]["params"] == {"limit": 10}
+            await client.get_projects(limit=10, page=1)
+            assert mock_request.call_args[1]["params"] == {"limit": 10}
+            await client.get_projects(limit=10, page=3, status=1)
+            assert mock_request.call_args[1]["params"] == {"limit": 10, "page": 2, "status": 1}
+
     @pytest.mark.asyncio
     async def test_autogen_ref_when_enabled(self):
         """Auto-generate refs when allowed by configuration."""
@@ -226,7 +258,8 @@ class TestDolibarrClient:
         mock_response = AsyncMock()
         mock_response.status = 500
         mock_response.reason = "Internal Server Error"
-        mock_response.text.return_value = '{"message": "Database unavailable"}'
+        mock_response.read.return_value = b'{"message": "Database unavailable"}'
+        mock_response.headers = {}
         mock_request.return_value.__aenter__.return_value = mock_response
 
         config = Config(
@@ -0,0 +1,98 @@
+"""Tests for the fake Dolibarr API used for load testing."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+from dolibarr_mcp.fake_dolibarr import FakeDolibarr, parse_sqlfilters
+from dolibarr_mcp.resilience import RetryBudget
+
+
+def test_sqlfilters_support_nesting_like_and_dates():
+    """Filters combine with AND/OR and parentheses; date literals compare against timestamps."""
+    records = [
+        {"ref": "PRD-000001", "status": "1", "date": 1_700_000_000},
+        {"ref": "PRD-000002", "status": "0", "date": 1_600_000_000},
+        {"ref": "SRV-000003", "status": "1", "date": 1_700_000_000},
+    ]
+    predicate = parse_sqlfilters(
+        "(t.ref:like:'PRD-%') AND ((t.fk_statut:=:1) OR (t.datef:<:'2021-01-01'))"
+    )
+    assert [record["ref"] for record in records if predicate(record)] == ["PRD-000001", "PRD-000002"]
+    assert not parse_sqlfilters("(t.ref:notlike:'%-00000_')")(records[0])
+    with pytest.raises(ValueError):
+        parse_sqlfilters("(t.ref:like:'PRD-%') AND")
+
+
+@pytest_asyncio.fixture
+async def fake_client():
+    """Serve a small seeded fake API and connect a client to it."""
+    fake = FakeDolibarr(seed=3, thirdparties=10, products=250, invoices=20, api_key="secret")
+    url = await fake.start()
+    config = Config(dolibarr_url=url, api_key="secret", cache_enabled=False)
+    try:
+        async with DolibarrClient(config) as client:
+            yield fake, client
+    finally:
+        await fake.close()
+
+
+@pytest.mark.asyncio
+async def test_status_is_served_where_the_client_asks(fake_client):
+    """get_status reaches the fake's own status payload, also with latency and errors injected."""
+    fake, client = fake_client
+    fake.latency = 0.001
+
+    status = await client.get_status()
+    assert status["success"]["dolibarr_version"] == "18.0.0"
+
+    fake.error_rate = 1.0
+    client.retry_budget = RetryBudget(ratio=0, min_per_second=0)
+    with pytest.raises(DolibarrAPIError) as excinfo:
+        await client.request("GET", "status")
+    assert excinfo.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_listing_pages_end_on_404_and_writes_are_served(fake_client):
+    """Paging reads every seeded record; created invoices take lines until validated."""
+    fake, client = fake_client
+
+    products = [product async for product in client.iter_products(page_size=100)]
+    assert len(products) == 250
+    assert len(await client.fetch_all("products", page_size=60)) == 250
+    assert len(await client.search_products("(t.ref:like:'PRD-0000%')", limit=500)) == 99
+
+    invoice_id = await client.create_invoice(socid=1, lines=[{"desc": "Setup", "qty": 2, "subprice": 50}])
+    invoice_id = invoice_id["id"] if isinstance(invoice_id, dict) else invoice_id
+    await client.add_invoice_line(invoice_id, desc="Support", qty=1, subprice=20)
+    invoice = await client.get_invoice_by_id(invoice_id)
+    assert float(invoice["total_ht"]) == 120.0
+    assert len(fake.invoice_lines(int(invoice_id))) == 2
+
+    await client.validate_invoice(invoice_id)
+    with pytest.raises(DolibarrAPIError) as excinfo:
+        await client.add_invoice_line(invoice_id, desc="Late", qty=1, subprice=1)
+    assert excinfo.value.status_code == 403
+
+
+@pytest.mark.asyncio
+@patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+async def test_injected_errors_and_api_key_check(mock_sleep, fake_client):
+    """Injected 503s are retried by the client; a wrong API key is rejected with 401."""
+    fake, client = fake_client
+    fake.error_rate = 1.0
+    with pytest.raises(DolibarrAPIError) as excinfo:
+        await client.get_product_by_id(1)
+    assert excinfo.value.status_code == 503
+    assert fake.injected_errors > 1
+
+    fake.error_rate = 0.0
+    client.api_key = "wrong"
+    client.session.headers["DOLAPIKEY"] = "wrong"
+    with pytest.raises(DolibarrAPIError) as excinfo:
+        await client.get_product_by_id(1)
+    assert excinfo.value.status_code == 401
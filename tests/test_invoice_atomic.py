@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 from dolibarr_mcp.config import Config
-from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient, DolibarrValidationError
 
 @pytest.mark.asyncio
 class TestInvoiceAtomic:
@@ -18,7 +18,7 @@ class TestInvoiceAtomic:
     async def test_add_invoice_line(self, mock_request, client):
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text.return_value = '123' # Returns line ID usually
+        mock_response.read.return_value = b'123' # Returns line ID usually
         mock_request.return_value.__aenter__.return_value = mock_response
 
         async with client:
@@ -45,7 +45,7 @@ class TestInvoiceAtomic:
     async def test_update_invoice_line(self, mock_request, client):
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text.return_value = '{"success": 1}'
+        mock_response.read.return_value = b'{"success": 1}'
         mock_request.return_value.__aenter__.return_value = mock_response
 
         async with client:
@@ -64,7 +64,7 @@ class TestInvoiceAtomic:
     async def test_delete_invoice_line(self, mock_request, client):
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text.return_value = '{"success": 1}'
+        mock_response.read.return_value = b'{"success": 1}'
         mock_request.return_value.__aenter__.return_value = mock_response
 
         async with client:
@@ -78,7 +78,7 @@ class TestInvoiceAtomic:
     async def test_validate_invoice(self, mock_request, client):
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text.return_value = '{"success": 1}'
+        mock_response.read.return_value = b'{"success": 1}'
         mock_request.return_value.__aenter__.return_value = mock_response
 
         async with client:
@@ -88,3 +88,40 @@ class TestInvoiceAtomic:
         assert args[0] == "POST"
         assert args[1] == "https://test.dolibarr.com/api/index.php/invoices/1/validate"
         assert kwargs['json'] == {"idwarehouse": 5, "not_trigger": 0}
+
+    async def test_add_invoice_lines_numbers_after_existing_lines(self, client):
+        posted = []
+
+        async def fake_request(method, endpoint, params=None, data=None):
+            if method == "GET":
+                return {"id": 1, "lines": [{"id": 40, "rang": "1"}, {"id": 41, "rang": "2"}]}
+            posted.append(data)
+            if data["desc"] == "broken":
+                raise DolibarrAPIError("Line rejected", status_code=400)
+            return 100 + data["rang"]
+
+        client.request = fake_request
+        result = await client.add_invoice_lines(
+            1,
+            [
+                {"desc": "A", "qty": 1, "subprice": 10, "product_id": 7},
+                {"desc": "broken", "qty": 1, "subprice": 5},
+                {"desc": "C", "qty": 2, "subprice": 1, "rang": 9},
+            ],
+        )
+
+        assert [line["rang"] for line in posted] == [3, 4, 9]
+        assert posted[0]["fk_product"] == 7 and "product_id" not in posted[0]
+        assert (result["count"], result["succeeded"], result["failed"]) == (3, 2, 1)
+        assert [item["ok"] for item in result["results"]] == [True, False, True]
+        assert result["results"][0]["line_id"] == 103
+        assert result["results"][1]["error"]["message"] == "Line rejected"
+
+    async def test_add_invoice_lines_validates_everything_first(self, client):
+        client.request = AsyncMock()
+
+        with pytest.raises(DolibarrValidationError) as excinfo:
+            await client.add_invoice_lines(1, [{"desc": "ok", "qty": 1, "subprice": 1}, {"qty": 1}])
+
+        assert [line["index"] for line in excinfo.value.response_data["lines"]] == [1]
+        client.request.assert_not_called()
@@ -0,0 +1,91 @@
+"""Tests for the composite invoice details lookup."""
+
+import asyncio
+
+import pytest
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+
+INVOICE = {
+    "id": "5",
+    "ref": "FA2401-0005",
+    "socid": "12",
+    "fk_project": "0",
+    "lines": [
+        {"id": "1", "fk_product": "7", "qty": "2"},
+        {"id": "2", "fk_product": "8", "qty": "1"},
+        {"id": "3", "fk_product": "7", "qty": "4"},
+        {"id": "4", "fk_product": None, "desc": "Free text"},
+    ],
+}
+
+
+def _client(responses):
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+    client = DolibarrClient(config)
+    requested = []
+    active = []
+    peak = []
+
+    async def fake_request(method, endpoint, params=None, data=None, use_cache=True):
+        requested.append(endpoint)
+        active.append(endpoint)
+        peak.append(len(active))
+        await asyncio.sleep(0.001)
+        active.remove(endpoint)
+        response = responses[endpoint]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client._make_request = fake_request
+    return client, requested, peak
+
+
+@pytest.mark.asyncio
+async def test_invoice_details_joins_related_objects_fetched_once():
+    """Customer and distinct products are fetched concurrently and joined into the invoice."""
+    client, requested, peak = _client(
+        {
+            "invoices/5": INVOICE,
+            "thirdparties/12": {"id": "12", "name": "Acme"},
+            "products/7": {"id": "7", "ref": "CHAIR"},
+            "products/8": {"id": "8", "ref": "DESK"},
+        }
+    )
+
+    details = await client.get_invoice_details(5)
+
+    assert requested[0] == "invoices/5"
+    assert sorted(requested[1:]) == ["products/7", "products/8", "thirdparties/12"]
+    assert max(peak) > 1
+    assert details["customer"]["name"] == "Acme"
+    assert details["project"] is None
+    assert [line["product"] and line["product"]["ref"] for line in details["invoice"]["lines"]] == [
+        "CHAIR",
+        "DESK",
+        "CHAIR",
+        None,
+    ]
+    assert "product" not in INVOICE["lines"][0]
+    assert "errors" not in details
+
+
+@pytest.mark.asyncio
+async def test_invoice_details_reports_missing_related_objects():
+    """A related object that fails to load is reported instead of failing the call."""
+    client, _, _ = _client(
+        {
+            "invoices/5": {**INVOICE, "lines": [{"id": "1", "fk_product": "9"}], "fk_project": "3"},
+            "thirdparties/12": {"id": "12", "name": "Acme"},
+            "projects/3": {"id": "3", "title": "Fit-out"},
+            "products/9": DolibarrAPIError("Not found", status_code=404),
+        }
+    )
+
+    details = await client.get_invoice_details(5)
+
+    assert details["project"]["title"] == "Fit-out"
+    assert details["invoice"]["lines"][0]["product"] is None
+    assert details["errors"] == [{"entity": "products", "id": 9, "status": 404, "error": "Not found"}]
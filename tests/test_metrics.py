@@ -0,0 +1,121 @@
+"""Tests for the Prometheus metrics and the /metrics route."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from starlette.testclient import TestClient
+
+from dolibarr_mcp import dolibarr_mcp_server
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.metrics import Histogram, MetricsRegistry, get_metrics
+from dolibarr_mcp.resilience import RetryBudget
+
+
+def test_registry_renders_counters_and_cumulative_histograms():
+    """Samples render with escaped labels; histogram buckets are cumulative and end at +Inf."""
+    registry = MetricsRegistry()
+    registry.tool_calls.inc("get_invoice", "ok")
+    registry.tool_calls.inc("get_invoice", "ok")
+    registry.requests.inc("invoices", "GET", 200)
+    latency = Histogram("latency_seconds", "Latency.", ("family",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, 'in"voices')
+
+    text = registry.render({"pool": ("gauge", "Pool.", {("idle",): 3}, ("state",))})
+    assert 'dolibarr_mcp_tool_calls_total{tool="get_invoice",outcome="ok"} 2' in text
+    assert 'dolibarr_mcp_dolibarr_requests_total{family="invoices",method="GET",status="200"} 1' in text
+    assert "dolibarr_mcp_tool_calls_in_flight 0" in text
+    assert '# TYPE pool gauge\npool{state="idle"} 3' in text
+
+    lines = list(latency.samples())
+    assert [(name, labels[-1], value) for name, labels, _, value in lines[:3]] == [
+        ("latency_seconds_bucket", "0.1", 1),
+        ("latency_seconds_bucket", "1", 2),
+        ("latency_seconds_bucket", "+Inf", 3),
+    ]
+    assert latency.count('in"voices') == 3
+
+
+def _response(status: int, body: str):
+    mock_response = AsyncMock()
+    mock_response.status = status
+    mock_response.reason = "Status"
+    mock_response.headers = {}
+    mock_response.read.return_value = body.encode()
+    return mock_response
+
+
+@pytest.mark.asyncio
+@patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+@patch("aiohttp.ClientSession.request")
+async def test_tool_calls_and_request_attempts_are_recorded(mock_request, mock_sleep):
+    """A tool call records its outcome and latency, and every HTTP attempt its status."""
+    mock_request.return_value.__aenter__.side_effect = [
+        _response(503, '{"message": "busy"}'),
+        _response(200, '{"id": 4}'),
+    ]
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key", cache_enabled=False)
+    metrics = get_metrics()
+    calls = metrics.tool_calls.value("get_invoice_by_id", "ok")
+    unavailable = metrics.requests.value("invoices", "GET", 503)
+    succeeded = metrics.requests.value("invoices", "GET", 200)
+
+    async with DolibarrClient(config) as client:
+        client.retry_budget = RetryBudget(min_per_second=0, max_tokens=100)
+        client.retry_budget._tokens = 100
+        dolibarr_mcp_server._shared_client = client
+        try:
+            await dolibarr_mcp_server.handle_call_tool("get_invoice_by_id", {"invoice_id": 4})
+            await dolibarr_mcp_server.handle_call_tool("no_such_tool", {})
+        finally:
+            dolibarr_mcp_server._shared_client = None
+        scraped = client.scrape_metrics()
+
+    assert metrics.tool_calls.value("get_invoice_by_id", "ok") == calls + 1
+    assert metrics.tool_calls.value("unknown", "unknown_tool") >= 1
+    assert metrics.requests.value("invoices", "GET", 503) == unavailable + 1
+    assert metrics.requests.value("invoices", "GET", 200) == succeeded + 1
+    assert metrics.tool_duration.count("get_invoice_by_id") >= 1
+    assert metrics.tool_calls_in_flight.value() == 0
+    assert scraped["dolibarr_mcp_circuit_state"][2][("invoices", "closed")] == 1.0
+    assert set(scraped["dolibarr_mcp_pool_connections"][2]) == {("in_use",), ("idle",)}
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_unknown_endpoint_families_share_one_label(mock_request):
+    """Arbitrary raw endpoints are labelled and guarded as "other" instead of adding series."""
+    mock_request.return_value.__aenter__.return_value = _response(200, '{"ok": 1}')
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key", cache_enabled=False)
+    metrics = get_metrics()
+    before = metrics.requests.value("other", "GET", 200)
+
+    async with DolibarrClient(config) as client:
+        for index in range(3):
+            await client.request("GET", f"custom{index}/items")
+        await client.request("GET", "proposals/1")
+
+    assert metrics.requests.value("other", "GET", 200) == before + 3
+    assert metrics.requests.value("custom0", "GET", 200) == 0
+    assert set(client._breakers) == {"other", "proposals"}
+
+
+def test_metrics_route_is_served_before_the_session_manager():
+    """GET /metrics answers in the Prometheus text format instead of reaching the MCP handler."""
+
+    class _Manager:
+        async def handle_request(self, scope, receive, send):
+            raise AssertionError("/metrics must not reach the session manager")
+
+    app = dolibarr_mcp_server._build_http_app(_Manager(), Config(dolibarr_url="https://x/api/index.php", api_key="k"))
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE dolibarr_mcp_tool_calls_total counter" in response.text
+
+    disabled = dolibarr_mcp_server._build_http_app(
+        _Manager(), Config(dolibarr_url="https://x/api/index.php", api_key="k", metrics_enabled=False)
+    )
+    assert all(getattr(route, "path", None) != "/metrics" for route in disabled.routes)
@@ -0,0 +1,171 @@
+"""Tests for paginated iteration over Dolibarr list endpoints."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+from dolibarr_mcp.pagination import iter_pages, iter_pages_concurrently, iter_records
+
+
+def _fake_pages(total: int, page_size: int):
+    """Return a page fetcher over ``total`` synthetic records and the list of requested pages."""
+    requested = []
+
+    async def fetch_page(page: int):
+        requested.append(page)
+        await asyncio.sleep(0)
+        start = page * page_size
+        return [{"id": i} for i in range(start, min(start + page_size, total))]
+
+    return fetch_page, requested
+
+
+@pytest.mark.asyncio
+async def test_iter_records_walks_until_short_page():
+    """Records are yielded in order and iteration stops at the first short page."""
+    fetch_page, requested = _fake_pages(total=25, page_size=10)
+
+    records = [record["id"] async for record in iter_records(fetch_page, page_size=10)]
+
+    assert records == list(range(25))
+    assert requested == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_exact_multiple_needs_empty_page():
+    """An empty page ends iteration when the total is a multiple of the page size."""
+    fetch_page, requested = _fake_pages(total=20, page_size=10)
+
+    pages = [page async for page in iter_pages(fetch_page, page_size=10)]
+
+    assert len(pages) == 2
+    assert requested == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_read_ahead_prefetches_and_cancels_leftovers():
+    """Read-ahead fetches following pages concurrently and drops pages past the end."""
+    fetch_page, requested = _fake_pages(total=15, page_size=10)
+
+    records = [record async for record in iter_records(fetch_page, page_size=10, read_ahead=3)]
+
+    assert len(records) == 15
+    assert requested[:2] == [0, 1]
+    assert max(requested) <= 4
+
+
+@pytest.mark.asyncio
+async def test_max_pages_bounds_iteration():
+    """max_pages limits how many pages are requested."""
+    fetch_page, requested = _fake_pages(total=1000, page_size=10)
+
+    records = [record async for record in iter_records(fetch_page, page_size=10, read_ahead=2, max_pages=3)]
+
+    assert len(records) == 30
+    assert sorted(requested) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_client_iter_products_treats_404_as_end():
+    """Dolibarr's 404 past the last page terminates iteration cleanly."""
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+    client = DolibarrClient(config)
+    client._make_request = AsyncMock(
+        side_effect=[
+            [{"id": 1}, {"id": 2}],
+            DolibarrAPIError("No product found", status_code=404),
+        ]
+    )
+
+    products = [product async for product in client.iter_products(page_size=2, sqlfilters="(t.tosell:=:1)")]
+
+    assert [product["id"] for product in products] == [1, 2]
+    first_call = client._make_request.call_args_list[0]
+    assert first_call.kwargs["params"] == {"sqlfilters": "(t.tosell:=:1)", "limit": 2, "page": 0}
+    assert first_call.kwargs["use_cache"] is False
+
+
+@pytest.mark.asyncio
+async def test_concurrent_pages_respect_limit_and_stop_at_short_page():
+    """Concurrent workers never exceed max_concurrency and stop after the short page."""
+    in_flight = 0
+    peak = 0
+    requested = []
+
+    async def fetch_page(page: int):
+        nonlocal in_flight, peak
+        requested.append(page)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001 * (page % 3))
+        in_flight -= 1
+        start = page * 10
+        return [{"id": i} for i in range(start, min(start + 10, 95))]
+
+    pages = [item async for item in iter_pages_concurrently(fetch_page, page_size=10, max_concurrency=3)]
+
+    assert peak <= 3
+    assert sorted(number for number, _ in pages) == list(range(10))
+    assert sorted(record["id"] for _, page in pages for record in page) == list(range(95))
+    assert max(requested) <= 9 + 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_pages_propagate_errors():
+    """A failing page aborts the fan-out with its exception."""
+
+    async def fetch_page(page: int):
+        if page == 2:
+            raise DolibarrAPIError("boom", status_code=500)
+        return [{"id": page}]
+
+    with pytest.raises(DolibarrAPIError):
+        async for _ in iter_pages_concurrently(fetch_page, page_size=1, max_concurrency=2):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_uses_probed_page_count():
+    """fetch_all probes the page count and returns every record in order."""
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+    client = DolibarrClient(config)
+    requested = []
+
+    async def fake_request(method, endpoint, params=None, data=None, use_cache=True):
+        requested.append(params["page"])
+        page = params["page"]
+        records = [{"id": page * 2 + i} for i in range(2)] if page < 3 else []
+        if params.get("pagination_data") == "true":
+            return {"data": records, "pagination": {"page_count": 3, "total": 6}}
+        await asyncio.sleep(0.001 * (3 - page))
+        return records
+
+    client._make_request = fake_request
+
+    invoices = await client.get_all_invoices(page_size=2, max_concurrency=4)
+
+    assert [invoice["id"] for invoice in invoices] == list(range(6))
+    assert sorted(requested) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_stream_all_without_page_count_streams_out_of_order():
+    """Without a page count the unordered stream still returns every record once."""
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+    client = DolibarrClient(config)
+
+    async def fake_request(method, endpoint, params=None, data=None, use_cache=True):
+        page = params["page"]
+        if page >= 4:
+            raise DolibarrAPIError("Not found", status_code=404)
+        await asyncio.sleep(0.001 * (4 - page))
+        return [{"id": page * 5 + i} for i in range(5 if page < 3 else 2)]
+
+    client._make_request = fake_request
+
+    records = [record async for record in client.stream_all("products", page_size=5, max_concurrency=3)]
+
+    assert sorted(record["id"] for record in records) == list(range(17))
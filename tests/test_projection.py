@@ -0,0 +1,66 @@
+"""Tests for field projection and pruning of tool results."""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dolibarr_mcp import tools
+from dolibarr_mcp.dolibarr_mcp_server import handle_call_tool
+from dolibarr_mcp.projection import project, prune
+
+
+def test_project_keeps_selected_fields_of_each_object():
+    """Projection applies to single objects and to every object of a list."""
+    invoice = {"id": 1, "ref": "FA1", "note": None, "lines": [{"ref": "P1", "qty": 2}, {"ref": "P2", "qty": 1}]}
+
+    assert project(invoice, ["id", "ref"]) == {"id": 1, "ref": "FA1"}
+    assert project([invoice, {"id": 2}], ["id", "missing"]) == [{"id": 1}, {"id": 2}]
+    assert project(invoice, ["ref", "lines.ref"]) == {"ref": "FA1", "lines": [{"ref": "P1"}, {"ref": "P2"}]}
+    assert project(invoice, ["lines", "lines.ref"])["lines"][0] == {"ref": "P1", "qty": 2}
+    assert project(42, ["id"]) == 42
+    assert project(invoice, []) is invoice
+
+
+def test_prune_drops_null_and_empty_values_only():
+    """Nulls and empty strings/containers go; falsy scalars stay."""
+    value = {
+        "id": 0,
+        "ref": "",
+        "paye": "0",
+        "draft": False,
+        "note": None,
+        "array_options": [],
+        "linked": {"a": None},
+        "lines": [{"qty": 1, "desc": ""}, {}],
+    }
+
+    assert prune(value) == {"id": 0, "paye": "0", "draft": False, "lines": [{"qty": 1}, {}]}
+    assert prune([]) == []
+
+
+@pytest.mark.asyncio
+async def test_fields_argument_is_stripped_and_applied():
+    """The fields argument never reaches the client and projects the result."""
+    client = MagicMock()
+    client.get_invoices = AsyncMock(return_value=[{"id": 1, "ref": "FA1", "total_ttc": "10.0", "note": "x"}])
+
+    result = await tools.get_tool("get_invoices").invoke(client, {"limit": 5, "fields": ["ref", "total_ttc"]})
+
+    assert result == [{"ref": "FA1", "total_ttc": "10.0"}]
+    client.get_invoices.assert_awaited_once_with(limit=5, status=None, page=1)
+    assert not tools.get_tool("create_invoice").projectable
+
+
+@pytest.mark.asyncio
+async def test_call_tool_output_is_compact_and_pruned():
+    """Tool output has no indentation and no null fields."""
+    client = MagicMock()
+    client.config.compact_output = True
+    client.get_customer_by_id = AsyncMock(return_value={"id": 3, "name": "Müller", "fax": None, "email": ""})
+
+    with patch("dolibarr_mcp.dolibarr_mcp_server._shared_client", client):
+        result = await handle_call_tool("get_customer_by_id", {"customer_id": 3})
+
+    assert result[0].text == '{"id":3,"name":"Müller"}'
+    assert json.loads(result[0].text) == {"id": 3, "name": "Müller"}
@@ -0,0 +1,102 @@
+"""Tests for the persistent SQLite replica."""
+
+import pytest
+
+from dolibarr_mcp import tools
+from dolibarr_mcp.replica import SQLiteStore
+from dolibarr_mcp.sync import SyncEngine
+
+
+class FakeClient:
+    def __init__(self, tables, changed=None):
+        self.tables = tables
+        self.changed = changed or {}
+        self.calls = []
+        self.sync_engine = None
+
+    async def iter_list(self, endpoint, page_size=100, read_ahead=0, params=None):
+        self.calls.append((endpoint, params))
+        for record in (self.changed if params else self.tables).get(endpoint, []):
+            yield record
+
+    async def get_product_by_id(self, product_id):
+        return {"id": product_id, "source": "api"}
+
+
+class Clock:
+    def __init__(self, now=10_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_store_round_trips_records_and_state(tmp_path):
+    """Records, watermarks and sync times survive reopening the database in WAL mode."""
+    path = str(tmp_path / "replica.db")
+    store = SQLiteStore(path)
+    assert store._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    assert store.upsert("products", [{"id": "1", "ref": "A", "date_modification": 5}, {"ref": "no id"}]) == 1
+    store.upsert("products", [{"id": 1, "ref": "A2"}, {"id": 2, "ref": "B"}])
+    store.set_watermark("products", 5, 123.5)
+    assert store.remove("products", 2)
+    assert not store.remove("products", 2)
+    store.close()
+
+    reopened = SQLiteStore(path)
+    assert reopened.get("products", 1) == {"id": 1, "ref": "A2"}
+    assert reopened.all("products") == [{"id": 1, "ref": "A2"}]
+    assert reopened.count("products") == 1
+    assert reopened.ids("products") == {1}
+    assert reopened.get_watermark("products") == 5
+    assert reopened.synced_at("products") == 123.5
+    assert reopened.get_watermark("contacts") is None
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_restarted_engine_starts_warm_and_polls_incrementally(tmp_path):
+    """A new engine on an existing replica serves reads at once and skips the full scan."""
+    path = str(tmp_path / "replica.db")
+    clock = Clock()
+    client = FakeClient({"products": [{"id": "7", "ref": "P7", "date_modification": 9000}]})
+    first = SyncEngine(client, SQLiteStore(path), entities=["products"], clock=clock)
+    await first.sync_once()
+    await first.close()
+
+    clock.now += 60
+    client = FakeClient({}, changed={"products": []})
+    engine = SyncEngine(
+        client,
+        SQLiteStore(path),
+        entities=["products"],
+        max_staleness={"products": 120},
+        clock=clock,
+    )
+    client.sync_engine = engine
+
+    assert engine.lookup("products", 7)["ref"] == "P7"
+    spec = tools.get_tool("get_product_by_id")
+    assert (await spec.invoke(client, {"product_id": 7}))["ref"] == "P7"
+
+    await engine.sync_once()
+    assert client.calls[0][1] is not None
+    assert engine.status()["entities"]["products"]["full_scans"] == 0
+
+    clock.now += 500
+    assert engine.lookup("products", 7) is None
+    assert (await spec.invoke(client, {"product_id": 7}))["source"] == "api"
+    await engine.close()
+
+
+def test_writes_to_sub_resources_evict_the_record(tmp_path):
+    """Writes the response cannot describe evict the mirrored record until the next poll."""
+    store = SQLiteStore(str(tmp_path / "replica.db"))
+    engine = SyncEngine(FakeClient({}), store, entities=["invoices"])
+    store.upsert("invoices", [{"id": 4, "total_ttc": "10"}])
+
+    engine.on_write("POST", "invoices/4/lines", 12)
+
+    assert store.get("invoices", 4) is None
+    store.close()
@@ -0,0 +1,105 @@
+"""Tests for the streaming invoice reports."""
+
+from datetime import date, datetime, timezone
+
+import pytest
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient, DolibarrValidationError
+from dolibarr_mcp.reports import ReceivablesAging, RevenueReport, TopDebtors, invoice_day, outstanding
+
+
+def _ts(day: str) -> int:
+    """Timestamp of local midnight on ``day`` in a UTC+2 Dolibarr."""
+    return int(datetime.fromisoformat(day).replace(tzinfo=timezone.utc).timestamp()) - 2 * 3600
+
+
+INVOICES = [
+    {"id": "1", "socid": "10", "status": "1", "total_ht": "100", "total_ttc": "120", "remaintopay": "120",
+     "date": _ts("2024-01-05"), "date_lim_reglement": _ts("2024-02-04"),
+     "lines": [{"fk_product": "7", "product_ref": "CHAIR", "qty": "2", "total_ht": "100"}]},
+    {"id": "2", "socid": "11", "status": "1", "total_ht": "50", "total_ttc": "60", "sumpayed": "20",
+     "date": _ts("2024-02-20"), "date_lim_reglement": _ts("2024-03-01"),
+     "lines": [{"fk_product": "7", "product_ref": "CHAIR", "qty": "1", "total_ht": "30"},
+               {"fk_product": None, "desc": "Delivery", "qty": "1", "total_ht": "20"}]},
+    {"id": "3", "socid": "10", "status": "2", "total_ht": "10", "total_ttc": "12", "remaintopay": "0",
+     "date": _ts("2024-02-25"), "lines": []},
+    {"id": "4", "socid": "12", "status": "3", "total_ht": "999", "total_ttc": "999", "remaintopay": "999",
+     "date": _ts("2024-02-25"), "lines": []},
+]
+
+
+def test_invoice_day_and_outstanding():
+    """Dates survive the server time zone; outstanding falls back to totals minus payments."""
+    assert invoice_day(_ts("2024-01-05")) == date(2024, 1, 5)
+    assert invoice_day(None) is None
+    assert outstanding(INVOICES[0]) == 120.0
+    assert outstanding(INVOICES[1]) == 40.0
+
+
+def test_aging_buckets_by_days_overdue():
+    """Outstanding amounts land in buckets by days past due; paid and abandoned invoices are skipped."""
+    report = ReceivablesAging(as_of=date(2024, 3, 10), by_customer=True)
+    for invoice in INVOICES:
+        report.add(invoice)
+    result = report.result()
+
+    assert result["invoices"] == 2
+    assert result["buckets"] == {"current": 0.0, "1-30": 40.0, "31-60": 120.0, "61-90": 0.0, "90+": 0.0, "total": 160.0}
+    assert [row["customer_id"] for row in result["customers"]] == ["10", "11"]
+    assert ReceivablesAging.bucket(0) == "current"
+    assert ReceivablesAging.bucket(91) == "90+"
+
+
+def test_top_debtors_and_revenue_groups():
+    """Debtors are ranked by outstanding amount; revenue groups by month and product."""
+    debtors = TopDebtors(as_of=date(2024, 3, 10), limit=1)
+    by_month = RevenueReport("month")
+    by_product = RevenueReport("product")
+    for invoice in INVOICES:
+        for report in (debtors, by_month, by_product):
+            report.add(invoice)
+
+    top = debtors.result()
+    assert top["customer_count"] == 2
+    assert top["debtors"] == [{"customer_id": "10", "outstanding": 120.0, "invoices": 1, "max_days_overdue": 35}]
+
+    assert [(row["key"], row["revenue_ht"], row["invoices"]) for row in by_month.result()["rows"]] == [
+        ("2024-01", 100.0, 1),
+        ("2024-02", 60.0, 2),
+    ]
+    products = by_product.result()["rows"]
+    assert [(row["key"], row["revenue_ht"], row["qty"], row["invoices"]) for row in products] == [
+        ("7", 130.0, 3.0, 2),
+        (None, 20.0, 1.0, 1),
+    ]
+    with pytest.raises(ValueError):
+        RevenueReport("week")
+
+
+@pytest.mark.asyncio
+async def test_revenue_report_streams_invoices_and_names_customers():
+    """The client pages through filtered invoices once and resolves names for the result rows only."""
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+    client = DolibarrClient(config)
+    requests = []
+
+    async def fake_request(method, endpoint, params=None, data=None, use_cache=True):
+        requests.append((endpoint, dict(params or {})))
+        if endpoint == "invoices":
+            return INVOICES if params["page"] == 0 else []
+        return {"id": endpoint.split("/")[1], "name": f"Customer {endpoint.split('/')[1]}"}
+
+    client._make_request = fake_request
+
+    result = await client.report_revenue(group_by="customer", date_from="2024-01-01", limit=1)
+
+    assert result["rows"] == [
+        {"key": "10", "revenue_ht": 110.0, "invoices": 2, "revenue_ttc": 132.0, "name": "Customer 10"}
+    ]
+    invoice_params = [params for endpoint, params in requests if endpoint == "invoices"]
+    assert invoice_params[0]["sqlfilters"] == "(t.fk_statut:>:0) AND (t.datef:>=:'2024-01-01')"
+    assert [endpoint for endpoint, _ in requests if endpoint != "invoices"] == ["thirdparties/10"]
+
+    with pytest.raises(DolibarrValidationError):
+        await client.report_revenue(date_to="03/2024")
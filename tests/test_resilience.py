@@ -0,0 +1,434 @@
+"""Tests for the retry, circuit breaker and rate limiting helpers and their use in the client."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import aiohttp
+
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+from dolibarr_mcp.resilience import (
+    AdaptiveTimeouts,
+    CircuitBreaker,
+    RateLimiter,
+    RetryBudget,
+    RetryPolicy,
+    TokenBucket,
+    current_session,
+    get_retry_budget,
+    parse_retry_after,
+    request_shape,
+)
+
+
+class _Clock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += delay
+        await asyncio.sleep(0)
+
+
+def _response(status: int, body: str = "{}", headers=None):
+    mock_response = AsyncMock()
+    mock_response.status = status
+    mock_response.reason = "Status"
+    mock_response.headers = headers or {}
+    mock_response.read.return_value = body.encode()
+    return mock_response
+
+
+def _client(**overrides) -> DolibarrClient:
+    config = Config(
+        dolibarr_url="https://test.dolibarr.com/api/index.php",
+        api_key="test_key",
+        cache_enabled=False,
+        **overrides,
+    )
+    client = DolibarrClient(config)
+    client.retry_budget = RetryBudget(min_per_second=0, max_tokens=100)
+    client.retry_budget._tokens = 100
+    return client
+
+
+def test_parse_retry_after_seconds_and_dates():
+    """Both delta-seconds and HTTP-date forms are understood."""
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480.0) == 10.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_uses_full_jitter_and_honours_retry_after():
+    """Delays are drawn from [0, base * 2**attempt] and stretched by Retry-After."""
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0, rng=lambda low, high: high)
+
+    assert policy.backoff(0) == 0.5
+    assert policy.backoff(2) == 2.0
+    assert policy.backoff(5) == 4.0
+    assert policy.backoff(0, retry_after=3.0) == 3.0
+    assert policy.backoff(0, retry_after=60.0) == 4.0
+
+
+def test_only_idempotent_methods_are_retried():
+    """POST is never retried; GET/PUT/DELETE are retried up to max_retries."""
+    policy = RetryPolicy(max_retries=2)
+
+    assert policy.can_retry("GET", 0)
+    assert policy.can_retry("delete", 1)
+    assert not policy.can_retry("GET", 2)
+    assert not policy.can_retry("POST", 0)
+
+
+def test_retry_budget_limits_retries_to_request_ratio():
+    """The budget allows roughly ``ratio`` retries per request."""
+    clock = _Clock()
+    budget = RetryBudget(ratio=0.5, min_per_second=0, clock=clock)
+    budget._tokens = 0
+
+    for _ in range(4):
+        budget.record_request()
+
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    assert budget.exhausted == 1
+
+
+def test_retry_budget_is_shared_per_configuration():
+    """Clients configured alike share a budget; different settings get their own."""
+    assert get_retry_budget(0.3, 2.0) is get_retry_budget(0.3, 2.0)
+    other = get_retry_budget(0.1, 0.5)
+    assert other is not get_retry_budget(0.3, 2.0)
+    assert (other.ratio, other.min_per_second) == (0.1, 0.5)
+
+
+def test_retry_budget_refills_over_time():
+    """A minimum retry rate is restored as time passes."""
+    clock = _Clock()
+    budget = RetryBudget(ratio=0, min_per_second=2.0, clock=clock)
+    budget._tokens = 0
+
+    assert not budget.try_spend()
+    clock.now = 1.0
+    assert budget.try_spend()
+    assert budget.try_spend()
+
+
+@pytest.mark.asyncio
+@patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+@patch("aiohttp.ClientSession.request")
+async def test_get_retried_on_503_then_succeeds(mock_request, mock_sleep):
+    """5xx responses to idempotent requests are retried."""
+    mock_request.return_value.__aenter__.side_effect = [
+        _response(503, '{"message": "busy"}'),
+        _response(200, '{"id": 4}'),
+    ]
+
+    async with _client() as client:
+        result = await client.get_invoice_by_id(4)
+
+    assert result == {"id": 4}
+    assert mock_request.call_count == 2
+    assert mock_sleep.await_count == 1
+
+
+@pytest.mark.asyncio
+@patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+@patch("aiohttp.ClientSession.request")
+async def test_429_honours_retry_after(mock_request, mock_sleep):
+    """429 responses wait at least the Retry-After delay."""
+    mock_request.return_value.__aenter__.side_effect = [
+        _response(429, '{"message": "slow down"}', headers={"Retry-After": "2"}),
+        _response(200, "[]"),
+    ]
+
+    async with _client() as client:
+        await client.get_products()
+
+    assert mock_sleep.await_args.args[0] >= 2.0
+
+
+@pytest.mark.asyncio
+@patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+@patch("aiohttp.ClientSession.request")
+async def test_post_not_retried(mock_request, mock_sleep):
+    """Non-idempotent requests surface the 5xx immediately."""
+    mock_request.return_value.__aenter__.return_value = _response(503, '{"message": "busy"}')
+
+    async with _client() as client:
+        with pytest.raises(DolibarrAPIError) as exc_info:
+            await client.create_order(socid=1)
+
+    assert exc_info.value.status_code == 503
+    assert mock_request.call_count == 1
+    mock_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+@patch("aiohttp.ClientSession.request")
+async def test_connection_reset_retried(mock_request, mock_sleep):
+    """Dropped connections are retried for idempotent requests."""
+    mock_request.return_value.__aenter__.side_effect = [
+        aiohttp.ServerDisconnectedError(),
+        _response(200, '{"id": 2}'),
+    ]
+
+    async with _client() as client:
+        assert await client.get_project_by_id(2) == {"id": 2}
+
+    assert mock_request.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+@patch("aiohttp.ClientSession.request")
+async def test_exhausted_budget_stops_retries(mock_request, mock_sleep):
+    """Without budget the first failure is returned as is."""
+    mock_request.return_value.__aenter__.return_value = _response(502, '{"message": "bad gateway"}')
+
+    async with _client() as client:
+        client.retry_budget._tokens = 0
+        with pytest.raises(DolibarrAPIError) as exc_info:
+            await client.get_customer_by_id(1)
+
+    assert exc_info.value.status_code == 502
+    assert mock_request.call_count == 1
+    assert client.retry_budget.exhausted == 1
+
+
+def test_circuit_opens_after_threshold_and_probes_after_timeout():
+    """The breaker walks closed -> open -> half-open -> closed."""
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == 10.0
+
+    clock.now = 10.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_circuit():
+    """A failing probe re-opens the circuit for a full timeout."""
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 5.0
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_in() == 5.0
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_open_circuit_fails_fast_with_internal_error(mock_request):
+    """Once open, calls to the family fail without touching the network."""
+    mock_request.return_value.__aenter__.return_value = _response(500, '{"message": "down"}')
+
+    async with _client(max_retries=0, circuit_failure_threshold=2) as client:
+        for _ in range(2):
+            with pytest.raises(DolibarrAPIError):
+                await client.get_invoice_by_id(1)
+        assert mock_request.call_count == 2
+
+        with pytest.raises(DolibarrAPIError) as exc_info:
+            await client.get_invoice_by_id(1)
+
+        # Other families keep their own breaker.
+        with pytest.raises(DolibarrAPIError):
+            await client.get_product_by_id(1)
+
+    assert mock_request.call_count == 3
+    assert exc_info.value.status_code == 503
+    payload = exc_info.value.response_data
+    assert payload["status"] == 503
+    assert payload["correlation_id"]
+    assert payload["endpoint"] == "/invoices/1"
+    assert payload["circuit"]["state"] == CircuitBreaker.OPEN
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_client_errors_do_not_open_circuit(mock_request):
+    """4xx responses show the backend is up and reset the failure count."""
+    mock_request.return_value.__aenter__.return_value = _response(404, '{"message": "not found"}')
+
+    async with _client(max_retries=0, circuit_failure_threshold=1) as client:
+        for _ in range(3):
+            with pytest.raises(DolibarrAPIError):
+                await client.get_invoice_by_id(1)
+
+    assert mock_request.call_count == 3
+    assert client.circuit_breaker("invoices").state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_paces():
+    """The burst passes immediately, later requests wait one interval each."""
+    clock = _Clock()
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock, sleep=clock.sleep)
+
+    await bucket.acquire()
+    await bucket.acquire()
+    assert clock.now == 0.0
+
+    await bucket.acquire()
+    await bucket.acquire()
+    assert clock.now == pytest.approx(1.0)
+    assert bucket.waits == 2
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_serves_waiters_in_arrival_order():
+    """Queued requests are released first come, first served."""
+    clock = _Clock()
+    bucket = TokenBucket(rate=1.0, burst=1, clock=clock, sleep=clock.sleep)
+    order = []
+
+    async def call(index):
+        await bucket.acquire()
+        order.append(index)
+
+    await asyncio.gather(*(call(index) for index in range(5)))
+
+    assert order == [0, 1, 2, 3, 4]
+    assert clock.now == pytest.approx(4.0)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_separates_reads_writes_and_sessions():
+    """Reads and writes use separate buckets; sessions get their own share."""
+    clock = _Clock()
+    limiter = RateLimiter(read_rate=10, write_rate=1, burst=1, session_share=0.5, clock=clock, sleep=clock.sleep)
+
+    await limiter.acquire("POST")
+    await limiter.acquire("GET")
+    assert clock.now == 0.0
+
+    await limiter.acquire("PUT")
+    assert clock.now == pytest.approx(1.0)
+
+    assert limiter.bucket("read", "a").rate == 5
+    assert limiter.bucket("write", "a") is not limiter.bucket("write", "b")
+    assert not RateLimiter().enabled
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_client_draws_tokens_for_each_request(mock_request):
+    """Every request sent to Dolibarr passes through the rate limiter."""
+    mock_request.return_value.__aenter__.return_value = _response(200, '{"id": 1}')
+
+    async with _client(rate_limit_read_per_second=50, rate_limit_session_share=0.5) as client:
+        client.rate_limiter.acquire = AsyncMock()
+        token = current_session.set("session-1")
+        try:
+            await client.get_invoice_by_id(1)
+            await client.delete_invoice(1)
+        finally:
+            current_session.reset(token)
+
+    calls = [call.args for call in client.rate_limiter.acquire.await_args_list]
+    assert calls == [("GET", "session-1"), ("DELETE", "session-1")]
+
+
+def test_adaptive_timeouts_follow_p99_within_bounds():
+    """Timeouts start at the default, then track p99 * multiplier clamped to the bounds."""
+    timeouts = AdaptiveTimeouts(
+        default=30, min_timeout=1, max_timeout=20, multiplier=3, min_samples=20, overrides={"status": 4}
+    )
+
+    for _ in range(19):
+        timeouts.observe("products", 0.1)
+    assert timeouts.timeout("products") == 30
+    timeouts.observe("products", 0.1)
+    assert timeouts.timeout("products") == 1
+
+    for _ in range(100):
+        timeouts.observe("invoices", 4.0)
+    assert timeouts.timeout("invoices") == 12.0
+    for _ in range(100):
+        timeouts.observe("invoices", 12.0)
+    assert timeouts.timeout("invoices") == 20
+
+    timeouts.observe("status", 10.0)
+    assert timeouts.timeout("status") == 4
+    assert timeouts.as_dict()[("status", "")] == {"timeout": 4, "p99": None, "samples": 0}
+
+
+def test_fast_single_record_reads_do_not_shrink_the_listing_budget():
+    """Timeouts are tracked per request shape, so a family's record and listing budgets differ."""
+    assert request_shape("GET", "invoices/4") == "record"
+    assert request_shape("GET", "thirdparties/7/contacts") == "record"
+    assert request_shape("GET", "invoices", {"limit": 50}) == "list"
+    assert request_shape("GET", "invoices", {"limit": 500}) == "list_1000"
+    assert request_shape("GET", "invoices", {"limit": 0}) == "list_all"
+    assert request_shape("POST", "invoices") == "write"
+
+    timeouts = AdaptiveTimeouts(default=30, min_timeout=5, max_timeout=60, multiplier=3, min_samples=20)
+    for _ in range(200):
+        timeouts.observe("invoices", 0.05, "record")
+    for _ in range(20):
+        timeouts.observe("invoices", 8.0, "list_1000")
+
+    assert timeouts.timeout("invoices", "record") == 5
+    assert timeouts.timeout("invoices", "list_1000") == 24.0
+    assert timeouts.timeout("invoices", "list") == 30
+    assert set(timeouts.as_dict()) == {("invoices", "record"), ("invoices", "list_1000")}
+
+
+@pytest.mark.asyncio
+@patch("dolibarr_mcp.dolibarr_client.asyncio.sleep", new_callable=AsyncMock)
+@patch("aiohttp.ClientSession.request")
+async def test_timed_out_request_error_names_the_timeout(mock_request, mock_sleep):
+    """A request that keeps timing out fails with a message naming the budget it ran out of."""
+    mock_request.return_value.__aenter__.side_effect = asyncio.TimeoutError()
+
+    async with _client(timeout_overrides={"invoices": 7}) as client:
+        with pytest.raises(DolibarrAPIError) as exc_info:
+            await client.get_invoice_by_id(4)
+
+    assert exc_info.value.status_code == 500
+    assert "Request timed out after 7s" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_requests_use_family_timeout_and_log_slow_calls(mock_request, caplog):
+    """Each attempt gets its family's timeout; calls above the threshold log a structured entry."""
+    mock_request.return_value.__aenter__.return_value = _response(200, '[{"id": 1}]')
+
+    async with _client(slow_call_threshold_seconds=0.000001, timeout_overrides={"invoices": 7}) as client:
+        with caplog.at_level("WARNING", logger="dolibarr_mcp.slow_calls"):
+            await client.get_invoices(limit=5, status="draft")
+
+    assert mock_request.call_args.kwargs["timeout"].total == 7
+    entry = caplog.records[-1].slow_call
+    assert entry["endpoint"] == "invoices"
+    assert entry["params"]["limit"] == 5
+    assert entry["params"]["status"] == "str"
+    assert entry["response_bytes"] == len('[{"id": 1}]')
+    assert entry["timeout_seconds"] == 7
@@ -0,0 +1,201 @@
+"""Tests for the in-process product search index."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from dolibarr_mcp import tools
+from dolibarr_mcp.search_index import ProductIndex, TextIndex, ThirdpartyIndex, edit_distance
+
+PRODUCTS = [
+    {"id": "1", "ref": "CHAIR-01", "label": "Office chair black", "date_modification": 100},
+    {"id": "2", "ref": "chair-02", "label": "Office chair grey", "date_modification": 200},
+    {"id": "3", "ref": "DESK-01", "label": "Standing desk", "date_modification": 150},
+    {"id": "4", "ref": "LAMP", "label": "Desk lamp", "date_modification": 50},
+]
+
+
+class FakeClient:
+    """Serves iter_list from in-memory product lists."""
+
+    def __init__(self, products, changed=None):
+        self.products = products
+        self.changed = changed or []
+        self.calls = []
+
+    async def iter_list(self, endpoint, page_size=100, read_ahead=0, params=None):
+        self.calls.append(params)
+        for product in self.changed if params else self.products:
+            yield product
+
+
+def _index(products=PRODUCTS):
+    index = TextIndex(key_field="ref", text_fields=("label",))
+    for product in products:
+        index.upsert(product)
+    return index
+
+
+def test_exact_and_prefix_lookups_ignore_case():
+    """References match case-insensitively and prefix results are ordered by ref."""
+    index = _index()
+
+    assert [p["id"] for p in index.exact("chair-01")] == ["1"]
+    assert [p["ref"] for p in index.prefix("CHAIR")] == ["CHAIR-01", "chair-02"]
+    assert [p["ref"] for p in index.prefix("chair", limit=1)] == ["CHAIR-01"]
+    assert index.prefix("ZZZ") == []
+
+
+def test_substring_and_fuzzy_label_search():
+    """Trigram postings find substrings; fuzzy ranking tolerates typos."""
+    index = _index()
+
+    assert [p["id"] for p in index.contains("DESK")] == ["3", "4"]
+    assert [p["id"] for p in index.contains("ch")] == ["1", "2"]
+    assert index.contains("sofa") == []
+    assert {p["id"] for p in index.similar("ofice chiar")} == {"1", "2"}
+    assert index.similar("desk")[0]["id"] in {"3", "4"}
+
+
+def test_upsert_replaces_and_remove_cleans_postings():
+    """Updated records are re-indexed under their new ref and label."""
+    index = _index()
+    index.upsert({"id": 1, "ref": "STOOL-01", "label": "Bar stool"})
+
+    assert index.exact("CHAIR-01") == []
+    assert [p["id"] for p in index.contains("stool")] == [1]
+    assert index.remove(1)
+    assert not index.remove(1)
+    assert index.contains("stool") == []
+    assert len(index) == 3
+
+
+def test_extend_matches_one_by_one_upserts():
+    """Bulk loads sort keys once and keep the last version of repeated records."""
+    index = TextIndex(key_field="ref", text_fields=("label",))
+    index.upsert({"id": "3", "ref": "OLD", "label": "Old desk"})
+    index.extend(list(reversed(PRODUCTS)) + [{"id": "4", "ref": "LAMP-XL", "label": "Floor lamp"}])
+
+    assert [p["ref"] for p in index.prefix("")] == ["CHAIR-01", "chair-02", "DESK-01", "LAMP-XL"]
+    assert index.exact("OLD") == [] and index.exact("LAMP") == []
+    assert [p["id"] for p in index.contains("floor")] == ["4"]
+
+
+@pytest.mark.asyncio
+async def test_product_index_loads_and_refreshes_incrementally():
+    """A full load sets the watermark; refreshes only fetch modified products."""
+    changed = [{"id": "3", "ref": "DESK-01", "label": "Height adjustable desk", "date_modification": 300}]
+    client = FakeClient(PRODUCTS, changed)
+    index = ProductIndex(client, overlap_seconds=0)
+
+    assert not index.ready
+    assert await index.load() == 4
+    assert index.ready and index.watermark == 200
+
+    assert await index.refresh() == 1
+    assert client.calls[-1] == {"sqlfilters": "(t.tms:>=:'1970-01-01 00:03:20')"}
+    assert index.watermark == 300
+    assert [p["id"] for p in index.search_label("adjustable")] == ["3"]
+
+
+@pytest.mark.asyncio
+async def test_write_notifications_update_the_index():
+    """Deletes and updates made through the client are applied immediately."""
+    index = ProductIndex(FakeClient(PRODUCTS))
+    await index.load()
+
+    index.on_write("DELETE", "products/4", {"success": 1})
+    index.on_write("PUT", "products/1", {"id": "1", "ref": "CHAIR-01", "label": "Gaming chair"})
+    index.on_write("POST", "invoices", 12)
+
+    assert index.find_by_ref("LAMP") == []
+    assert [p["id"] for p in index.search_label("gaming")] == ["1"]
+    assert not index._stale
+    index.on_write("POST", "products", 5)
+    assert index._stale
+
+
+@pytest.mark.asyncio
+async def test_search_tools_use_index_once_ready():
+    """Tools fall back to the API until the index is loaded, then answer locally."""
+    client = MagicMock()
+    client.search_products = AsyncMock(return_value=[{"id": 9, "ref": "API"}])
+    client.product_index = ProductIndex(FakeClient(PRODUCTS))
+
+    first = await tools.get_tool("search_products_by_ref").invoke(client, {"ref_prefix": "CHAIR"})
+    assert first == [{"id": 9, "ref": "API"}]
+
+    await asyncio.sleep(0)  # let the scheduled background load run
+    await asyncio.sleep(0)
+    assert client.product_index.ready
+
+    by_ref = await tools.get_tool("search_products_by_ref").invoke(client, {"ref_prefix": "CHAIR", "fields": ["ref"]})
+    resolved = await tools.get_tool("resolve_product_ref").invoke(client, {"ref": "desk-01"})
+    by_label = await tools.get_tool("search_products_by_label").invoke(
+        client, {"label_search": "ofice chiar", "fuzzy": True, "limit": 1}
+    )
+
+    assert by_ref == [{"ref": "CHAIR-01"}, {"ref": "chair-02"}]
+    assert resolved == {"status": "ok", "product": PRODUCTS[2]}
+    assert [p["id"] for p in by_label] == ["2"]  # shorter label ranks first on equal scores
+    client.search_products.assert_awaited_once()
+
+    # A product created elsewhere since the last refresh is still resolved through the API.
+    client.search_products.return_value = [{"id": 9, "ref": "NEW-01"}]
+    missing = await tools.get_tool("resolve_product_ref").invoke(client, {"ref": "NEW-01"})
+    assert missing == {"status": "ok", "product": {"id": 9, "ref": "NEW-01"}}
+    assert client.search_products.await_count == 2
+    await client.product_index.close()
+
+
+THIRDPARTIES = [
+    {"id": "1", "name": "Acme GmbH", "nom": "Acme GmbH", "name_alias": "ACME", "email": "office@acme.at", "town": "Wien"},
+    {"id": "2", "name": "Müller & Söhne OG", "nom": "Müller & Söhne OG", "tva_intra": "ATU12345678", "town": "Graz"},
+    {"id": "3", "name": "Acne Studios", "nom": "Acne Studios", "town": "Stockholm"},
+]
+
+
+def test_edit_distance_is_bounded():
+    """Distances above the limit are reported as limit + 1 without full computation."""
+    assert edit_distance("kitten", "sitting", 3) == 3
+    assert edit_distance("acme", "acme", 1) == 0
+    assert edit_distance("acme", "completely different", 2) == 3
+
+
+@pytest.mark.asyncio
+async def test_thirdparty_index_matches_all_fields_and_typos():
+    """Plain searches match name and alias; fuzzy ones also email, VAT number and town, ranked by closeness."""
+    index = ThirdpartyIndex(FakeClient(THIRDPARTIES))
+    await index.load()
+
+    assert [t["id"] for t in index.search("acme")] == ["1"]
+    assert index.search("atu1234") == [] and index.search("graz") == []
+    assert [t["id"] for t in index.search("atu1234", fuzzy=True)] == ["2"]
+    assert [t["id"] for t in index.search("acme.at", fuzzy=True)] == ["1"]
+    assert [t["id"] for t in index.search("graz", fuzzy=True)] == ["2"]
+    assert index.search("Muller") == []
+    assert [t["id"] for t in index.search("Müler", fuzzy=True)] == ["2"]
+    assert [t["id"] for t in index.search("acme gmbj", fuzzy=True)] == ["1"]
+    # Exact substring matches outrank typo matches.
+    assert [t["id"] for t in index.search("acne", fuzzy=True)] == ["3", "1"]
+
+
+@pytest.mark.asyncio
+async def test_search_customers_uses_thirdparty_index():
+    """search_customers answers from the index once loaded and keeps the API fallback."""
+    client = MagicMock()
+    client.search_customers = AsyncMock(return_value=[])
+    client.thirdparty_index = ThirdpartyIndex(FakeClient(THIRDPARTIES))
+    await client.thirdparty_index.load()
+
+    result = await tools.get_tool("search_customers").invoke(client, {"query": "Akme", "fuzzy": True})
+
+    assert [t["id"] for t in result] == ["1"]
+    client.search_customers.assert_not_awaited()
+
+    # Third parties created elsewhere since the last refresh are still found through the API.
+    client.search_customers.return_value = [{"id": 7, "name": "Newco"}]
+    assert await tools.get_tool("search_customers").invoke(client, {"query": "Newco"}) == [{"id": 7, "name": "Newco"}]
+    client.search_customers.assert_awaited_once()
+    await client.thirdparty_index.close()
@@ -69,3 +69,47 @@ async def test_api_connection_with_client_error(monkeypatch):
 
     async with dolibarr_mcp_server.test_api_connection(config) as api_ok:
         assert api_ok is False
+
+
+class _PooledClient:
+    """Dummy client recording its lifecycle for the shared client lifespan."""
+
+    instances = []
+
+    def __init__(self, config):
+        self.started = 0
+        self.closed = 0
+        self.calls = 0
+        _PooledClient.instances.append(self)
+
+    async def start_session(self):
+        self.started += 1
+
+    async def close_session(self):
+        self.closed += 1
+
+    async def get_status(self):
+        self.calls += 1
+        return {"success": {"dolibarr_version": "1.0.0"}}
+
+
+@pytest.mark.asyncio
+async def test_shared_client_reused_across_tool_calls(monkeypatch):
+    """Tool calls reuse the pooled client opened by the server lifespan."""
+    _PooledClient.instances = []
+    monkeypatch.setattr(dolibarr_mcp_server, "DolibarrClient", _PooledClient)
+    config = Config(
+        dolibarr_url="https://example.com/api/index.php",
+        dolibarr_api_key="test_key",
+    )
+
+    async with dolibarr_mcp_server.shared_client_lifespan(config) as client:
+        await dolibarr_mcp_server.handle_call_tool("get_status", {})
+        await dolibarr_mcp_server.handle_call_tool("get_status", {})
+        assert client.calls == 2
+        assert client.closed == 0
+
+    assert len(_PooledClient.instances) == 1
+    assert client.started == 1
+    assert client.closed == 1
+    assert dolibarr_mcp_server._shared_client is None
@@ -0,0 +1,129 @@
+"""Tests for incremental JSON array parsing and streamed list responses."""
+
+import json
+import random
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dolibarr_mcp import codec
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrAPIError, DolibarrClient
+from dolibarr_mcp.streaming import JSONArrayStream, iter_json_array
+
+
+def _chunks(raw: bytes, sizes):
+    position = 0
+    for size in sizes:
+        yield raw[position:position + size]
+        position += size
+    yield raw[position:]
+
+
+def test_parser_yields_elements_across_arbitrary_chunk_boundaries():
+    """Strings with brackets, escapes, nested values and scalars survive any split."""
+    data = [
+        {"id": 1, "label": 'Quote "A" [draft], {x}', "path": "C:\\\\tmp\\\\"},
+        {"id": 2, "lines": [{"qty": 1, "tags": ["a", "b"]}], "note": None},
+        3,
+        "plain, text]",
+        True,
+        [],
+        {"label": "Müller — café"},
+    ]
+    raw = json.dumps(data, ensure_ascii=False, indent=1).encode("utf-8")
+    rng = random.Random(7)
+
+    for _ in range(50):
+        parser = JSONArrayStream()
+        parsed = []
+        for chunk in _chunks(raw, [rng.randint(1, 9) for _ in range(len(raw) // 3)]):
+            parsed.extend(parser.feed(chunk))
+        assert parser.close() is None
+        assert parsed == data
+
+
+def test_parser_buffers_only_the_current_element():
+    """Completed elements are released from the buffer."""
+    parser = JSONArrayStream()
+    record = json.dumps({"id": 1, "label": "x" * 1000}).encode()
+
+    parser.feed(b"[" + record)
+    for _ in range(100):
+        parser.feed(b"," + record)
+
+    assert parser.count == 101
+    assert len(parser._buffer) <= len(record) + 1
+
+
+def test_parser_returns_non_array_documents_and_rejects_truncation():
+    """Objects are handed back on close; an unterminated array is an error."""
+    parser = JSONArrayStream()
+    assert parser.feed(b'{"error": {"code": 404}}') == []
+    assert parser.close() == {"error": {"code": 404}}
+
+    parser = JSONArrayStream()
+    parser.feed(b'[{"id": 1}, {"id"')
+    with pytest.raises(codec.JSONDecodeError):
+        parser.close()
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_unwraps_pagination_envelope():
+    """The pagination_data envelope yields its data list."""
+
+    async def chunks():
+        yield b'{"data": [{"id": 1}, {"id": 2}], '
+        yield b'"pagination": {"page_count": 1}}'
+
+    assert [item async for item in iter_json_array(chunks())] == [{"id": 1}, {"id": 2}]
+
+
+def _stream_response(status: int, raw: bytes, chunk_size: int = 7):
+    async def iter_chunked(size):
+        for start in range(0, len(raw), chunk_size):
+            yield raw[start:start + chunk_size]
+
+    response = AsyncMock()
+    response.status = status
+    response.reason = "Status"
+    response.read.return_value = raw
+    response.content = MagicMock()
+    response.content.iter_chunked = iter_chunked
+    return response
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_stream_products_yields_records_from_the_wire(mock_request):
+    """stream_products requests every record without a total timeout and parses them one by one."""
+    products = [{"id": str(index), "ref": f"P{index}"} for index in range(25)]
+    mock_request.return_value.__aenter__.return_value = _stream_response(200, json.dumps(products).encode())
+
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+    async with DolibarrClient(config) as client:
+        streamed = [product async for product in client.stream_products(sqlfilters="(t.tosell:=:1)")]
+
+    assert streamed == products
+    assert mock_request.call_args.kwargs["params"] == {"sqlfilters": "(t.tosell:=:1)", "limit": 0}
+    timeout = mock_request.call_args.kwargs["timeout"]
+    assert timeout.total is None
+    assert timeout.sock_read == config.stream_read_timeout_seconds
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_stream_list_maps_errors(mock_request):
+    """404 means no records; server errors raise the structured internal error."""
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+    async with DolibarrClient(config) as client:
+        mock_request.return_value.__aenter__.return_value = _stream_response(404, b'{"error": "Not found"}')
+        assert [item async for item in client.stream_list("invoices")] == []
+
+        mock_request.return_value.__aenter__.return_value = _stream_response(500, b'{"message": "down"}')
+        with pytest.raises(DolibarrAPIError) as exc_info:
+            async for _ in client.stream_list("invoices"):
+                pass
+
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.response_data["correlation_id"]
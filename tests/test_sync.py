@@ -0,0 +1,131 @@
+"""Tests for the incremental change-feed sync engine."""
+
+import pytest
+
+from dolibarr_mcp.sync import MemoryStore, SyncEngine, database_timezone, modified_since_filter
+
+
+class FakeClient:
+    """Serves iter_list per endpoint: full tables, or the changed records when filtered."""
+
+    def __init__(self, tables, changed=None, failing=()):
+        self.tables = tables
+        self.changed = changed or {}
+        self.failing = set(failing)
+        self.calls = []
+
+    async def iter_list(self, endpoint, page_size=100, read_ahead=0, params=None):
+        self.calls.append((endpoint, params))
+        if endpoint in self.failing:
+            raise RuntimeError("backend down")
+        source = self.changed if params else self.tables
+        for record in source.get(endpoint, []):
+            yield record
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_modified_since_filter_renders_utc():
+    """Watermarks become t.tms filters in UTC."""
+    assert modified_since_filter(0) == "(t.tms:>=:'1970-01-01 00:00:00')"
+    assert modified_since_filter(86400 + 61) == "(t.tms:>=:'1970-01-02 00:01:01')"
+
+
+def test_modified_since_filter_uses_the_database_time_zone():
+    """West of UTC the filter is rendered in database local time, so recent changes are not skipped."""
+    new_york = database_timezone("-05:00")
+    # 2024-01-01 12:00 UTC is 07:00 on a database clock five hours behind.
+    assert modified_since_filter(1704110400, new_york) == "(t.tms:>=:'2024-01-01 07:00:00')"
+    assert database_timezone("+0530").utcoffset(None).total_seconds() == 19800
+    assert database_timezone("utc").utcoffset(None).total_seconds() == 0
+    with pytest.raises(ValueError):
+        database_timezone("Not/AZone")
+
+
+@pytest.mark.asyncio
+async def test_first_sync_scans_then_polls_deltas_from_watermark():
+    """Only the first sync is a full scan; later polls filter on the watermark minus the overlap."""
+    client = FakeClient(
+        tables={"products": [{"id": "1", "date_modification": 500}, {"id": "2", "date_modification": 700}]},
+        changed={"products": [{"id": "2", "label": "new", "date_modification": 900}]},
+    )
+    clock = Clock()
+    engine = SyncEngine(client, entities=["products"], overlap_seconds=100, clock=clock)
+
+    assert await engine.sync_entity("products") == 2
+    assert client.calls[-1] == ("products", None)
+    assert engine.store.get_watermark("products") == 700
+
+    assert await engine.sync_entity("products") == 1
+    assert client.calls[-1] == ("products", {"sqlfilters": modified_since_filter(600)})
+    assert engine.store.get("products", 2)["label"] == "new"
+    assert engine.store.count("products") == 2
+    assert engine.store.get_watermark("products") == 900
+
+    clock.now = 1030.0
+    status = engine.status()["entities"]["products"]
+    assert status["full_scans"] == 1
+    assert status["total_applied"] == 3
+    assert status["lag_seconds"] == 30.0
+    assert status["watermark_age_seconds"] == 130.0
+
+
+@pytest.mark.asyncio
+async def test_failed_entity_keeps_watermark_and_others_still_sync():
+    """A failing entity is counted and retried from the same watermark next time."""
+    client = FakeClient(tables={"products": [{"id": "1", "date_modification": 5}]}, failing={"invoices"})
+    store = MemoryStore()
+    store.set_watermark("invoices", 42)
+    engine = SyncEngine(client, store, entities=["invoices", "products"])
+
+    assert await engine.sync_once() == {"products": 1}
+
+    invoices = engine.status()["entities"]["invoices"]
+    assert invoices["errors"] == 1
+    assert invoices["last_error"] == "backend down"
+    assert invoices["lag_seconds"] is None
+    assert store.get_watermark("invoices") == 42
+
+
+@pytest.mark.asyncio
+async def test_reconcile_scan_drops_records_deleted_elsewhere():
+    """Every reconcile interval a full scan removes records Dolibarr no longer returns."""
+    client = FakeClient(tables={"contacts": [{"id": "1", "date_modification": 5}, {"id": "2", "date_modification": 6}]})
+    clock = Clock()
+    engine = SyncEngine(client, entities=["contacts"], reconcile_seconds=600, default_max_staleness=60, clock=clock)
+    await engine.sync_entity("contacts")
+
+    client.tables["contacts"] = [{"id": "1", "date_modification": 5}]
+    clock.now += 30
+    await engine.sync_entity("contacts")
+    assert client.calls[-1][1] is not None
+    assert engine.lookup("contacts", 2) is not None
+
+    clock.now += 600
+    await engine.sync_entity("contacts")
+    assert client.calls[-1] == ("contacts", None)
+    assert engine.lookup("contacts", 2) is None
+    assert engine.status()["entities"]["contacts"]["removed"] == 1
+    assert engine.status()["entities"]["contacts"]["full_scans"] == 2
+
+
+def test_write_notifications_update_the_store():
+    """Deletes and returned updates are mirrored without waiting for the next poll."""
+    engine = SyncEngine(FakeClient({}), entities=["thirdparties"])
+    engine.store.upsert("thirdparties", [{"id": 3, "name": "Acme"}])
+
+    engine.on_write("PUT", "thirdparties/3", {"id": 3, "name": "Acme Corp"})
+    assert engine.store.get("thirdparties", 3)["name"] == "Acme Corp"
+
+    engine.on_write("DELETE", "thirdparties/3", {"success": 1})
+    assert engine.store.count("thirdparties") == 0
+
+    engine.on_write("DELETE", "products/9", None)
+    engine.on_write("POST", "thirdparties", 4)
+    assert engine.store.count("thirdparties") == 0
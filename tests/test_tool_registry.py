@@ -0,0 +1,114 @@
+"""Tests for the declarative MCP tool registry."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from dolibarr_mcp import tools
+from dolibarr_mcp.dolibarr_mcp_server import handle_call_tool, handle_list_tools
+
+
+def test_every_listed_tool_is_registered():
+    """The prebuilt tool list mirrors the registry and is reused between calls."""
+    listed = tools.list_tools()
+
+    assert [tool.name for tool in listed] == list(tools.TOOL_REGISTRY)
+    assert tools.list_tools() is listed
+    assert "search_products_by_ref" in tools.TOOL_REGISTRY
+    assert "dolibarr_raw_api" in tools.TOOL_REGISTRY
+
+
+def test_duplicate_registration_rejected():
+    """Tool names must be unique."""
+    spec = tools.get_tool("get_status")
+
+    with pytest.raises(ValueError, match="already registered"):
+        tools.register_tool(spec)
+
+
+@pytest.mark.asyncio
+async def test_list_tools_handler_serves_cached_list():
+    """The tools/list handler returns the prebuilt list."""
+    assert await handle_list_tools() is tools.list_tools()
+
+
+@pytest.mark.asyncio
+async def test_positional_mapping_for_update_tools():
+    """Identifier arguments are passed positionally and the rest as keywords."""
+    client = MagicMock()
+    client.update_customer = AsyncMock(return_value={"id": 5})
+    arguments = {"customer_id": 5, "name": "Renamed"}
+
+    result = await tools.get_tool("update_customer").invoke(client, arguments)
+
+    assert result == {"id": 5}
+    client.update_customer.assert_awaited_once_with(5, name="Renamed")
+    assert arguments == {"customer_id": 5, "name": "Renamed"}
+
+
+@pytest.mark.asyncio
+async def test_set_invoice_project_maps_to_update_invoice():
+    """set_invoice_project is backed by update_invoice with fk_project."""
+    client = MagicMock()
+    client.update_invoice = AsyncMock(return_value={"id": 3})
+
+    await tools.get_tool("set_invoice_project").invoke(client, {"invoice_id": 3, "project_id": 9})
+
+    client.update_invoice.assert_awaited_once_with(3, fk_project=9)
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_reports_error():
+    """Unknown tool names produce a structured error without hitting the client."""
+    result = await handle_call_tool("does_not_exist", {})
+
+    assert "Unknown tool: does_not_exist" in result[0].text
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_operations_concurrently_in_order():
+    """Batch results keep the operation order and report failures per item."""
+    import asyncio
+
+    from dolibarr_mcp.dolibarr_client import DolibarrAPIError
+
+    in_flight = 0
+    peak = 0
+
+    async def get_product_by_id(product_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (5 - product_id))
+        in_flight -= 1
+        if product_id == 3:
+            raise DolibarrAPIError("Not found", status_code=404, response_data={"error": "Not Found", "status": 404})
+        return {"id": product_id}
+
+    client = MagicMock()
+    client.batch_max_concurrency = 2
+    client.get_product_by_id = AsyncMock(side_effect=get_product_by_id)
+    operations = [{"tool": "get_product_by_id", "arguments": {"product_id": index}} for index in range(1, 5)]
+    operations.append({"tool": "no_such_tool"})
+
+    result = await tools.get_tool("batch").invoke(client, {"operations": operations, "max_concurrency": 10})
+
+    assert [item["index"] for item in result["results"]] == [0, 1, 2, 3, 4]
+    assert [item["ok"] for item in result["results"]] == [True, True, False, True, False]
+    assert result["results"][0]["result"] == {"id": 1}
+    assert result["results"][2]["error"]["status"] == 404
+    assert result["results"][4]["error"] == {"error": "Unknown tool: no_such_tool"}
+    assert (result["succeeded"], result["failed"]) == (3, 2)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_cannot_nest_batches():
+    """A batch operation may not itself be a batch."""
+    client = MagicMock()
+    client.batch_max_concurrency = 4
+
+    result = await tools.get_tool("batch").invoke(
+        client, {"operations": [{"tool": "batch", "arguments": {"operations": []}}]}
+    )
+
+    assert result["results"][0]["ok"] is False
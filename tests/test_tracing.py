@@ -0,0 +1,105 @@
+"""Tests for tool call tracing."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from dolibarr_mcp import dolibarr_mcp_server, tracing
+from dolibarr_mcp.config import Config
+from dolibarr_mcp.dolibarr_client import DolibarrClient
+from dolibarr_mcp.tracing import Tracer, current_trace_id
+
+
+@pytest.fixture
+def tracer_path(tmp_path, monkeypatch):
+    """Install a tracer exporting every call to a temporary file."""
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracing, "_tracer", Tracer(str(path)))
+    yield path
+    tracing.get_tracer().close()
+
+
+def _response(status: int, body: str):
+    mock_response = AsyncMock()
+    mock_response.status = status
+    mock_response.reason = "Status"
+    mock_response.headers = {}
+    mock_response.read.return_value = body.encode()
+    return mock_response
+
+
+@pytest.mark.asyncio
+@patch("aiohttp.ClientSession.request")
+async def test_tool_call_spans_nest_under_one_trace(mock_request, tracer_path):
+    """A sampled call writes its root, Dolibarr request, HTTP attempt and decode spans as JSON lines."""
+    mock_request.return_value.__aenter__.return_value = _response(200, '{"id": 4}')
+    config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key", cache_enabled=False)
+
+    async with DolibarrClient(config) as client:
+        dolibarr_mcp_server._shared_client = client
+        try:
+            await dolibarr_mcp_server.handle_call_tool("get_invoice_by_id", {"invoice_id": 4})
+        finally:
+            dolibarr_mcp_server._shared_client = None
+
+    spans = [json.loads(line) for line in tracer_path.read_text().splitlines()]
+    by_name = {span["name"]: span for span in spans}
+    assert {span["trace_id"] for span in spans} == {by_name["tool_call"]["trace_id"]}
+    assert by_name["tool_call"]["parent_id"] is None
+    assert by_name["tool_call"]["attributes"] == {"tool": "get_invoice_by_id", "outcome": "ok"}
+    assert by_name["invoke"]["parent_id"] == by_name["tool_call"]["span_id"]
+    assert by_name["dolibarr_request"]["parent_id"] == by_name["invoke"]["span_id"]
+    assert by_name["dolibarr_request"]["attributes"] == {"method": "GET", "endpoint": "invoices/4"}
+    assert by_name["http_attempt"]["attributes"]["status"] == 200
+    assert by_name["decode"]["parent_id"] == by_name["dolibarr_request"]["span_id"]
+    assert "serialize" in by_name and "prune" in by_name
+
+
+@pytest.mark.asyncio
+async def test_error_payload_correlation_id_is_the_trace_id(tracer_path):
+    """Internal errors report the trace ID as correlation ID, and the failed span records the error."""
+
+    class _FailingClient:
+        config = Config(dolibarr_url="https://test.dolibarr.com/api/index.php", api_key="test_key")
+
+        async def get_status(self):
+            raise RuntimeError("boom")
+
+    dolibarr_mcp_server._shared_client = _FailingClient()
+    try:
+        result = await dolibarr_mcp_server.handle_call_tool("get_status", {})
+    finally:
+        dolibarr_mcp_server._shared_client = None
+
+    payload = json.loads(result[0].text)
+    spans = {span["name"]: span for span in map(json.loads, tracer_path.read_text().splitlines())}
+    assert payload["correlation_id"] == spans["tool_call"]["trace_id"]
+    assert spans["invoke"]["error"] == "RuntimeError: boom"
+    assert spans["tool_call"]["attributes"]["outcome"] == "error"
+    assert current_trace_id() is None
+
+
+def test_sampling_and_otlp_export(tmp_path):
+    """Unsampled traces still carry an ID but export nothing; OTLP writes one resourceSpans per trace."""
+    path = tmp_path / "otlp.jsonl"
+    tracer = Tracer(str(path), sample_rate=0.5, fmt="otlp", rng=iter([0.9, 0.1]).__next__)
+
+    with tracer.trace("tool_call", tool="a"):
+        assert current_trace_id() is not None
+        with tracer.span("child") as child:
+            assert child is tracing.NOOP_SPAN
+    with tracer.trace("tool_call", tool="b"):
+        with tracer.span("child", rows=3):
+            pass
+    tracer.close()
+
+    documents = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(documents) == 1
+    spans = documents[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == ["child", "tool_call"]
+    assert len(spans[1]["traceId"]) == 32
+    assert spans[0]["parentSpanId"] == spans[1]["spanId"]
+    assert spans[0]["attributes"] == [{"key": "rows", "value": {"intValue": "3"}}]
+    with pytest.raises(ValueError):
+        Tracer(fmt="zipkin")